@@ -0,0 +1,64 @@
+"""Benchmark of the project indexer on a synthetic tree of 100k files, most of them in a virtualenv and in
+`node_modules`, against the previous double `glob` implementation of `index_modules`.
+
+Run with `python -m benchmarks.bench_indexer`.
+"""
+import glob
+import os
+import tempfile
+import time
+
+from compdoc.parser import index_modules
+
+
+def synthetic_tree(root: str, n_files: int = 100_000, project_share: float = 0.02):
+    """Writes a tree of empty files resembling a project with a virtualenv and `node_modules` folder.
+
+    Args:
+        root (str): Folder to write the tree into
+        n_files (int, optional): Total number of files to write. Defaults to 100_000.
+        project_share (float, optional): Share of the files which are project modules. Defaults to 0.02.
+    """
+    n_project = int(n_files * project_share)
+    n_venv = (n_files - n_project) // 2
+    groups = (
+        ('src/pkg%d/mod%d.py', n_project),
+        ('venv/lib/python3.11/site-packages/dist%d/mod%d.py', n_venv),
+        ('node_modules/dep%d/lib%d.js', n_files - n_project - n_venv),
+    )
+    for pattern, count in groups:
+        for i in range(count):
+            path = os.path.join(root, pattern % (i // 50, i))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'w').close()
+
+
+def glob_index_modules(project_filepath: str) -> dict[str, str]:
+    """Previous implementation of `index_modules`, walking the tree twice with `glob` (made recursive, as it was meant
+    to be, so that both implementations find the project's modules).
+
+    Args:
+        project_filepath (str): Root folder of the project
+
+    Returns:
+        dict[str, str]: Mapping of module names to their path relative to the project
+    """
+    python_files = glob.glob('*.py', root_dir=project_filepath) + \
+        glob.glob('**/*.py', root_dir=project_filepath, recursive=True)
+    python_files = [ p.removeprefix('./') for p in python_files ]
+    module_shortnames = [ p.replace('/', '.').removesuffix('.py') for p in python_files ]
+    return dict(zip(module_shortnames, python_files))
+
+
+def timed(fn, *args) -> tuple[float, int]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, len(result)
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic_tree(tmp)
+        print('implementation\tseconds\tmodules')
+        print('glob\t\t%.3f\t%d' % timed(glob_index_modules, tmp))
+        print('scandir\t\t%.3f\t%d' % timed(index_modules, tmp))
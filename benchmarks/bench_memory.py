@@ -0,0 +1,103 @@
+"""Benchmark of the memory held by the parsed docs of a large codebase, comparing the compact document model (tuples,
+interned strings, docstrings parsed on access) with the previous form (lists, a string per occurrence, and a parsed
+`Docstring` kept for every symbol).
+
+Run with `python -m benchmarks.bench_memory`.
+"""
+import gc
+import os
+import tempfile
+import tracemalloc
+
+import docstring_parser
+
+from benchmarks.bench_parser import synthetic_module
+from compdoc.model import ClassDoc, FuncAnnotations, FuncDoc, ModuleDoc, parse_docstring
+from compdoc.parser import parse_module
+
+
+def _copy(value):
+    return value.encode().decode() if isinstance(value, str) else value
+
+
+def legacy_module(module_doc: ModuleDoc) -> tuple:
+    """Rebuilds a parsed module in the previous document form, with list storage, uninterned strings and eagerly
+    parsed docstrings.
+
+    Args:
+        module_doc (ModuleDoc): Parsed module, in the compact form
+
+    Returns:
+        tuple: Module name, file path and documents, in the previous form
+    """
+    def legacy(doc):
+        if isinstance(doc, FuncDoc):
+            annotations = FuncAnnotations(
+                doc.annotations.first_arg,
+                [ (_copy(name), _copy(type_name)) for name, type_name in doc.annotations.args ],
+                _copy(doc.annotations.returns),
+            )
+            fields = (_copy(doc.func_name), _copy(doc.filepath), doc.line_no, annotations, _copy(doc.string))
+        else:
+            fields = (_copy(doc.class_name), _copy(doc.filepath), doc.line_no, _copy(doc.string),
+                      [ _copy(base) for base in doc.bases ], [ legacy(el) for el in doc.elements ])
+        parsed = docstring_parser.parse(doc.string) if doc.string is not None else None
+        return fields + (parsed,)
+
+    return (_copy(module_doc.module_name), _copy(module_doc.filepath), [ legacy(doc) for doc in module_doc.docs ])
+
+
+def _retained(build) -> tuple[object, int]:
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    return result, tracemalloc.get_traced_memory()[0] - before
+
+
+def count_symbols(module_docs: list[ModuleDoc]) -> int:
+    """Counts the classes, functions and methods of parsed modules.
+
+    Args:
+        module_docs (list[ModuleDoc]): Parsed modules
+
+    Returns:
+        int: Number of symbols
+    """
+    return sum(1 + len(doc.elements) if isinstance(doc, ClassDoc) else 1 for mod in module_docs for doc in mod.docs)
+
+
+def bench_memory(n_symbols: int = 50_000, symbols_per_module: int = 1_000) -> tuple[int, int, int]:
+    """Measures the memory retained by the parsed docs of a synthetic corpus, in both document forms.
+
+    Args:
+        n_symbols (int, optional): Number of symbols in the corpus. Defaults to 50_000.
+        symbols_per_module (int, optional): Number of symbols in each module. Defaults to 1_000.
+
+    Returns:
+        tuple[int, int, int]: Number of symbols, and bytes retained by the compact and previous forms
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for m in range(n_symbols // symbols_per_module):
+            path = os.path.join(tmp, 'pkg', 'mod%d.py' % m)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as handle:
+                handle.write(synthetic_module(symbols_per_module))
+            paths.append(path)
+
+        tracemalloc.start()
+        try:
+            module_docs, compact = _retained(lambda: [ parse_module(path) for path in paths ])
+            parse_docstring.cache_clear()
+            _, previous = _retained(lambda: [ legacy_module(mod) for mod in module_docs ])
+        finally:
+            tracemalloc.stop()
+
+    return count_symbols(module_docs), compact, previous
+
+
+if __name__ == '__main__':
+    symbols, compact, previous = bench_memory()
+    print('symbols\t\tcompact MiB\tprevious MiB\tratio')
+    print('%d\t\t%.1f\t\t%.1f\t\t%.2f' % (symbols, compact / 2**20, previous / 2**20, previous / compact))
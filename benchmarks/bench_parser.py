@@ -0,0 +1,72 @@
+"""Benchmark of `parse_module` on synthetic modules of growing size, to check that parsing scales linearly with the
+number of definitions in a module, and of `parse_symbol`, which parses a single definition of the same modules.
+
+Run with `python -m benchmarks.bench_parser`.
+"""
+import os
+import tempfile
+import time
+from typing import Optional
+
+from compdoc.parser import parse_module, parse_symbol
+
+
+def synthetic_module(n_definitions: int, methods_per_class: int = 9) -> str:
+    """Generates the source of a module with the given number of documented functions, classes and methods.
+
+    Args:
+        n_definitions (int): Total number of classes and functions (including methods) to define
+        methods_per_class (int, optional): Number of methods defined in each class. Defaults to 9.
+
+    Returns:
+        str: Python source of the module
+    """
+    chunks: list[str] = []
+    n_classes = n_definitions // (methods_per_class + 1)
+    for c in range(n_classes):
+        chunks.append(f'class Class{c}(Base):\n    """Class {c}."""\n')
+        for m in range(methods_per_class):
+            chunks.append(
+                f'    def method{m}(self, x: int, y: list[str]) -> dict[str, int]:\n'
+                f'        """Method {m}.\n\n        Args:\n            x (int): X\n            y (list[str]): Y\n\n'
+                f'        Returns:\n            dict[str, int]: Result\n        """\n        return {{}}\n'
+            )
+    for f in range(n_definitions - n_classes * (methods_per_class + 1)):
+        chunks.append(f'def func{f}(x: int) -> int:\n    """Function {f}.\n\n    Args:\n        x (int): X\n    """\n'
+                      '    return x\n')
+    return '\n'.join(chunks)
+
+
+def bench_parse_module(n_definitions: int, repeat: int = 3, symbol: Optional[str] = None) -> float:
+    """Times `parse_module` on a synthetic module, or `parse_symbol` if a symbol is given.
+
+    Args:
+        n_definitions (int): Number of definitions in the synthetic module
+        repeat (int, optional): Number of runs, of which the fastest is kept. Defaults to 3.
+        symbol (str, optional): Name of the top-level definition to parse with `parse_symbol`. Defaults to None, to
+            parse the whole module.
+
+    Returns:
+        float: Fastest run time, in seconds
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'synthetic.py')
+        with open(path, 'w') as handle:
+            handle.write(synthetic_module(n_definitions))
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            if symbol is None:
+                parse_module(path)
+            else:
+                parse_symbol(path, symbol)
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == '__main__':
+    print('definitions\tseconds\tus/definition\tparse_symbol seconds')
+    for n in (1_000, 2_500, 5_000, 10_000):
+        seconds = bench_parse_module(n)
+        symbol_seconds = bench_parse_module(n, symbol='Class0')
+        print('%d\t\t%.3f\t%.1f\t\t%.3f' % (n, seconds, seconds / n * 1e6, symbol_seconds))
@@ -0,0 +1,50 @@
+"""Benchmark of rendering a template which loads many modules, with and without prefetching them concurrently before
+rendering.
+
+Run with `python -m benchmarks.bench_prefetch`.
+"""
+import os
+import tempfile
+import time
+
+from benchmarks.bench_parser import synthetic_module
+from compdoc.compiler import CompDocCompiler
+
+
+def bench_prefetch(n_modules: int = 24, n_definitions: int = 1_000) -> tuple[float, float]:
+    """Times compiling a template loading `n_modules` synthetic modules, without and with prefetching.
+
+    Args:
+        n_modules (int, optional): Number of modules the template loads. Defaults to 24.
+        n_definitions (int, optional): Number of definitions in each module. Defaults to 1_000.
+
+    Returns:
+        tuple[float, float]: Compile time in seconds without and with prefetching
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        modules = {}
+        for m in range(n_modules):
+            path = os.path.join(tmp, 'mod%d.py' % m)
+            with open(path, 'w') as handle:
+                handle.write(synthetic_module(n_definitions))
+            modules['mod%d' % m] = path
+
+        template_path = os.path.join(tmp, 'README.md.j2')
+        with open(template_path, 'w') as handle:
+            for name in modules:
+                handle.write("{{ compdoc.module('%s').Class0.method0.doc.func_name }}\n" % name)
+
+        timings = []
+        for prefetch in (False, True):
+            with CompDocCompiler({'modules': modules, 'formatters': {}}, prefetch=prefetch) as compiler:
+                start = time.perf_counter()
+                compiler.compile(template_path)
+                timings.append(time.perf_counter() - start)
+    return timings[0], timings[1]
+
+
+if __name__ == '__main__':
+    sequential, prefetched = bench_prefetch()
+    print('cpus\t\t%d' % (os.cpu_count() or 1))
+    print('sequential\t%.3f s' % sequential)
+    print('prefetched\t%.3f s' % prefetched)
@@ -0,0 +1,80 @@
+"""Benchmark of the start-up time of each `compdoc` subcommand, from `python -X importtime` and from the wall time of
+the whole invocation, on a small project. Lists the heaviest packages each subcommand imports, to spot imports which
+should be deferred to the subcommands which use them.
+
+Run with `python -m benchmarks.bench_startup`.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import corpus
+
+
+ENTRY_POINT = "import sys; sys.argv[0] = 'compdoc'; from compdoc_cli import cli; cli()"
+
+HEAVY_PACKAGES = ('jinja2', 'yaml', 'docstring_parser', 'concurrent.futures.process', 'tracemalloc', 'cProfile')
+
+
+def import_times(args: list[str], cwd: str) -> tuple[float, dict[str, int]]:
+    """Runs a `compdoc` command with `-X importtime`, and collects the time it spent importing modules.
+
+    Args:
+        args (list[str]): Arguments of the `compdoc` command
+        cwd (str): Directory to run the command in
+
+    Returns:
+        tuple[float, dict[str, int]]: Total import time in seconds, and the cumulative import time in microseconds of
+        every imported module, by module name
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [corpus.REPO_ROOT, os.environ.get('PYTHONPATH')])))
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', ENTRY_POINT, *args], cwd=cwd, env=env,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    total = 0
+    times: dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+        """Nested imports are indented under the module importing them, and already counted in its cumulative time"""
+        if not name[1:].startswith(' '):
+            total += int(cumulative)
+    return total / 1e6, times
+
+
+def bench_startup(repeat: int = 5):
+    """Prints the median import and wall time of each subcommand, and the heavy packages it imports.
+
+    Args:
+        repeat (int, optional): Number of runs of each subcommand. Defaults to 5.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus.compdoc_project(tmp, {'pkg.mod': corpus.huge_module(20)})
+        commands = {
+            'init': ['init', 'init-project', '-y'],
+            'validate': ['validate', 'pkg', '-j', '1', '--no-cache'],
+            'compile': ['compile', 'README.md.j2', '--no-cache'],
+            'cache': ['cache', 'stats', '.'],
+            'index': ['index', 'build', '.'],
+        }
+        os.makedirs(os.path.join(tmp, 'init-project'))
+
+        print('%-12s%14s%14s  %s' % ('command', 'imports (ms)', 'wall (ms)', 'heavy packages'))
+        for name, args in commands.items():
+            imports, walls = [], []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                total, times = import_times(args, tmp)
+                walls.append(time.perf_counter() - start)
+                imports.append(total)
+            heavy = [ package for package in HEAVY_PACKAGES if package in times ]
+            print('%-12s%14.1f%14.1f  %s' % (name, statistics.median(imports) * 1e3, statistics.median(walls) * 1e3,
+                                             ', '.join(heavy) or '-'))
+
+
+if __name__ == '__main__':
+    bench_startup()
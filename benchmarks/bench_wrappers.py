@@ -0,0 +1,116 @@
+"""Microbenchmark of element access through the Jinja context wrappers, `CompDocModule` and `CompDocClass`, comparing
+them with the previous wrappers, which raised and caught an AttributeError on every element access and wrapped every
+element of a module up front.
+
+Run with `python -m benchmarks.bench_wrappers`.
+"""
+import os
+import tempfile
+import timeit
+
+from jinja2 import Environment
+
+from benchmarks.bench_parser import synthetic_module
+from compdoc.compiler import CompDocFunction, CompDocModule
+from compdoc.model import ClassDoc, FuncDoc, ModuleDoc
+from compdoc.parser import parse_module
+
+
+class LegacyCompDocClass:
+    """Previous class wrapper, resolving methods in `__getattr__` after a failed `super(object).__getattr__` call.
+    """
+
+    def __init__(self, doc: ClassDoc):
+        self.doc = doc
+        self.attrs = { d.func_name: CompDocFunction(d) for d in doc.elements if isinstance(d, FuncDoc) }
+
+    def __getattr__(self, name: str) -> CompDocFunction:
+        try:
+            return super(object).__getattr__(name)
+        except AttributeError:
+            if name in self.attrs:
+                return self.attrs[name]
+            raise
+
+
+class LegacyCompDocModule:
+    """Previous module wrapper, resolving elements in `__getattribute__` after a failed lookup of the attribute.
+    """
+
+    def __init__(self, doc: ModuleDoc):
+        self.doc = doc
+        self.attrs = { d.class_name if isinstance(d, ClassDoc) else d.func_name:
+                       LegacyCompDocClass(d) if isinstance(d, ClassDoc) else CompDocFunction(d) for d in doc.docs }
+
+    def __getattribute__(self, name: str):
+        try:
+            return super().__getattribute__(name)
+        except AttributeError:
+            if name in self.attrs:
+                return self.attrs[name]
+            raise
+
+
+def bench_wrappers(n_accesses: int = 200_000, n_definitions: int = 1_000) -> dict[str, tuple[float, float]]:
+    """Measures the throughput of element accesses through both wrapper implementations, directly and from a Jinja
+    template.
+
+    Args:
+        n_accesses (int, optional): Number of `module.Class.method` accesses to time. Defaults to 200_000.
+        n_definitions (int, optional): Number of definitions in the synthetic module. Defaults to 1_000.
+
+    Returns:
+        dict[str, tuple[float, float]]: Accesses per second for the current and previous wrappers, by access kind
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'synthetic.py')
+        with open(path, 'w') as handle:
+            handle.write(synthetic_module(n_definitions))
+        module_doc = parse_module(path)
+
+    current, legacy = CompDocModule(module_doc), LegacyCompDocModule(module_doc)
+    env = Environment()
+    template = env.from_string('{% for _ in range(n) %}{{ mod.Class0.method0.doc.line_no }}{% endfor %}')
+
+    results: dict[str, tuple[float, float]] = {}
+    for kind, run in (
+        ('python', lambda mod: timeit.timeit(lambda: mod.Class0.method0, number=n_accesses)),
+        ('jinja', lambda mod: timeit.timeit(lambda: template.render(mod=mod, n=n_accesses // 10), number=1) * 10),
+    ):
+        results[kind] = (n_accesses / min(run(current) for _ in range(3)),
+                         n_accesses / min(run(legacy) for _ in range(3)))
+    return results
+
+
+def bench_construction(n_definitions: int = 5_500, repeat: int = 20) -> tuple[float, float]:
+    """Times wrapping a large module and reading a single method of it, with both wrapper implementations.
+
+    Args:
+        n_definitions (int, optional): Number of definitions in the synthetic module. Defaults to 5_500, for 5_000
+            methods.
+        repeat (int, optional): Number of runs, of which the fastest is kept. Defaults to 20.
+
+    Returns:
+        tuple[float, float]: Fastest run time in seconds of the current and previous wrappers
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'synthetic.py')
+        with open(path, 'w') as handle:
+            handle.write(synthetic_module(n_definitions))
+        module_doc = parse_module(path)
+
+    return tuple(
+        min(timeit.repeat(lambda: wrapper(module_doc).Class0.method0, number=1, repeat=repeat))
+        for wrapper in (CompDocModule, LegacyCompDocModule)
+    )
+
+
+if __name__ == '__main__':
+    print('access\t\tcurrent/s\tprevious/s\tspeedup')
+    for kind, (current, previous) in bench_wrappers().items():
+        print('%s\t\t%.0f\t%.0f\t%.2f' % (kind, current, previous, current / previous))
+
+    current, previous = bench_construction()
+    print('\nwrap 5k-method module, read one method')
+    print('current\t\t%.1f us' % (current * 1e6))
+    print('previous\t%.1f us' % (previous * 1e6))
@@ -0,0 +1,145 @@
+"""Generators of synthetic Python corpora for the benchmark suite, covering the shapes of code compdoc is slow on: huge
+modules, deep class hierarchies, many small modules, and long Google or NumPy style docstrings.
+"""
+import os
+import shutil
+from typing import Optional
+
+from benchmarks.bench_parser import synthetic_module
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def huge_module(n_definitions: int = 5_000) -> str:
+    """Generates the source of a single module with many documented classes, methods and functions.
+
+    Args:
+        n_definitions (int, optional): Total number of classes and functions (including methods). Defaults to 5_000.
+
+    Returns:
+        str: Python source of the module
+    """
+    return synthetic_module(n_definitions)
+
+
+def deep_hierarchy(depth: int = 200, methods_per_class: int = 5) -> str:
+    """Generates the source of a module defining a chain of classes, each inheriting from the previous one and
+    overriding its methods.
+
+    Args:
+        depth (int, optional): Number of classes in the chain. Defaults to 200.
+        methods_per_class (int, optional): Number of methods of each class. Defaults to 5.
+
+    Returns:
+        str: Python source of the module
+    """
+    chunks = [ 'class Level0:\n    """Root of the hierarchy."""\n' ]
+    for level in range(1, depth):
+        chunks.append(f'class Level{level}(Level{level - 1}):\n    """Level {level} of the hierarchy."""\n')
+        for m in range(methods_per_class):
+            chunks.append(
+                f'    def method{m}(self, value: int) -> int:\n'
+                f'        """Overrides method {m}.\n\n        Args:\n            value (int): Value\n\n'
+                f'        Returns:\n            int: Result\n        """\n        return value\n'
+            )
+    return '\n'.join(chunks)
+
+
+def long_docstrings(n_functions: int = 500, n_args: int = 12, style: str = 'google') -> str:
+    """Generates the source of a module of functions with many arguments and long docstrings.
+
+    Args:
+        n_functions (int, optional): Number of functions in the module. Defaults to 500.
+        n_args (int, optional): Number of arguments of each function. Defaults to 12.
+        style (str, optional): Docstring style, 'google' or 'numpy'. Defaults to 'google'.
+
+    Returns:
+        str: Python source of the module
+    """
+    description = ' '.join(['This line of the description explains the behaviour of the function at length.'] * 4)
+    signature = ', '.join(f'arg{a}: dict[str, list[int]]' for a in range(n_args))
+    if style == 'numpy':
+        params = ''.join(f'    arg{a} : dict[str, list[int]]\n        {description}\n' for a in range(n_args))
+        doc = f'Summary line.\n\n    {description}\n\n    Parameters\n    ----------\n{params}\n' \
+              f'    Returns\n    -------\n    int\n        {description}\n    '
+    else:
+        params = ''.join(f'        arg{a} (dict[str, list[int]]): {description}\n' for a in range(n_args))
+        doc = f'Summary line.\n\n    {description}\n\n    Args:\n{params}\n    Returns:\n        int: {description}\n    '
+    return '\n'.join(
+        f'def func{f}({signature}) -> int:\n    """{doc}"""\n    return 0\n' for f in range(n_functions)
+    )
+
+
+def small_modules(root: str, n_modules: int = 2_000, modules_per_package: int = 20) -> list[str]:
+    """Writes a project of many small modules, spread over packages.
+
+    Args:
+        root (str): Folder to write the project into
+        n_modules (int, optional): Number of modules to write. Defaults to 2_000.
+        modules_per_package (int, optional): Number of modules in each package. Defaults to 20.
+
+    Returns:
+        list[str]: Paths of the written modules
+    """
+    paths = []
+    for i in range(n_modules):
+        package = os.path.join(root, 'src', 'pkg%d' % (i // modules_per_package))
+        if i % modules_per_package == 0:
+            os.makedirs(package, exist_ok=True)
+            open(os.path.join(package, '__init__.py'), 'w').close()
+        paths.append(write_module(os.path.join(package, 'mod%d.py' % i), synthetic_module(10, methods_per_class=4)))
+    return paths
+
+
+def write_module(path: str, source: str) -> str:
+    """Writes the source of a module to a path, creating its folder.
+
+    Args:
+        path (str): Path of the module to write
+        source (str): Python source of the module
+
+    Returns:
+        str: Path of the written module
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as handle:
+        handle.write(source)
+    return path
+
+
+def compdoc_project(root: str, modules: dict[str, str], template: Optional[str] = None) -> str:
+    """Writes a project ready for `compdoc compile`: its modules, a `.compdoc.yml` configuration using the built-in
+    formatters, and a template documenting every class and function of the modules.
+
+    Args:
+        root (str): Folder to write the project into
+        modules (dict[str, str]): Python source of each module, by module name
+        template (str, optional): Source of the template. Defaults to a template listing every class and function with
+            the 'ul' formatter.
+
+    Returns:
+        str: Path of the template
+    """
+    shutil.copytree(os.path.join(REPO_ROOT, 'compdoc-formatters'), os.path.join(root, 'compdoc-formatters'))
+    with open(os.path.join(root, '.compdoc.yml'), 'w') as handle:
+        handle.write('modules:')
+        for name, source in modules.items():
+            rel_path = name.replace('.', '/') + '.py'
+            write_module(os.path.join(root, rel_path), source)
+            handle.write(f'\n  {name}: {rel_path}')
+        handle.write('\n\nformatters:')
+        for formatter in ('href', 'inline_ul', 'ul'):
+            handle.write(f'\n  {formatter}: compdoc-formatters/{formatter}.md.j2')
+
+    if template is None:
+        template = "{% set ul = compdoc.formatter('ul') %}\n" + ''.join(
+            f"{{% set mod = compdoc.module('{name}') %}}\n"
+            "{% for cls in mod.doc.classes %}{{ ul.format_class(mod[cls.class_name]) }}\n{% endfor %}"
+            "{% for func in mod.doc.external_functions %}{{ ul.format_function(mod[func.func_name]) }}\n{% endfor %}"
+            for name in modules
+        )
+    template_path = os.path.join(root, 'README.md.j2')
+    with open(template_path, 'w') as handle:
+        handle.write(template)
+    return template_path
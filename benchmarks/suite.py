@@ -0,0 +1,382 @@
+"""Offline benchmark suite for the parser, compiler and CLI, run over synthetic corpora from `benchmarks.corpus`. Each
+benchmark is timed over several runs, and its median is compared against the stored baseline, so regressions show up
+as ratios above 1.
+
+Run with `python -m benchmarks.suite`, optionally with `--filter parse` to select benchmarks by name, or with `--save`
+to record the results as the new baseline. The command exits with status 1 if a benchmark is slower than its baseline
+by more than `--threshold`.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, NamedTuple, Optional
+
+from benchmarks import corpus
+from compdoc.cache import ModuleCache
+from compdoc.compiler import CompDoc, make_environment
+from compdoc.model import parse_docstring
+from compdoc.parser import index_modules, parse_module
+from compdoc.validator import validate_modules
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+class Benchmark(NamedTuple):
+    """Struct for a registered benchmark.
+
+    Attributes:
+        name (str): Name of the benchmark, as used to filter and to key the baseline.
+        setup (Callable): Function writing the benchmark's corpus into a scratch folder, and returning the function to
+            time.
+        repeat (int): Number of timed runs.
+    """
+    name: str
+    setup: Callable
+    repeat: int
+
+
+class BenchmarkResult(NamedTuple):
+    """Struct for the timings of a benchmark.
+
+    Attributes:
+        name (str): Name of the benchmark.
+        best (float): Fastest run time, in seconds.
+        median (float): Median run time, in seconds.
+        repeat (int): Number of timed runs.
+    """
+    name: str
+    best: float
+    median: float
+    repeat: int
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, repeat: int = 5) -> Callable:
+    """Registers the decorated setup function as a benchmark of the suite.
+
+    Args:
+        name (str): Name of the benchmark
+        repeat (int, optional): Number of timed runs. Defaults to 5.
+
+    Returns:
+        Callable: Decorator registering the setup function
+    """
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS[name] = Benchmark(name, setup, repeat)
+        return setup
+    return register
+
+
+def _write_huge(tmp: str) -> str:
+    return corpus.write_module(os.path.join(tmp, 'huge.py'), corpus.huge_module(5_000))
+
+
+@benchmark('index_modules.small_modules')
+def bench_index_modules(tmp: str) -> Callable:
+    """Walks a project of 2,000 small modules in 100 packages.
+
+    Args:
+        tmp (str): Scratch folder to write the corpus into
+
+    Returns:
+        Callable: Function to time
+    """
+    corpus.small_modules(tmp)
+    return lambda: index_modules(tmp)
+
+
+@benchmark('parse_module.huge')
+def bench_parse_huge(tmp: str) -> Callable:
+    """Parses a module of 5,000 definitions.
+
+    Args:
+        tmp (str): Scratch folder to write the corpus into
+
+    Returns:
+        Callable: Function to time
+    """
+    path = _write_huge(tmp)
+    return lambda: parse_module(path)
+
+
+@benchmark('parse_module.deep_hierarchy')
+def bench_parse_deep(tmp: str) -> Callable:
+    """Parses a chain of 200 classes, each inheriting from the previous one.
+
+    Args:
+        tmp (str): Scratch folder to write the corpus into
+
+    Returns:
+        Callable: Function to time
+    """
+    path = corpus.write_module(os.path.join(tmp, 'deep.py'), corpus.deep_hierarchy())
+    return lambda: parse_module(path)
+
+
+def _parse_docstrings(path: str):
+    parse_docstring.cache_clear()
+    for doc in parse_module(path).docs:
+        doc.docstring
+
+
+@benchmark('parse_module.google_docstrings')
+def bench_google_docstrings(tmp: str) -> Callable:
+    """Parses 500 functions with long Google style docstrings, along with their docstrings.
+
+    Args:
+        tmp (str): Scratch folder to write the corpus into
+
+    Returns:
+        Callable: Function to time
+    """
+    path = corpus.write_module(os.path.join(tmp, 'google.py'), corpus.long_docstrings(style='google'))
+    return lambda: _parse_docstrings(path)
+
+
+@benchmark('parse_module.numpy_docstrings')
+def bench_numpy_docstrings(tmp: str) -> Callable:
+    """Parses 500 functions with long NumPy style docstrings, along with their docstrings.
+
+    Args:
+        tmp (str): Scratch folder to write the corpus into
+
+    Returns:
+        Callable: Function to time
+    """
+    path = corpus.write_module(os.path.join(tmp, 'numpy.py'), corpus.long_docstrings(style='numpy'))
+    return lambda: _parse_docstrings(path)
+
+
+@benchmark('validate.small_modules', repeat=3)
+def bench_validate(tmp: str) -> Callable:
+    """Validates 500 small modules in-process, without a parse cache.
+
+    Args:
+        tmp (str): Scratch folder to write the corpus into
+
+    Returns:
+        Callable: Function to time
+    """
+    paths = corpus.small_modules(tmp, n_modules=500)
+
+    def run():
+        parse_docstring.cache_clear()
+        for _ in validate_modules(paths, jobs=1):
+            pass
+    return run
+
+
+@benchmark('CompDoc.module.cold')
+def bench_module_cold(tmp: str) -> Callable:
+    """Loads a module of 5,000 definitions through a new CompDoc context and cache.
+
+    Args:
+        tmp (str): Scratch folder to write the corpus into
+
+    Returns:
+        Callable: Function to time
+    """
+    config = {'modules': {'huge': _write_huge(tmp)}, 'formatters': {}}
+    env = make_environment()
+    return lambda: CompDoc(config, env).module('huge').Class0.method0
+
+
+@benchmark('CompDoc.module.warm', repeat=10)
+def bench_module_warm(tmp: str) -> Callable:
+    """Loads a module of 5,000 definitions through CompDoc contexts sharing a warm module cache.
+
+    Args:
+        tmp (str): Scratch folder to write the corpus into
+
+    Returns:
+        Callable: Function to time
+    """
+    config = {'modules': {'huge': _write_huge(tmp)}, 'formatters': {}}
+    env = make_environment()
+    module_cache = ModuleCache()
+    CompDoc(config, env, module_cache).module('huge')
+
+    def run():
+        for _ in range(100):
+            CompDoc(config, env, module_cache).module('huge').Class0.method0
+    return run
+
+
+@benchmark('formatter.ul')
+def bench_formatter(tmp: str) -> Callable:
+    """Renders every class of a 200 class hierarchy with the built-in 'ul' formatter.
+
+    Args:
+        tmp (str): Scratch folder to write the corpus into
+
+    Returns:
+        Callable: Function to time
+    """
+    template_path = corpus.compdoc_project(tmp, {'deep': corpus.deep_hierarchy()})
+    config = {
+        'modules': {'deep': os.path.join(tmp, 'deep.py')},
+        'formatters': {'ul': os.path.join(tmp, 'compdoc-formatters', 'ul.md.j2')},
+    }
+    env = make_environment()
+    module_cache = ModuleCache()
+    with open(template_path) as handle:
+        template = env.from_string(handle.read())
+    template.render(compdoc=CompDoc(config, env, module_cache))
+    return lambda: template.render(compdoc=CompDoc(config, env, module_cache))
+
+
+@benchmark('cli.compile', repeat=3)
+def bench_cli_compile(tmp: str) -> Callable:
+    """Runs `compdoc compile` end to end, in a new interpreter, on a project of three modules.
+
+    Args:
+        tmp (str): Scratch folder to write the corpus into
+
+    Returns:
+        Callable: Function to time
+    """
+    template_path = corpus.compdoc_project(tmp, {
+        'pkg.huge': corpus.huge_module(2_000),
+        'pkg.deep': corpus.deep_hierarchy(),
+        'pkg.google': corpus.long_docstrings(100),
+    })
+    command = [sys.executable, '-c', 'from compdoc_cli import cli; cli()', 'compile', template_path, '--no-cache']
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [corpus.REPO_ROOT, os.environ.get('PYTHONPATH')])))
+    return lambda: subprocess.run(command, cwd=tmp, env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+def run_benchmark(bench: Benchmark) -> BenchmarkResult:
+    """Sets up a benchmark in a scratch folder, and times its runs.
+
+    Args:
+        bench (Benchmark): Benchmark to run
+
+    Returns:
+        BenchmarkResult: Timings of the benchmark
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        run = bench.setup(tmp)
+        timings = []
+        for _ in range(bench.repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    return BenchmarkResult(bench.name, min(timings), statistics.median(timings), bench.repeat)
+
+
+def machine_info() -> dict[str, str]:
+    """Describes the machine and interpreter running the suite, to record alongside a baseline.
+
+    Returns:
+        dict[str, str]: Python version, platform and CPU count
+    """
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': str(os.cpu_count()),
+    }
+
+
+def load_baseline(path: str) -> dict[str, dict]:
+    """Loads stored baseline results.
+
+    Args:
+        path (str): Path of the baseline JSON file
+
+    Returns:
+        dict[str, dict]: Stored results by benchmark name, or an empty dict if there is no baseline
+    """
+    try:
+        with open(path) as handle:
+            return json.load(handle)['results']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def save_baseline(path: str, results: list[BenchmarkResult]):
+    """Stores results as the baseline, merged with the stored results of benchmarks which weren't run.
+
+    Args:
+        path (str): Path of the baseline JSON file
+        results (list[BenchmarkResult]): Results to store
+    """
+    stored = load_baseline(path)
+    stored.update({ result.name: {'best': result.best, 'median': result.median} for result in results })
+    with open(path, 'w') as handle:
+        json.dump({'machine': machine_info(), 'results': dict(sorted(stored.items()))}, handle, indent=2)
+        handle.write('\n')
+
+
+def compare(result: BenchmarkResult, baseline: dict[str, dict]) -> Optional[float]:
+    """Compares the median of a result to its baseline.
+
+    Args:
+        result (BenchmarkResult): Timings of the benchmark
+        baseline (dict[str, dict]): Stored results by benchmark name
+
+    Returns:
+        Optional[float]: Ratio of the median to the baseline median, or None if the benchmark has no baseline
+    """
+    stored = baseline.get(result.name)
+    if not stored:
+        return None
+    return result.median / stored['median']
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Runs the suite and prints each benchmark's timings and ratio to its baseline.
+
+    Args:
+        argv (list[str], optional): Command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: Exit status, 1 if any benchmark regressed past the threshold
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--filter', '-k', default='', help='Only run benchmarks whose name contains this substring')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Path of the baseline JSON file')
+    parser.add_argument('--save', action='store_true', help='Store the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Relative slowdown from the baseline reported as a regression (default: 0.25)')
+    parser.add_argument('--list', action='store_true', help='List the benchmarks and exit')
+    arguments = parser.parse_args(argv)
+
+    selected = [ bench for name, bench in BENCHMARKS.items() if arguments.filter in name ]
+    if arguments.list:
+        for bench in selected:
+            print('%-32s%s' % (bench.name, bench.setup.__doc__.split('\n')[0]))
+        return 0
+
+    baseline = load_baseline(arguments.baseline)
+    results: list[BenchmarkResult] = []
+    regressions: list[str] = []
+    print('%-32s%12s%12s%12s' % ('benchmark', 'best (ms)', 'median (ms)', 'vs baseline'))
+    for bench in selected:
+        result = run_benchmark(bench)
+        results.append(result)
+        ratio = compare(result, baseline)
+        if ratio is not None and ratio > 1 + arguments.threshold:
+            regressions.append(result.name)
+        print('%-32s%12.2f%12.2f%12s' % (result.name, result.best * 1e3, result.median * 1e3,
+                                        '-' if ratio is None else '%.2fx' % ratio), flush=True)
+
+    if arguments.save:
+        save_baseline(arguments.baseline, results)
+        print('Saved baseline to %s' % arguments.baseline)
+    elif regressions:
+        print('Regressed by more than %d%%: %s' % (arguments.threshold * 100, ', '.join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,4 @@
+__version__ = '0.1.0'
+
+"""Directory, in the project folder, of the persistent parse cache and of the `compdoc serve` daemon's socket"""
+DEFAULT_CACHE_DIR = '.compdoc-cache'
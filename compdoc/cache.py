@@ -0,0 +1,428 @@
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional
+
+from compdoc import DEFAULT_CACHE_DIR, __version__
+from compdoc.index import DEFAULT_INDEX_FILE, ProjectIndex
+from compdoc.model import DocType, ModuleDoc
+from compdoc.parser import DefinitionSpan, outline_module, parse_definition, parse_module
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+class CacheStats(NamedTuple):
+    """Snapshot of the hit/miss counters of a cache.
+
+    Attributes:
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups which had to (re)build the cached value.
+        entries (int): Number of entries currently held by the cache.
+    """
+    hits: int
+    misses: int
+    entries: int
+
+
+class DiskCacheStats(NamedTuple):
+    """Snapshot of the contents and counters of a DiskCache.
+
+    Attributes:
+        hits (int): Number of lookups served from disk by this process.
+        misses (int): Number of lookups which had to parse the module in this process.
+        entries (int): Number of entries stored in the cache directory.
+        size (int): Total size in bytes of the entries stored in the cache directory.
+    """
+    hits: int
+    misses: int
+    entries: int
+    size: int
+
+
+CACHE_FORMAT = 5
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+
+def file_digest(filepath: str) -> str:
+    """Computes the content hash used to key cached data derived from a file.
+
+    Args:
+        filepath (str): Path of the file to hash
+
+    Returns:
+        str: Hex digest of the file's contents
+    """
+    with open(filepath, 'rb') as handle:
+        return hashlib.blake2b(handle.read(), digest_size=20).hexdigest()
+
+
+class DiskCache:
+    """Persistent cache of parsed ModuleDocs, stored as pickles in a cache directory. Entries are keyed by the module
+    path, the hash of its source and the compdoc version, so warm runs only pay for hashing unchanged files. The
+    directory is bounded to `max_size` bytes by evicting the least recently used entries.
+
+    If the cache directory holds a project index snapshot, built by `compdoc index build`, modules which are unchanged
+    since the snapshot was built are served from it without reading their source.
+
+    Attributes:
+        cache_dir (str): Directory holding the cache entries.
+        max_size (int): Maximum total size in bytes of the cache entries.
+        hits (int): Number of `get` calls served from disk.
+        misses (int): Number of `get` calls which had to parse the module.
+    """
+    cache_dir: str
+    max_size: int
+    hits: int
+    misses: int
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+        self._index: Optional[ProjectIndex] = None
+        self._index_loaded = False
+
+    @property
+    def modules_dir(self) -> str:
+        return os.path.join(self.cache_dir, 'modules')
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.cache_dir, DEFAULT_INDEX_FILE)
+
+    @property
+    def index(self) -> Optional[ProjectIndex]:
+        if not self._index_loaded:
+            with self._lock:
+                if not self._index_loaded:
+                    self._index = ProjectIndex.load(self.index_path)
+                    self._index_loaded = True
+        return self._index
+
+    def _entry_path(self, source_filepath: str, digest: str) -> str:
+        key = hashlib.blake2b(
+            '\0'.join((__version__, str(CACHE_FORMAT), source_filepath, digest)).encode(), digest_size=20,
+        ).hexdigest()
+        return os.path.join(self.modules_dir, key + '.pickle')
+
+    def get(self, source_filepath: str) -> ModuleDoc:
+        """Returns the ModuleDoc for the source file, from disk if its source is unchanged since it was cached.
+
+        Args:
+            source_filepath (str): Path to the Python source file to parse
+
+        Returns:
+            ModuleDoc: Parsed documentation details of the module
+        """
+        if self.index is not None:
+            module_doc = self.index.get(source_filepath)
+            if module_doc is not None:
+                self.hits += 1
+                return module_doc
+
+        try:
+            entry_path = self._entry_path(source_filepath, file_digest(source_filepath))
+        except OSError:
+            return parse_module(source_filepath)
+
+        try:
+            with open(entry_path, 'rb') as handle:
+                module_doc = pickle.load(handle)
+            os.utime(entry_path)
+            self.hits += 1
+            return module_doc
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            pass
+
+        self.misses += 1
+        module_doc = parse_module(source_filepath)
+        self._store(entry_path, pickle.dumps(module_doc, protocol=pickle.HIGHEST_PROTOCOL))
+        return module_doc
+
+    def _store(self, entry_path: str, data: bytes):
+        os.makedirs(self.modules_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.modules_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+        os.replace(tmp_path, entry_path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, _, size in self._entries())
+            else:
+                self._size += len(data)
+            if self._size > self.max_size:
+                self._evict()
+
+    def _entries(self) -> list[tuple[str, float, int]]:
+        try:
+            with os.scandir(self.modules_dir) as it:
+                entries = []
+                for entry in it:
+                    if entry.name.endswith('.pickle'):
+                        stat = entry.stat()
+                        entries.append((entry.path, stat.st_mtime, stat.st_size))
+                return entries
+        except FileNotFoundError:
+            return []
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        self._size = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if self._size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+
+    def stats(self) -> DiskCacheStats:
+        """Returns the counters of this process and the current size of the cache directory.
+
+        Returns:
+            DiskCacheStats: Counters and size of the cache
+        """
+        entries = self._entries()
+        return DiskCacheStats(self.hits, self.misses, len(entries), sum(size for _, _, size in entries))
+
+    def clear(self):
+        """Removes all entries and the project index snapshot from the cache directory.
+        """
+        with self._lock:
+            for path in [ self.index_path ] + [ path for path, _, _ in self._entries() ]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._size = 0
+            if self._index is not None:
+                self._index.close()
+            self._index = None
+
+
+@functools.lru_cache(maxsize=None)
+def shared_disk_cache(cache_dir: str) -> DiskCache:
+    """Returns the DiskCache of a cache directory shared by the whole process, so that worker processes open the
+    directory's project index once rather than for every module.
+
+    Args:
+        cache_dir (str): Directory holding the cache entries
+
+    Returns:
+        DiskCache: Cache of the directory
+    """
+    return DiskCache(cache_dir)
+
+
+def load_module(source_filepath: str, cache_dir: Optional[str] = None) -> ModuleDoc:
+    """Parses a module, through the persistent cache of `cache_dir` if one is given. Used to load modules in worker
+    processes.
+
+    Args:
+        source_filepath (str): Path to the Python source file to parse
+        cache_dir (str, optional): Directory of the persistent parse cache to use. Defaults to None, for no cache.
+
+    Returns:
+        ModuleDoc: Parsed documentation details of the module
+    """
+    if cache_dir is not None:
+        return shared_disk_cache(cache_dir).get(source_filepath)
+    return parse_module(source_filepath)
+
+
+class ModuleCache:
+    """In-memory cache of parsed ModuleDocs, keyed by source path and invalidated when the file's mtime or size
+    changes. A fresh ModuleCache is used for every compile by default, so each module is parsed at most once per
+    compile; long-lived callers, such as `compdoc watch` and the daemon, pass one cache to keep parsed modules across
+    compiles. Misses are served from the `disk_cache`, if one is given.
+
+    Single top-level definitions can also be requested with `get_symbol`, which parses only the requested
+    definition's source when the module isn't already parsed.
+
+    The worker processes started by `prefetch` are kept for later prefetches, until the cache is closed.
+
+    Attributes:
+        disk_cache (DiskCache | None): Persistent cache to consult before parsing a module.
+        hits (int): Number of `get` calls served from the cache.
+        misses (int): Number of `get` calls which had to parse the module.
+    """
+    disk_cache: Optional[DiskCache]
+    hits: int
+    misses: int
+
+    def __init__(self, disk_cache: Optional[DiskCache] = None):
+        self.disk_cache = disk_cache
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, tuple[int, int, ModuleDoc]] = {}
+        self._outlines: dict[str, tuple[int, int, str, dict[str, Optional[DefinitionSpan]], dict[str, DocType]]] = {}
+        self._path_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional["ProcessPoolExecutor"] = None
+
+    def get(self, source_filepath: str) -> ModuleDoc:
+        """Returns the ModuleDoc for the source file, parsing it only if it is not cached or has changed on disk.
+
+        Args:
+            source_filepath (str): Path to the Python source file to parse
+
+        Returns:
+            ModuleDoc: Parsed documentation details of the module
+        """
+        try:
+            stat = os.stat(source_filepath)
+        except OSError:
+            return parse_module(source_filepath)
+
+        with self._path_lock(source_filepath):
+            return self._get(source_filepath, stat)
+
+    def _path_lock(self, source_filepath: str) -> threading.Lock:
+        with self._lock:
+            return self._path_locks.setdefault(source_filepath, threading.Lock())
+
+    def _get(self, source_filepath: str, stat: os.stat_result) -> ModuleDoc:
+        entry = self._entries.get(source_filepath)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            self.hits += 1
+            return entry[2]
+        self.misses += 1
+
+        module_doc = self.disk_cache.get(source_filepath) if self.disk_cache else parse_module(source_filepath)
+        self._entries[source_filepath] = (stat.st_mtime_ns, stat.st_size, module_doc)
+        return module_doc
+
+    def get_symbol(self, source_filepath: str, name: str) -> Optional[DocType]:
+        """Returns the ClassDoc or FuncDoc of one top-level definition of the source file. Unless the module is
+        already parsed, or served from the disk cache's project index, only the definition's own source is parsed;
+        the whole module is parsed when the definition can't be located unambiguously.
+
+        Args:
+            source_filepath (str): Path to the Python source file
+            name (str): Name of the top-level class or function
+
+        Returns:
+            Optional[DocType]: ClassDoc or FuncDoc of the definition, if the module defines it
+        """
+        try:
+            stat = os.stat(source_filepath)
+        except OSError:
+            return parse_module(source_filepath).lookup(name)
+
+        with self._path_lock(source_filepath):
+            entry = self._entries.get(source_filepath)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self.hits += 1
+                return entry[2].lookup(name)
+
+            if self.disk_cache is not None and self.disk_cache.index is not None:
+                module_doc = self.disk_cache.index.get(source_filepath)
+                if module_doc is not None:
+                    self.hits += 1
+                    self._entries[source_filepath] = (stat.st_mtime_ns, stat.st_size, module_doc)
+                    return module_doc.lookup(name)
+
+            outline = self._outlines.get(source_filepath)
+            if outline is None or outline[0] != stat.st_mtime_ns or outline[1] != stat.st_size:
+                with open(source_filepath, 'r') as handle:
+                    source = handle.read()
+                outline = (stat.st_mtime_ns, stat.st_size, source, outline_module(source), {})
+                self._outlines[source_filepath] = outline
+            _, _, source, spans, docs = outline
+
+            doc = docs.get(name)
+            if doc is not None:
+                self.hits += 1
+                return doc
+
+            span = spans.get(name)
+            doc = parse_definition(source, span, source_filepath) if span is not None else None
+            if doc is None:
+                return self._get(source_filepath, stat).lookup(name)
+            self.misses += 1
+            docs[name] = doc
+            return doc
+
+    def prefetch(self, source_filepaths: Iterable[str], jobs: Optional[int] = None):
+        """Loads many modules concurrently over a pool of worker processes, so that later `get` calls for them are
+        served from memory. Modules which are already cached and unchanged are skipped, and modules which fail to
+        load are left for `get` to report. The pool is started by the first prefetch which needs more than one
+        worker, and reused until the cache is closed.
+
+        Args:
+            source_filepaths (Iterable[str]): Paths to the Python source files to load
+            jobs (int, optional): Number of worker processes of the pool, when it is started. Defaults to the number
+                of CPUs.
+        """
+        stale: dict[str, os.stat_result] = {}
+        for path in dict.fromkeys(source_filepaths):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+                stale[path] = stat
+
+        jobs = jobs or os.cpu_count() or 1
+        if min(jobs, len(stale)) <= 1:
+            for path in stale:
+                try:
+                    self.get(path)
+                except Exception:
+                    pass
+            return
+
+        cache_dir = self.disk_cache.cache_dir if self.disk_cache is not None else None
+        executor = self._pool(jobs)
+        futures = { path: executor.submit(load_module, path, cache_dir) for path in stale }
+        for path, future in futures.items():
+            try:
+                module_doc = future.result()
+            except Exception:
+                continue
+            with self._path_lock(path):
+                self.misses += 1
+                self._entries[path] = (stale[path].st_mtime_ns, stale[path].st_size, module_doc)
+
+    def _pool(self, jobs: int) -> "ProcessPoolExecutor":
+        with self._lock:
+            if self._executor is None:
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(max_workers=jobs)
+            return self._executor
+
+    def close(self):
+        """Shuts down the worker processes started by `prefetch`, if any. The cache stays usable, and a later
+        prefetch starts a new pool.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def stats(self) -> CacheStats:
+        """Returns the current hit/miss counters of the cache.
+
+        Returns:
+            CacheStats: Counters of the cache
+        """
+        return CacheStats(self.hits, self.misses, len(self._entries))
+
+    def clear(self):
+        """Drops all cached modules and resets the hit/miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._outlines.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,138 @@
+import itertools
+import json
+import os
+import socket
+from typing import Any, Optional
+
+from compdoc import DEFAULT_CACHE_DIR
+from compdoc.exceptions import DaemonRequestException
+
+
+"""Name of the Unix domain socket a `compdoc serve` daemon listens on, in the cache directory of its project"""
+SOCKET_FILE = 'compdoc.sock'
+
+
+def socket_path(cache_dir: str) -> str:
+    """Returns the path of the socket of the daemon serving the project owning a cache directory.
+
+    Args:
+        cache_dir (str): Directory of the project's persistent parse cache
+
+    Returns:
+        str: Path of the daemon's Unix domain socket
+    """
+    return os.path.join(cache_dir, SOCKET_FILE)
+
+
+def find_socket(folder: str) -> Optional[str]:
+    """Finds the socket of a daemon serving a folder, or one of the folders containing it, from the default cache
+    directory of each folder up to the root of the filesystem.
+
+    Args:
+        folder (str): Folder of the project, or of a package within it
+
+    Returns:
+        Optional[str]: Path of the closest daemon's socket, or None if there is none
+    """
+    folder = os.path.abspath(folder)
+    while True:
+        path = socket_path(os.path.join(folder, DEFAULT_CACHE_DIR))
+        if os.path.exists(path):
+            return path
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return None
+        folder = parent
+
+
+class CompDocClient:
+    """Client of a `compdoc serve` daemon, sending it requests over its Unix domain socket. Requests and responses are
+    JSON objects, one per line.
+
+    Attributes:
+        socket_path (str): Path of the daemon's socket
+    """
+    socket_path: str
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        """Connects to the daemon listening on a socket.
+
+        Args:
+            socket_path (str): Path of the daemon's socket
+            timeout (float, optional): Seconds to wait for a response before giving up. Defaults to None, to wait for
+                as long as requests take.
+
+        Raises:
+            OSError: If no daemon is listening on the socket
+        """
+        self.socket_path = socket_path
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._socket.settimeout(timeout)
+            self._socket.connect(socket_path)
+        except OSError:
+            self._socket.close()
+            raise
+        self._stream = self._socket.makefile('rwb')
+        self._ids = itertools.count(1)
+
+    @classmethod
+    def connect(cls, socket_path: str, timeout: Optional[float] = None) -> Optional["CompDocClient"]:
+        """Connects to the daemon listening on a socket, if there is one.
+
+        Args:
+            socket_path (str): Path of the daemon's socket
+            timeout (float, optional): Seconds to wait for a response before giving up. Defaults to None.
+
+        Returns:
+            Optional[CompDocClient]: Client of the daemon, or None if no daemon is running
+        """
+        if not os.path.exists(socket_path):
+            return None
+        try:
+            return cls(socket_path, timeout)
+        except OSError:
+            return None
+
+    def request(self, method: str, **params: Any) -> Any:
+        """Sends a request to the daemon and waits for its response.
+
+        Args:
+            method (str): Name of the requested method, e.g. 'compile', 'validate' or 'symbol'
+            params (Any): Parameters of the method
+
+        Raises:
+            DaemonRequestException: If the daemon failed to serve the request, or closed the connection
+
+        Returns:
+            Any: Result of the request
+        """
+        request_id = next(self._ids)
+        self._stream.write(json.dumps({'id': request_id, 'method': method, 'params': params}).encode() + b'\n')
+        self._stream.flush()
+        line = self._stream.readline()
+        if not line:
+            raise DaemonRequestException('The daemon at %s closed the connection' % self.socket_path)
+        response = json.loads(line)
+        if 'error' in response:
+            raise DaemonRequestException('%s: %s' % (response['error']['type'], response['error']['message']))
+        return response['result']
+
+    def close(self):
+        """Closes the connection to the daemon.
+        """
+        self._stream.close()
+        self._socket.close()
+
+    def __enter__(self) -> "CompDocClient":
+        """Returns the client, to close its connection when leaving a `with` block.
+
+        Returns:
+            CompDocClient: The client
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """Closes the connection to the daemon.
+        """
+        self.close()
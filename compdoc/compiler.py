@@ -1,19 +1,30 @@
+import contextlib
+import difflib
+import functools
 import os
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Container, Iterable, Iterator, Optional, Sequence, Union
 
-from jinja2 import BaseLoader, Environment, Template
+from jinja2 import BaseLoader, Environment, FileSystemBytecodeCache, Template, nodes
 from jinja2.environment import TemplateModule
+from jinja2.exceptions import TemplateNotFound
 
+from compdoc import timings
+from compdoc.cache import ModuleCache
 from compdoc.exceptions import (
     CompileClassFuncNotFoundException,
     CompileException,
     CompileUnrecognizedFormatterException,
     CompileUnrecognizedModuleAttrException,
     CompileUnrecognizedModuleException,
+    CompileUnrecognizedSymbolException,
     FormatterMissingException,
 )
-from compdoc.model import ClassDoc, DocType, FuncDoc, ModuleDoc
-from compdoc.parser import parse_module
+from compdoc.index import iter_symbols
+from compdoc.manifest import CompileManifest, config_digest
+from compdoc.model import ClassDoc, DocSequence, DocType, FuncDoc, ModuleDoc
 
 
 class CompDocBase(object):
@@ -35,80 +46,376 @@ class CompDocFunction(CompDocBase):
 
 class CompDocClass(CompDocBase):
     """Jinja context object containing documentation details about a Python class.
+
+    Its methods and nested classes are wrapped on first access and then stored as instance attributes, so that later
+    Jinja attribute lookups of them succeed directly. Methods whose names are shadowed by the wrapper's own attributes,
+    like `doc`, can be accessed by subscript instead, e.g. `cls['doc']`.
+
+    Attributes:
+        doc (ClassDoc): Documentation details of the class
+        attrs (dict[str, Union[CompDocClass, CompDocFunction]]): Wrappers of the methods and nested classes accessed so
+            far, by name
     """    
     doc: ClassDoc
-    attrs: dict[str, CompDocFunction]
+    attrs: dict[str, Union["CompDocClass", CompDocFunction]]
 
     def __init__(self, doc: ClassDoc):
-        """Builds a CompDoc wrapper around the ClassDoc's functions.
+        """Builds a CompDoc wrapper around the ClassDoc. Its functions are wrapped when they are first accessed.
 
         Args:
             doc (ClassDoc): ClassDoc to parse into a Jinja context object
         """        
         self.doc = doc
         self.attrs = {}
-        for d in self.doc.elements:
-            self.attrs[d.func_name] = CompDocFunction(d)
 
-    def __getattr__(self, name: str) -> CompDocFunction:
-        """Allows Jinja context to use attribute-getting "a.b" operations to reference module contents.
+    def _element(self, name: str) -> Union["CompDocClass", CompDocFunction]:
+        attr = self.attrs.get(name)
+        if attr is not None:
+            return attr
+        doc = DocSequence.of(self.doc.elements).get(name)
+        if doc is None:
+            raise CompileClassFuncNotFoundException("Could not find function %s in class %s" % \
+                                                    (name, self.doc.class_name))
+        attr = self.attrs.setdefault(name, CompDocClass(doc) if isinstance(doc, ClassDoc) else CompDocFunction(doc))
+        self.__dict__.setdefault(name, attr)
+        return attr
+
+    def __getitem__(self, name: str) -> CompDocBase:
+        """Allows Jinja context to use subscript "a['b']" operations to reference class functions and nested classes.
 
         Args:
-            name (str): Name of the function to attempt to get
+            name (str): Name of the function or nested class to attempt to get
 
         Returns:
-            CompDocFunction: The class function, as a CompDocFunction, if it exists
+            CompDocBase: The class function as a CompDocFunction, or the nested class as a CompDocClass, if it exists
 
         Raises:
             CompileClassFuncNotFoundException: If the name requested does not map to an explicitly defined function in 
             the class.
+        """
+        return self._element(name)
+
+    def __getattr__(self, name: str) -> CompDocBase:
+        """Called for attributes which are neither attributes of the wrapper nor elements of the class accessed
+        before, to wrap the class function or nested class on first access.
+
+        Args:
+            name (str): Name of the function or nested class to attempt to get
+
+        Returns:
+            CompDocBase: The class function as a CompDocFunction, or the nested class as a CompDocClass, if it exists
+
+        Raises:
+            AttributeError: If the name is a special "__name__" attribute, as probed by Python and Jinja internals
+            CompileClassFuncNotFoundException: If the name requested does not map to an explicitly defined function in 
+            the class.
         """        
-        try:
-            return super(object).__getattr__(name)
-        except AttributeError:
-            if name in self.attrs:
-                return self.attrs[name]
-            raise CompileClassFuncNotFoundException("Could not find function %s in class %s" % (name, self.doc.class_name))
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+        return self._element(name)
     
 
 class CompDocModule(CompDocBase):
     """Jinja context object containing documentation details about a Python module.
+
+    Its classes and functions are wrapped on first access and then stored as instance attributes, so that later Jinja
+    attribute lookups of them succeed directly. Elements whose names are shadowed by the wrapper's own attributes, like
+    `doc`, can be accessed by subscript instead, e.g. `module['doc']`.
+
+    Attributes:
+        doc (ModuleDoc): Documentation details of the module
+        attrs (dict[str, Union[CompDocClass, CompDocFunction]]): Wrappers of the elements accessed so far, by name
     """    
     doc: ModuleDoc
-    attrs: dict[str, CompDocClass | CompDocFunction]
+    attrs: dict[str, Union[CompDocClass, CompDocFunction]]
     
     def __init__(self, doc: ModuleDoc):
-        """Recursively builds out a CompDoc wrapper around the ModuleDoc's class and function tree.
+        """Builds a CompDoc wrapper around the ModuleDoc. Its classes and functions are wrapped when they are first
+        accessed.
 
         Args:
             doc (ModuleDoc): ModuleDoc to parse into a Jinja context object
         """        
         self.doc = doc
         self.attrs = {}
-        for d in self.doc.docs:
-            if isinstance(d, ClassDoc):
-                self.attrs[d.class_name] = CompDocClass(d)
-            else:
-                self.attrs[d.func_name] = CompDocFunction(d)
 
-    def __getattribute__(self, name: str) -> CompDocBase:
-        """Allows Jinja context to use attribute-getting "a.b" operations to reference module contents.
+    def _element(self, name: str) -> Union[CompDocClass, CompDocFunction]:
+        attr = self.attrs.get(name)
+        if attr is not None:
+            return attr
+        doc = DocSequence.of(self.doc.docs).get(name)
+        if doc is None:
+            raise CompileUnrecognizedModuleAttrException('Could not find element %s of module %s' % \
+                                                         (name, self.doc.module_name))
+        attr = self.attrs.setdefault(name, CompDocClass(doc) if isinstance(doc, ClassDoc) else CompDocFunction(doc))
+        self.__dict__.setdefault(name, attr)
+        return attr
+
+    def __getitem__(self, name: str) -> CompDocBase:
+        """Allows Jinja context to use subscript "a['b']" operations to reference module contents.
+
+        Args:
+            name (str): Name of the element to attempt to get
+
+        Raises:
+            CompileUnrecognizedModuleAttrException: If an unrecognized element is being requested
+
+        Returns:
+            CompDocBase: The module element, either a CompDocClass or CompDocFunction, if it exists
+        """
+        return self._element(name)
+
+    def __getattr__(self, name: str) -> CompDocBase:
+        """Called for attributes which are neither attributes of the wrapper nor elements of the module accessed
+        before, to wrap the module element on first access.
 
         Args:
             name (str): Name of attribute to attempt to get
 
         Raises:
+            AttributeError: If the name is a special "__name__" attribute, as probed by Python and Jinja internals
             CompileUnrecognizedModuleAttrException: If an unrecognized attribute is being requested
 
         Returns:
             CompDocBase: The module element, either a CompDocClass or CompDocFunction, if it exists
         """        
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+        return self._element(name)
+
+
+class TargetedCompDocModule(CompDocModule):
+    """CompDocModule which parses only the classes and functions a template accesses, through
+    `ModuleCache.get_symbol`. The module is parsed in full only if its `doc` is accessed.
+
+    Attributes:
+        module_name (str): Name of the module, as configured in .compdoc.yml
+        module_path (str): Path to the module's source file
+        module_cache (ModuleCache): Cache parsing the module and its definitions
+    """
+    module_name: str
+    module_path: str
+    module_cache: ModuleCache
+
+    def __init__(self, module_name: str, module_path: str, module_cache: ModuleCache):
+        """Builds a CompDoc wrapper around a module without parsing it.
+
+        Args:
+            module_name (str): Name of the module, as configured in .compdoc.yml
+            module_path (str): Path to the module's source file
+            module_cache (ModuleCache): Cache parsing the module and its definitions
+        """
+        self.module_name = module_name
+        self.module_path = module_path
+        self.module_cache = module_cache
+        self.attrs = {}
+
+    def _element(self, name: str) -> Union[CompDocClass, CompDocFunction]:
+        attr = self.attrs.get(name)
+        if attr is not None:
+            return attr
+        doc = self.module_cache.get_symbol(self.module_path, name)
+        if doc is None:
+            raise CompileUnrecognizedModuleAttrException('Could not find element %s of module %s' % \
+                                                         (name, self.module_name))
+        attr = self.attrs.setdefault(name, CompDocClass(doc) if isinstance(doc, ClassDoc) else CompDocFunction(doc))
+        self.__dict__.setdefault(name, attr)
+        return attr
+
+    def __getattr__(self, name: str) -> CompDocBase:
+        """Parses the whole module when its `doc` is first accessed, and otherwise wraps the module element on first
+        access.
+
+        Args:
+            name (str): Name of attribute to attempt to get
+
+        Raises:
+            AttributeError: If the name is a special "__name__" attribute, as probed by Python and Jinja internals
+            CompileUnrecognizedModuleAttrException: If an unrecognized attribute is being requested
+
+        Returns:
+            CompDocBase: The module element, either a CompDocClass or CompDocFunction, if it exists
+        """
+        if name == 'doc':
+            doc = self.__dict__['doc'] = self.module_cache.get(self.module_path)
+            return doc
+        return super().__getattr__(name)
+
+
+class PathLoader(BaseLoader):
+    """Jinja loader resolving template names as filesystem paths, so that templates loaded through it are cached by
+    the environment (and its bytecode cache, if any) and reloaded when the file changes.
+    """
+
+    def get_source(self, environment: Environment, template: str) -> tuple[str, str, Callable]:
+        """Reads the source of the template at the given path.
+
+        Args:
+            environment (Environment): Jinja environment loading the template
+            template (str): Path to the template file
+
+        Returns:
+            tuple[str, str, Callable]: Template source, its filename and a callback telling whether the file
+            is unchanged since it was read
+        """
         try:
-            return super().__getattribute__(name)
-        except AttributeError:
-            if name in self.attrs:
-                return self.attrs[name]
-            raise CompileUnrecognizedModuleAttrException('Could not find element %s of module %s' % (name, self.doc.module_name))
+            mtime = os.path.getmtime(template)
+            with open(template, 'r') as handle:
+                source = handle.read()
+        except OSError:
+            raise TemplateNotFound(template)
+
+        def uptodate() -> bool:
+            try:
+                return os.path.getmtime(template) == mtime
+            except OSError:
+                return False
+
+        return source, os.path.abspath(template), uptodate
+
+
+"""Files of the templates loaded during the render being tracked by `CompDocEnvironment.track_templates`, if any"""
+_loaded_templates: ContextVar[Optional[set[str]]] = ContextVar('_loaded_templates', default=None)
+
+
+class CompDocEnvironment(Environment):
+    """Jinja environment which records the files of the templates it loads while a render is tracked, so that the
+    templates a render pulls in through `{% include %}`, `{% import %}` or `{% extends %}` are recorded as dependencies
+    of its output. Templates are recorded whether they are loaded from their file or from the environment's cache.
+    """
+
+    @contextlib.contextmanager
+    def track_templates(self) -> Iterator[set[str]]:
+        """Records the templates loaded in the current context until the block exits.
+
+        Yields:
+            set[str]: Absolute paths of the templates loaded so far, filled in as they are loaded
+        """
+        loaded: set[str] = set()
+        token = _loaded_templates.set(loaded)
+        try:
+            yield loaded
+        finally:
+            _loaded_templates.reset(token)
+
+    def _track(self, template: Template) -> Template:
+        loaded = _loaded_templates.get()
+        if loaded is not None and template.filename is not None:
+            loaded.add(template.filename)
+        return template
+
+    def get_template(self, name, parent=None, globals=None) -> Template:
+        """Loads a template, recording its file if a render is being tracked.
+
+        Args:
+            name (Union[str, Template]): Name of the template
+            parent (str, optional): Name of the template importing or including it. Defaults to None.
+            globals (MutableMapping, optional): Extra variables of the template. Defaults to None.
+
+        Returns:
+            Template: The template
+        """
+        return self._track(super().get_template(name, parent, globals))
+
+    def select_template(self, names, parent=None, globals=None) -> Template:
+        """Loads the first of a list of templates which exists, recording its file if a render is being tracked.
+
+        Args:
+            names (Iterable[Union[str, Template]]): Names of the candidate templates
+            parent (str, optional): Name of the template importing or including it. Defaults to None.
+            globals (MutableMapping, optional): Extra variables of the template. Defaults to None.
+
+        Returns:
+            Template: The first template which exists
+        """
+        return self._track(super().select_template(names, parent, globals))
+
+
+def make_environment(bytecode_cache_dir: Optional[str] = None, enable_async: bool = False) -> Environment:
+    """Creates the Jinja environment used to compile CompDoc templates and formatters.
+
+    Args:
+        bytecode_cache_dir (str, optional): Directory in which to persist compiled Jinja bytecode across runs. Defaults
+            to None, for no bytecode cache.
+        enable_async (bool, optional): Whether templates are compiled for Jinja's async rendering path. Defaults to
+            False.
+
+    Returns:
+        CompDocEnvironment: Jinja environment loading templates by path
+    """
+    bytecode_cache = None
+    if bytecode_cache_dir is not None:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+    return CompDocEnvironment(extensions=['jinja2.ext.do'], loader=PathLoader(), bytecode_cache=bytecode_cache,
+                              enable_async=enable_async)
+
+
+class FormatterCache:
+    """Cache of formatter modules compiled by a Jinja environment, invalidated when the formatter's file changes.
+
+    Attributes:
+        env (Environment): Jinja environment compiling the formatters
+    """
+    env: Environment
+
+    def __init__(self, env: Environment):
+        self.env = env
+        self._modules: dict[str, tuple[int, int, TemplateModule]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, macros_path: str) -> TemplateModule:
+        """Returns the module implementing the macros of the formatter file, compiling it only on first use or after
+        the file changed.
+
+        Args:
+            macros_path (str): Path to the formatter's Jinja template file
+
+        Raises:
+            FormatterMissingException: The formatter's Jinja template file could not be found
+
+        Returns:
+            TemplateModule: The module implementing the formatter's Jinja macros
+        """
+        stat = self._stat(macros_path)
+        entry = self._modules.get(macros_path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+
+        with self._lock, timings.span('compile.formatter', macros_path):
+            formatter_module = self.env.get_template(macros_path).make_module()
+            self._modules[macros_path] = (stat.st_mtime_ns, stat.st_size, formatter_module)
+        return formatter_module
+
+    async def get_async(self, macros_path: str) -> TemplateModule:
+        """Returns the module implementing the macros of the formatter file, like `get`, for environments with
+        `enable_async`, whose template modules must be built asynchronously.
+
+        Args:
+            macros_path (str): Path to the formatter's Jinja template file
+
+        Raises:
+            FormatterMissingException: The formatter's Jinja template file could not be found
+
+        Returns:
+            TemplateModule: The module implementing the formatter's Jinja macros
+        """
+        stat = self._stat(macros_path)
+        entry = self._modules.get(macros_path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+
+        with timings.span('compile.formatter', macros_path):
+            formatter_module = await self.env.get_template(macros_path).make_module_async()
+        with self._lock:
+            self._modules[macros_path] = (stat.st_mtime_ns, stat.st_size, formatter_module)
+        return formatter_module
+
+    def _stat(self, macros_path: str) -> os.stat_result:
+        try:
+            return os.stat(macros_path)
+        except OSError:
+            raise FormatterMissingException("Couldn't find formatter: %s" % macros_path)
 
 
 class CompDoc:
@@ -116,16 +423,33 @@ class CompDoc:
     """    
     config: dict[str, dict]
     env: Environment
+    module_cache: ModuleCache
+    formatter_cache: FormatterCache
+    targeted: bool
+    dependencies: set[str]
 
-    def __init__(self, config_dict: dict[str, dict], env: Environment):
+    def __init__(self, config_dict: dict[str, dict], env: Environment, module_cache: Optional[ModuleCache] = None,
+                 formatter_cache: Optional[FormatterCache] = None, targeted: bool = False):
         """Instantiate a new CompDoc context
 
         Args:
             config_dict (dict[str, dict]): Configuration for the CompDoc context, from a `.compdoc.yml` file
             env (Environment): Jinja environment from which this context is being used
+            module_cache (ModuleCache, optional): Cache of parsed modules to share with other contexts. Defaults to a
+                new cache, private to this context.
+            formatter_cache (FormatterCache, optional): Cache of formatter modules compiled by `env`. Defaults to a new
+                cache, private to this context.
+            targeted (bool, optional): Whether modules only parse the classes and functions the template accesses,
+                rather than their whole source. Defaults to False.
         """        
         self.config = config_dict
         self.env = env
+        self.module_cache = module_cache if module_cache is not None else ModuleCache()
+        self.formatter_cache = formatter_cache if formatter_cache is not None else FormatterCache(env)
+        self.targeted = targeted
+        self.dependencies = set()
+        self._modules: dict[str, CompDocModule] = {}
+        self._symbols: dict[str, tuple[ModuleDoc, Union[CompDocClass, CompDocFunction]]] = {}
 
     def module(self, module_name: str) -> CompDocModule:
         """Returns a CompDocModule containing documentation details for the module's contents, if it's been
@@ -142,9 +466,60 @@ class CompDoc:
         """        
         if module_name not in self.config['modules']:
             raise CompileUnrecognizedModuleException('Did not recognize module "%s"' % module_name)
-        return CompDocModule(parse_module(self.config['modules'][module_name]))
+        module_path = self.config['modules'][module_name]
+        self.dependencies.add(module_path)
+        if self.targeted:
+            module = self._modules.get(module_name)
+            if not isinstance(module, TargetedCompDocModule):
+                module = self._modules[module_name] = TargetedCompDocModule(module_name, module_path, self.module_cache)
+            return module
+        module_doc = self.module_cache.get(module_path)
+        module = self._modules.get(module_name)
+        if module is None or module.doc is not module_doc:
+            module = self._modules[module_name] = CompDocModule(module_doc)
+        return module
     
-    def formatter(self, formatter: str) -> TemplateModule:
+    def symbol(self, fqname: str) -> Union[CompDocModule, CompDocClass, CompDocFunction]:
+        """Returns the module, class or function with the given fully qualified name, e.g. `pkg.mod.Class.method`,
+        from any module indexed in the configuration .compdoc.yml file. Only the wrapper of the requested symbol is
+        built, and it is reused by later lookups of the same name while its module is unchanged.
+
+        Args:
+            fqname (str): Fully qualified name of the symbol, starting with a module name from the configuration
+
+        Raises:
+            CompileUnrecognizedSymbolException: If no module or symbol has the given name. The message suggests close
+            matches, if there are any.
+
+        Returns:
+            Union[CompDocModule, CompDocClass, CompDocFunction]: The symbol, wrapped as a Jinja context object
+        """
+        if fqname in self.config['modules']:
+            return self.module(fqname)
+
+        split = split_symbol(fqname, self.config['modules'])
+        if split is None:
+            suggestions = _suggest(fqname, self.config['modules'])
+            raise CompileUnrecognizedSymbolException('Did not recognize symbol "%s"%s' % (fqname, suggestions))
+        module_name, qualname = split
+
+        module_path = self.config['modules'][module_name]
+        self.dependencies.add(module_path)
+        module_doc = self.module_cache.get(module_path)
+
+        entry = self._symbols.get(fqname)
+        if entry is not None and entry[0] is module_doc:
+            return entry[1]
+
+        doc = module_doc.lookup(qualname)
+        if doc is None:
+            suggestions = _suggest(fqname, iter_symbols(module_name, module_doc.docs))
+            raise CompileUnrecognizedSymbolException('Did not recognize symbol "%s"%s' % (fqname, suggestions))
+        symbol = CompDocClass(doc) if isinstance(doc, ClassDoc) else CompDocFunction(doc)
+        self._symbols[fqname] = (module_doc, symbol)
+        return symbol
+
+    def formatter(self, formatter: str) -> Union[TemplateModule, Awaitable]:
         """Returns a module to the Jinja template for the requested formatter name. The formatter name must be indexed 
         in .compdoc.yml. The contained formatting macros can be called from the returned module.
 
@@ -156,44 +531,279 @@ class CompDoc:
             FormatterMissingException: The formatter's Jinja template file could not be found
 
         Returns:
-            TemplateModule: The module implementing the formatter's Jinja macros
+            Union[TemplateModule, Awaitable]: The module implementing the formatter's Jinja macros, or an awaitable of
+            it if the environment has `enable_async`, which Jinja awaits for the template
         """        
         
         if formatter not in self.config['formatters']:
             raise CompileUnrecognizedFormatterException('Unrecognized formatter: %s' % formatter)
         
         macros_path = self.config['formatters'][formatter]
+        self.dependencies.add(macros_path)
+        if self.env.is_async:
+            return self.formatter_cache.get_async(macros_path)
+        return self.formatter_cache.get(macros_path)
+
+
+def split_symbol(fqname: str, module_names: Container[str]) -> Optional[tuple[str, str]]:
+    """Splits a fully qualified name into the longest of the given module names prefixing it, and the rest.
+
+    Args:
+        fqname (str): Fully qualified name of a symbol, e.g. `pkg.mod.Class.method`
+        module_names (Container[str]): Names of the modules the symbol may belong to
+
+    Returns:
+        Optional[tuple[str, str]]: Module name and the dotted path of the symbol within it, e.g. `('pkg.mod',
+        'Class.method')`, or None if no module prefixes the name
+    """
+    parts = fqname.split('.')
+    for split in range(len(parts) - 1, 0, -1):
+        module_name = '.'.join(parts[:split])
+        if module_name in module_names:
+            return module_name, '.'.join(parts[split:])
+    return None
+
+
+def find_module_references(env: Environment, template_path: str, module_names: Iterable[str]) -> list[str]:
+    """Statically scans a template for the modules it loads through `compdoc.module('name')` and
+    `compdoc.symbol('name')` calls with literal arguments, without rendering it.
+
+    Args:
+        env (Environment): Jinja environment loading the template
+        template_path (str): Path to the markdown-Jinja template
+        module_names (Iterable[str]): Names of the configured modules
+
+    Returns:
+        list[str]: Names of the configured modules the template loads, in order of first reference
+    """
+    module_names = set(module_names)
+    source, _, _ = env.loader.get_source(env, template_path)
+    references: dict[str, None] = {}
+    for call in env.parse(source).find_all(nodes.Call):
+        target = call.node
+        if not (isinstance(target, nodes.Getattr) and isinstance(target.node, nodes.Name)
+                and target.node.name == 'compdoc' and call.args and isinstance(call.args[0], nodes.Const)
+                and isinstance(call.args[0].value, str)):
+            continue
+        name = call.args[0].value
+        if target.attr == 'module' and name in module_names:
+            references[name] = None
+        elif target.attr == 'symbol':
+            split = split_symbol(name, module_names) if name not in module_names else (name, '')
+            if split is not None:
+                references[split[0]] = None
+    return list(references)
+
+
+def _suggest(name: str, candidates: Iterable[str]) -> str:
+    matches = difflib.get_close_matches(name, list(candidates), n=3)
+    return '. Did you mean: %s?' % ', '.join(matches) if matches else ''
+
+
+def default_out_path(template_path: str) -> str:
+    """Returns the path a template compiles to when no output path is given: the template path without its `.j2`
+    suffix.
+
+    Args:
+        template_path (str): Path to the markdown-Jinja template
+
+    Returns:
+        str: Path of the compiled output
+    """
+    if template_path.endswith('.j2'):
+        return template_path.removesuffix('.j2')
+    template_basename, template_ext = os.path.splitext(os.path.basename(template_path))
+    return template_basename + '.compiled.' + template_ext
+
+
+class CompDocCompiler:
+    """Compiles the markdown-Jinja templates of a project, sharing one Jinja environment and one module and formatter
+    cache across all of them, so each module and formatter is parsed and compiled once for the whole batch.
+
+    Attributes:
+        config (dict[str, dict]): Configuration for the CompDoc contexts, from a `.compdoc.yml` file
+        env (CompDocEnvironment): Jinja environment compiling the templates and formatters
+        module_cache (ModuleCache): Cache of parsed modules shared by the templates
+        formatter_cache (FormatterCache): Cache of formatter modules shared by the templates
+        manifest (CompileManifest | None): Record of the inputs of compiled outputs, used to skip templates whose
+            inputs haven't changed
+        targeted (bool): Whether modules only parse the classes and functions the templates access
+        prefetch (bool): Whether the modules a template loads are found by scanning it, and parsed concurrently
+            before it is rendered
+        skipped (list[str]): Templates which were skipped because their output was up to date
+        dependencies (dict[str, set[str]]): Absolute paths of the files each compiled template depends on, including
+            the template itself and the templates it includes, imports or extends
+    """
+    config: dict[str, dict]
+    env: CompDocEnvironment
+    module_cache: ModuleCache
+    formatter_cache: FormatterCache
+    manifest: Optional[CompileManifest]
+    targeted: bool
+    prefetch: bool
+    skipped: list[str]
+    dependencies: dict[str, set[str]]
+
+    def __init__(self, config_dict: dict[str, dict], module_cache: Optional[ModuleCache] = None,
+                 bytecode_cache_dir: Optional[str] = None, manifest: Optional[CompileManifest] = None,
+                 targeted: bool = False, prefetch: bool = False, enable_async: bool = False):
+        """Instantiate a new compiler for a project.
 
-        if not os.path.exists(macros_path):
-            raise FormatterMissingException("Couldn't find formatter: %s" % macros_path)
+        Args:
+            config_dict (dict[str, dict]): Configuration for the CompDoc contexts, from a `.compdoc.yml` file
+            module_cache (ModuleCache, optional): Cache of parsed modules to use. Defaults to a new cache.
+            bytecode_cache_dir (str, optional): Directory in which to persist compiled Jinja bytecode across runs.
+                Defaults to None, for no bytecode cache.
+            manifest (CompileManifest, optional): Record of the inputs of compiled outputs. If given, templates whose
+                inputs are unchanged since they were recorded are skipped. Defaults to None, to always compile.
+            targeted (bool, optional): Whether modules only parse the classes and functions the templates access,
+                rather than their whole source. Defaults to False.
+            prefetch (bool, optional): Whether the modules a template loads through `compdoc.module` or
+                `compdoc.symbol` calls with literal names are parsed concurrently, in worker processes, before it is
+                rendered. Defaults to False.
+            enable_async (bool, optional): Whether templates are rendered through Jinja's async rendering path.
+                Defaults to False.
+        """
+        self.config = config_dict
+        self.env = make_environment(bytecode_cache_dir, enable_async=enable_async)
+        self.module_cache = module_cache if module_cache is not None else ModuleCache()
+        self.formatter_cache = FormatterCache(self.env)
+        self.manifest = manifest
+        self.targeted = targeted
+        self.prefetch = prefetch
+        self.skipped = []
+        self.dependencies = {}
+        self._config_hash = config_digest(config_dict)
+
+    def reconfigure(self, config_dict: dict[str, dict]):
+        """Replaces the configuration of the compiler, keeping its caches warm.
 
-        with open(macros_path, 'r') as tf:
-            formatter_module = self.env.from_string(tf.read()).make_module()
+        Args:
+            config_dict (dict[str, dict]): New configuration for the CompDoc contexts
+        """
+        self.config = config_dict
+        self._config_hash = config_digest(config_dict)
 
-        return formatter_module
+    def close(self):
+        """Shuts down the worker processes the compiler's module cache started to prefetch modules, if any.
+        """
+        self.module_cache.close()
+
+    def __enter__(self) -> "CompDocCompiler":
+        """Enters a context which closes the compiler on exit.
 
+        Returns:
+            CompDocCompiler: This compiler
+        """
+        return self
 
-def compile_compdoc_mdj2(template_path: str, config_dict: dict[str, dict], out_path: Optional[str] = None):
+    def __exit__(self, *exc_info):
+        """Closes the compiler.
+        """
+        self.close()
 
-    template_basename, template_ext = os.path.splitext(os.path.basename(template_path))
-    env = Environment(extensions=['jinja2.ext.do'], loader=BaseLoader())
-    _compdoc = CompDoc(config_dict, env=env)
-    env_globals = env.make_globals({
-        "compdoc": _compdoc
-    })
-
-    if out_path is None:
-        if template_path.endswith('.j2'):
-            out_path = template_path.removesuffix('.j2')
-        else:
-            out_path = template_basename + '.compiled.' + template_ext
-    
-    with open(template_path, 'r') as f:
-        template = env.from_string(f.read(), globals=env_globals)
+    def compile(self, template_path: str, out_path: Optional[str] = None, force: bool = False) -> str:
+        """Renders a markdown-Jinja template and writes the result to its output path, unless the manifest records
+        that the output is up to date.
+
+        Args:
+            template_path (str): Path to the markdown-Jinja template to compile
+            out_path (str, optional): Path to write the compiled result to. Defaults to the template path without its
+                `.j2` suffix.
+            force (bool, optional): Whether to compile even if the output is up to date. Defaults to False.
+
+        Raises:
+            CompileException: If the template failed to render
+
+        Returns:
+            str: Path the compiled result was written to
+        """
+        self._prefetch([ (template_path, out_path) ], force)
+        out_path = self._compile(template_path, out_path, force)
+        if self.manifest is not None:
+            self.manifest.save()
+        return out_path
+
+    def _prefetch(self, templates: list[tuple[str, Optional[str]]], force: bool):
+        if not self.prefetch or self.targeted:
+            return
+        module_names: dict[str, None] = {}
+        for template_path, out_path in templates:
+            if not force and self.manifest is not None and self.manifest.is_fresh(
+                    template_path, out_path or default_out_path(template_path), self._config_hash):
+                continue
+            try:
+                module_names.update(dict.fromkeys(find_module_references(self.env, template_path,
+                                                                         self.config['modules'])))
+            except Exception:
+                """Templates which fail to load or parse are reported when they are compiled"""
+                continue
+        with timings.span('prefetch'):
+            self.module_cache.prefetch(self.config['modules'][name] for name in module_names)
+
+    def _compile(self, template_path: str, out_path: Optional[str], force: bool) -> str:
+        if out_path is None:
+            out_path = default_out_path(template_path)
+
+        if not force and self.manifest is not None and \
+                self.manifest.is_fresh(template_path, out_path, self._config_hash):
+            self.skipped.append(template_path)
+            self.dependencies[template_path] = set(self.manifest.dependencies(template_path))
+            return out_path
+
+        _compdoc = CompDoc(self.config, self.env, module_cache=self.module_cache,
+                           formatter_cache=self.formatter_cache, targeted=self.targeted)
+
+        """Templates pulled in by includes, imports and extends are dependencies too, along with modules and
+        formatters"""
+        try:
+            with self.env.track_templates() as templates:
+                with timings.span('compile.template', template_path):
+                    template = self.env.get_template(template_path)
+                with timings.span('render', template_path):
+                    rendered = template.render(compdoc=_compdoc)
+        except Exception as e:
+            raise CompileException('Failed to compile template %s. Error message: %s' % (template_path, str(e)))
+        finally:
+            dependencies: Sequence[str] = [ *_compdoc.dependencies, *templates ]
+            self.dependencies[template_path] = {
+                os.path.abspath(path) for path in (template_path, *dependencies)
+            }
 
-    try:
         with open(out_path, 'w') as f:
-            f.write(template.render())
-    except Exception as e:
-        raise CompileException('Failed to compile template %s. Error message: %s' % (template_path, str(e)))
+            f.write(rendered)
+
+        if self.manifest is not None:
+            self.manifest.record(template_path, out_path, self._config_hash, dependencies)
+        return out_path
+
+    def compile_all(self, template_paths: list[str], jobs: int = 1, force: bool = False) -> list[str]:
+        """Compiles many templates, optionally rendering them concurrently in a pool of threads.
 
+        Args:
+            template_paths (list[str]): Paths to the markdown-Jinja templates to compile
+            jobs (int, optional): Number of templates to render concurrently. Defaults to 1.
+            force (bool, optional): Whether to compile templates even if their output is up to date. Defaults to False.
+
+        Returns:
+            list[str]: Paths the compiled results were written to, in the same order as the templates
+        """
+        compile_one = functools.partial(self._compile, out_path=None, force=force)
+        self._prefetch([ (path, None) for path in template_paths ], force)
+        try:
+            if jobs <= 1 or len(template_paths) <= 1:
+                return [ compile_one(path) for path in template_paths ]
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                return list(executor.map(compile_one, template_paths))
+        finally:
+            if self.manifest is not None:
+                self.manifest.save()
+
+
+def compile_compdoc_mdj2(template_path: str, config_dict: dict[str, dict], out_path: Optional[str] = None,
+                         module_cache: Optional[ModuleCache] = None, bytecode_cache_dir: Optional[str] = None,
+                         targeted: bool = False, prefetch: bool = False, enable_async: bool = False):
+
+    with CompDocCompiler(config_dict, module_cache=module_cache, bytecode_cache_dir=bytecode_cache_dir,
+                         targeted=targeted, prefetch=prefetch, enable_async=enable_async) as compiler:
+        compiler.compile(template_path, out_path=out_path)
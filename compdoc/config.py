@@ -0,0 +1,47 @@
+import os
+
+
+"""YAML is imported by the functions reading configurations, so that commands run without one don't import it"""
+
+
+def load_config(config_path: str) -> dict[str, dict]:
+    """Loads a `.compdoc.yml` configuration, resolving its module and formatter paths relative to the directory of the
+    configuration file.
+
+    Args:
+        config_path (str): Path to the `.compdoc.yml` configuration file
+
+    Returns:
+        dict[str, dict]: Configuration for the CompDoc context
+    """
+    import yaml
+    with open(config_path, 'r') as cf:
+        config_dict = yaml.load(cf, yaml.BaseLoader)
+
+    """CWD correction"""
+    project_folder = os.path.dirname(config_path)
+    config_dict['modules'] = { 
+        mod: os.path.join(project_folder, path) for mod, path in config_dict['modules'].items() 
+    }
+    config_dict['formatters'] = {
+        formatter: os.path.join(project_folder, path) for formatter, path in config_dict['formatters'].items()
+    }
+    return config_dict
+
+
+def load_excludes(project_folder: str) -> list[str]:
+    """Reads the `exclude` patterns of the project's `.compdoc.yml` configuration, if it has any.
+
+    Args:
+        project_folder (str): Root folder of the project
+
+    Returns:
+        list[str]: Patterns, in `.gitignore` syntax, of paths to leave out of the module index
+    """
+    config_path = os.path.join(project_folder, '.compdoc.yml')
+    if not os.path.exists(config_path):
+        return []
+    import yaml
+    with open(config_path, 'r') as cf:
+        config_dict = yaml.load(cf, yaml.BaseLoader) or {}
+    return list(config_dict.get('exclude') or [])
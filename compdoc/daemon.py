@@ -0,0 +1,298 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from socketserver import StreamRequestHandler, ThreadingUnixStreamServer
+from typing import Any, Iterable, Iterator, Optional
+
+from compdoc.cache import DiskCache, ModuleCache
+from compdoc.client import CompDocClient, socket_path
+from compdoc.compiler import CompDoc, CompDocCompiler
+from compdoc.config import load_config, load_excludes
+from compdoc.exceptions import DaemonRequestException, DaemonRunningException
+from compdoc.manifest import CompileManifest
+from compdoc.model import ClassDoc, DocSequence, DocValidation, FuncDoc, ModuleDoc
+from compdoc.parser import index_modules
+from compdoc.report import dump_validation
+
+
+METHODS = ('ping', 'compile', 'validate', 'symbol', 'stats', 'shutdown')
+
+
+def describe(doc: Any) -> dict:
+    """Summarizes the documentation of a module, class or function as a JSON-serializable dict.
+
+    Args:
+        doc (Any): ModuleDoc, ClassDoc or FuncDoc to summarize
+
+    Returns:
+        dict: Kind, name, location and docstring of the document, with its signature for functions, its bases,
+        methods and nested classes for classes, and its classes and functions for modules
+    """
+    if isinstance(doc, FuncDoc):
+        return {
+            'kind': 'function',
+            'name': doc.func_name,
+            'filepath': doc.filepath,
+            'line_no': doc.line_no,
+            'string': doc.string,
+            'args': [ list(arg) for arg in doc.annotations.args ],
+            'returns': doc.annotations.returns,
+        }
+    if isinstance(doc, ClassDoc):
+        return {
+            'kind': 'class',
+            'name': doc.class_name,
+            'filepath': doc.filepath,
+            'line_no': doc.line_no,
+            'string': doc.string,
+            'bases': list(doc.bases),
+            'methods': [ method.func_name for method in DocSequence.of(doc.elements).functions ],
+            'classes': [ class_doc.class_name for class_doc in DocSequence.of(doc.elements).classes ],
+        }
+    return {
+        'kind': 'module',
+        'name': doc.module_name,
+        'filepath': doc.filepath,
+        'classes': [ class_doc.class_name for class_doc in doc.docs.classes ],
+        'functions': [ func_doc.func_name for func_doc in doc.docs.functions ],
+    }
+
+
+@contextmanager
+def _working_directory(path: Optional[str]) -> Iterator[None]:
+    """Runs the body of the context from the given working directory, if any, restoring the daemon's own on exit.
+
+    Args:
+        path (str, optional): Working directory to run from
+
+    Yields:
+        None
+    """
+    if path is None:
+        yield
+        return
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+class _DaemonServer(ThreadingUnixStreamServer):
+    daemon_threads = True
+    compdoc_daemon: "CompDocDaemon"
+
+
+class _RequestHandler(StreamRequestHandler):
+
+    def handle(self):
+        """Answers each line the client sends with a line holding the response.
+        """
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response = {'id': None, 'error': {'type': type(e).__name__, 'message': str(e)}}
+            else:
+                response = self.server.compdoc_daemon.handle(request)
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+            self.wfile.flush()
+            if self.server.compdoc_daemon.stopping:
+                """Shut down from another thread once the response is sent, as `shutdown` waits for the request being
+                served to finish"""
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+
+class CompDocDaemon:
+    """Resident compdoc process, keeping a project's parsed modules, compiled formatters and configuration in memory
+    and serving compile, validate and symbol lookup requests over a Unix domain socket, so repeated requests skip the
+    start-up and parsing costs of a new `compdoc` process.
+
+    The protocol is JSON Lines: each request is an object with an `id`, a `method` and its `params`, answered by an
+    object with the same `id` and either the method's `result` or an `error` with its `type` and `message`. The methods
+    and their params are:
+
+    - 'compile' (templates, cwd=None, config_path=None, force=False, out_path=None): compiles templates, answering
+      with the `compiled` outputs, the `skipped` templates which were up to date, and the `errors` of failed
+      templates.
+    - 'validate' (project_folder=None, exclude=()): validates every module of a project, answering with the failed
+      validations of each of its `modules` and the total number of `failures`.
+    - 'symbol' (name, cwd=None, config_path=None): looks up a module, class or function by its fully qualified name,
+      answering with its `describe` summary.
+    - 'stats', 'ping' and 'shutdown'.
+
+    Requests which take a `cwd` are served from the client's working directory, so relative paths, including the
+    module paths a configuration given by a relative path resolves to, are the same as in a `compdoc` run from there,
+    and so is the output. Requests are served one at a time, so one request's working directory never leaks into
+    another's.
+
+    Attributes:
+        project_folder (str): Absolute path of the root folder of the project
+        cache_dir (str): Directory of the project's persistent parse cache, which holds the daemon's socket
+        socket_path (str): Path of the daemon's Unix domain socket
+        module_cache (ModuleCache): Cache of parsed modules shared by every request
+        manifest (CompileManifest | None): Record of the inputs of compiled outputs, if the persistent cache is used
+        requests (int): Number of requests served
+        stopping (bool): Whether a 'shutdown' request was received
+    """
+    project_folder: str
+    cache_dir: str
+    socket_path: str
+    module_cache: ModuleCache
+    manifest: Optional[CompileManifest]
+    requests: int
+    stopping: bool
+
+    def __init__(self, project_folder: str, cache_dir: str, persistent: bool = True):
+        """Instantiate a daemon for a project.
+
+        Args:
+            project_folder (str): Root folder of the project
+            cache_dir (str): Directory of the project's persistent parse cache, where the socket is created
+            persistent (bool, optional): Whether parsed modules and compiled outputs are also recorded in the
+                persistent cache, as `compdoc compile` does. Defaults to True.
+        """
+        self.project_folder = os.path.abspath(project_folder)
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.socket_path = socket_path(self.cache_dir)
+        self.module_cache = ModuleCache(DiskCache(self.cache_dir) if persistent else None)
+        self.manifest = CompileManifest(os.path.join(self.cache_dir, 'manifest.json')) if persistent else None
+        self.requests = 0
+        self.stopping = False
+        self._compilers: dict[str, tuple[Optional[tuple[int, int]], CompDocCompiler]] = {}
+        self._validations: dict[str, tuple[ModuleDoc, list[DocValidation]]] = {}
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def compiler(self, config_path: Optional[str] = None) -> CompDocCompiler:
+        """Returns the resident compiler of a configuration, reloading the configuration if its file changed, or if it
+        is requested by another path. Compilers are kept by the configuration's absolute path, but its module and
+        formatter paths are resolved relative to the path it is requested by, as `compdoc compile` does.
+
+        Args:
+            config_path (str, optional): Path to the `.compdoc.yml` configuration, relative to the working directory.
+                Defaults to the configuration in the project folder.
+
+        Returns:
+            CompDocCompiler: Compiler of the configuration's templates
+        """
+        config_path = config_path or os.path.join(self.project_folder, '.compdoc.yml')
+        abspath = os.path.abspath(config_path)
+        stat = os.stat(abspath)
+        key = (stat.st_mtime_ns, stat.st_size, os.getcwd(), config_path)
+        entry = self._compilers.get(abspath)
+        if entry is None:
+            compiler = CompDocCompiler(load_config(config_path), module_cache=self.module_cache, manifest=self.manifest)
+        else:
+            compiler = entry[1]
+            if entry[0] != key:
+                compiler.reconfigure(load_config(config_path))
+        self._compilers[abspath] = (key, compiler)
+        return compiler
+
+    def handle(self, request: dict) -> dict:
+        """Serves one request of the protocol.
+
+        Args:
+            request (dict): Request, with its `id`, `method` and `params`
+
+        Returns:
+            dict: Response, with the request's `id` and either a `result` or an `error`
+        """
+        response: dict[str, Any] = {'id': request.get('id')}
+        try:
+            if request.get('method') not in METHODS:
+                raise DaemonRequestException('Unknown method: %s' % request.get('method'))
+            method = getattr(self, '_' + request['method'])
+            with self._lock:
+                self.requests += 1
+                response['result'] = method(**(request.get('params') or {}))
+        except Exception as e:
+            response['error'] = {'type': type(e).__name__, 'message': str(e)}
+        return response
+
+    def _ping(self) -> str:
+        return 'pong'
+
+    def _compile(self, templates: Iterable[str], cwd: Optional[str] = None, config_path: Optional[str] = None,
+                 force: bool = False, out_path: Optional[str] = None) -> dict:
+        with _working_directory(cwd):
+            compiler = self.compiler(config_path)
+            compiled: list[str] = []
+            errors: dict[str, str] = {}
+            skipped = len(compiler.skipped)
+            for template_path in templates:
+                try:
+                    compiled.append(compiler.compile(template_path, out_path=out_path, force=force))
+                except Exception as e:
+                    errors[template_path] = str(e)
+            skipped_paths = compiler.skipped[skipped:]
+            del compiler.skipped[skipped:]
+        return {'compiled': compiled, 'skipped': skipped_paths, 'errors': errors}
+
+    def _validate(self, project_folder: Optional[str] = None, exclude: Iterable[str] = ()) -> dict:
+        project_folder = os.path.abspath(project_folder or self.project_folder)
+        excludes = load_excludes(project_folder) + list(exclude)
+        modules = []
+        failures = 0
+        for module_name, rel_path in index_modules(project_folder, exclude=excludes).items():
+            path = os.path.normpath(os.path.join(project_folder, rel_path))
+            module_doc = self.module_cache.get(path)
+            entry = self._validations.get(path)
+            if entry is None or entry[0] is not module_doc:
+                entry = self._validations[path] = (module_doc, module_doc.validate())
+            failed = [ dump_validation(v) for v in entry[1] if v.errors ]
+            failures += len(failed)
+            modules.append({'module': module_name, 'path': rel_path, 'failures': failed})
+        return {'modules': modules, 'failures': failures}
+
+    def _symbol(self, name: str, cwd: Optional[str] = None, config_path: Optional[str] = None) -> dict:
+        with _working_directory(cwd):
+            compiler = self.compiler(config_path)
+            compdoc = CompDoc(compiler.config, compiler.env, module_cache=self.module_cache,
+                              formatter_cache=compiler.formatter_cache)
+            return describe(compdoc.symbol(name).doc)
+
+    def _stats(self) -> dict:
+        stats = self.module_cache.stats()
+        return {
+            'project_folder': self.project_folder,
+            'uptime': time.monotonic() - self._started,
+            'requests': self.requests,
+            'modules': stats.entries,
+            'hits': stats.hits,
+            'misses': stats.misses,
+        }
+
+    def _shutdown(self) -> bool:
+        self.stopping = True
+        return True
+
+    def serve(self):
+        """Listens on the daemon's socket and serves requests until a 'shutdown' request, or until interrupted.
+
+        Raises:
+            DaemonRunningException: If another daemon is already listening on the socket
+        """
+        client = CompDocClient.connect(self.socket_path)
+        if client is not None:
+            client.close()
+            raise DaemonRunningException('A compdoc daemon is already listening on %s' % self.socket_path)
+        if os.path.exists(self.socket_path):
+            """Left over by a daemon which didn't shut down cleanly"""
+            os.remove(self.socket_path)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.stopping = False
+        with _DaemonServer(self.socket_path, _RequestHandler) as server:
+            server.compdoc_daemon = self
+            try:
+                server.serve_forever()
+            finally:
+                self.module_cache.close()
+                if os.path.exists(self.socket_path):
+                    os.remove(self.socket_path)
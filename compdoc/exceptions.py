@@ -28,5 +28,17 @@ class CompileUnrecognizedFormatterException(Exception):
 class CompileClassFuncNotFoundException(Exception):
     pass
 
+class CompileUnrecognizedSymbolException(Exception):
+    pass
+
 class CompileException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class IndexFormatException(Exception):
+    pass
+
+class DaemonRunningException(Exception):
+    pass
+
+class DaemonRequestException(Exception):
+    pass
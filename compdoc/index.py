@@ -0,0 +1,253 @@
+import mmap
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import threading
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+from compdoc import __version__
+from compdoc.exceptions import AstParseException, IndexFormatException, ModuleNotFoundException
+from compdoc.indexer import iter_modules
+from compdoc.model import ClassDoc, DocSequence, DocType, FuncDoc, ModuleDoc
+from compdoc.parser import parse_module
+
+
+"""Bump whenever the layout of the snapshot changes, and along with CACHE_FORMAT whenever the pickled model changes"""
+INDEX_FORMAT = 4
+INDEX_MAGIC = b'CDIX'
+DEFAULT_INDEX_FILE = 'index.bin'
+
+_HEADER = struct.Struct('<4sHQ')
+
+
+class IndexedModule(NamedTuple):
+    """Entry of the module table of a ProjectIndex.
+
+    Attributes:
+        filepath (str): Path the module was parsed from, as recorded in its ModuleDoc.
+        abspath (str): Absolute path of the module's source file.
+        offset (int): Offset of the module's pickled ModuleDoc, from the start of the snapshot's data section.
+        length (int): Length in bytes of the module's pickled ModuleDoc.
+        mtime_ns (int): Modification time of the source file when it was indexed.
+        size (int): Size of the source file when it was indexed.
+    """
+    filepath: str
+    abspath: str
+    offset: int
+    length: int
+    mtime_ns: int
+    size: int
+
+
+def iter_symbols(module_name: str, docs: Iterable[DocType]) -> Iterator[str]:
+    """Yields the fully qualified names of the classes, functions and methods of a module.
+
+    Args:
+        module_name (str): Dotted name of the module
+        docs (Iterable[DocType]): Documented classes and functions of the module, or of one of its classes
+
+    Yields:
+        str: Fully qualified name of each symbol, e.g. `pkg.mod.Class.method`
+    """
+    for doc in docs:
+        if isinstance(doc, ClassDoc):
+            qualname = module_name + '.' + doc.class_name
+            yield qualname
+            yield from iter_symbols(qualname, doc.elements)
+        elif isinstance(doc, FuncDoc):
+            yield module_name + '.' + doc.func_name
+
+
+def relocate(docs: Iterable[DocType], filepath: str) -> DocSequence:
+    """Rebuilds the documents of a module with another path to its source file, such as the path a module is requested
+    with rather than the one it was indexed with.
+
+    Args:
+        docs (Iterable[DocType]): Documented classes and functions of the module, or of one of its classes
+        filepath (str): Path to the module's source file
+
+    Returns:
+        DocSequence: The documents, recording `filepath`
+    """
+    return DocSequence(
+        doc._replace(filepath=filepath, elements=relocate(doc.elements, filepath)) if isinstance(doc, ClassDoc)
+        else doc._replace(filepath=filepath)
+        for doc in docs
+    )
+
+
+class ProjectIndex:
+    """Snapshot of the parsed documentation of a whole project, with a table of its modules. The snapshot is
+    memory-mapped, and each module's ModuleDoc is only deserialized the first time it is requested, so loading the
+    index costs the same however large the project is.
+
+    A snapshot is laid out as a fixed header (magic, format, table length), the pickled module table, then the pickled
+    ModuleDoc of each module.
+
+    Attributes:
+        path (str): Path of the snapshot file
+        modules (dict[str, IndexedModule]): Table of the indexed modules, by dotted module name
+        skipped (list[str]): Paths of the modules left out of the snapshot because they failed to parse
+    """
+    path: str
+    modules: dict[str, IndexedModule]
+    skipped: list[str]
+
+    def __init__(self, path: str):
+        """Opens the snapshot at the given path.
+
+        Args:
+            path (str): Path of the snapshot file
+
+        Raises:
+            IndexFormatException: If the file is not a snapshot written by this version of compdoc
+        """
+        self.path = path
+        with open(path, 'rb') as handle:
+            try:
+                self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise IndexFormatException('Empty project index: %s' % path)
+
+        if len(self._mmap) < _HEADER.size:
+            raise IndexFormatException('Truncated project index: %s' % path)
+        magic, index_format, table_length = _HEADER.unpack_from(self._mmap)
+        if magic != INDEX_MAGIC or index_format != INDEX_FORMAT:
+            raise IndexFormatException('Unsupported project index format: %s' % path)
+
+        table = pickle.loads(self._mmap[_HEADER.size:_HEADER.size + table_length])
+        if table['version'] != __version__:
+            raise IndexFormatException('Project index %s was built by compdoc %s' % (path, table['version']))
+
+        self.modules = table['modules']
+        self.skipped = table['skipped']
+        self._data_offset = _HEADER.size + table_length
+        self._by_path = { entry.abspath: name for name, entry in self.modules.items() }
+        self._docs: dict[str, ModuleDoc] = {}
+        self._relocated: dict[str, ModuleDoc] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ProjectIndex"]:
+        """Opens the snapshot at the given path, if there is a usable one.
+
+        Args:
+            path (str): Path of the snapshot file
+
+        Returns:
+            Optional[ProjectIndex]: The snapshot, or None if it doesn't exist or was written by another version
+        """
+        try:
+            return cls(path)
+        except (OSError, IndexFormatException, pickle.UnpicklingError, EOFError, KeyError):
+            return None
+
+    def module(self, module_name: str) -> Optional[ModuleDoc]:
+        """Returns the indexed ModuleDoc of a module, deserializing it on first use.
+
+        Args:
+            module_name (str): Dotted name of the module
+
+        Returns:
+            Optional[ModuleDoc]: Documentation of the module as it was indexed, or None if it isn't indexed
+        """
+        module_doc = self._docs.get(module_name)
+        if module_doc is not None:
+            return module_doc
+        entry = self.modules.get(module_name)
+        if entry is None:
+            return None
+        with self._lock:
+            start = self._data_offset + entry.offset
+            module_doc = self._docs[module_name] = pickle.loads(self._mmap[start:start + entry.length])
+        return module_doc
+
+    def get(self, source_filepath: str) -> Optional[ModuleDoc]:
+        """Returns the indexed ModuleDoc of a source file, if the file is unchanged since it was indexed. Only the
+        file's metadata is read. If the file is requested by another path than it was indexed with, such as from
+        another working directory, the documents record the requested path, as if the module had been parsed from it.
+
+        Args:
+            source_filepath (str): Path to the Python source file
+
+        Returns:
+            Optional[ModuleDoc]: Documentation of the module, or None if it isn't indexed or has changed
+        """
+        module_name = self._by_path.get(os.path.abspath(source_filepath))
+        if module_name is None:
+            return None
+        entry = self.modules[module_name]
+        try:
+            stat = os.stat(source_filepath)
+        except OSError:
+            return None
+        if stat.st_mtime_ns != entry.mtime_ns or stat.st_size != entry.size:
+            return None
+        module_doc = self.module(module_name)
+        if module_doc is None or module_doc.filepath == source_filepath:
+            return module_doc
+
+        relocated = self._relocated.get(source_filepath)
+        if relocated is None:
+            filepath = sys.intern(source_filepath)
+            relocated = self._relocated[source_filepath] = \
+                module_doc._replace(filepath=filepath, docs=relocate(module_doc.docs, filepath))
+        return relocated
+
+    def close(self):
+        """Unmaps the snapshot file.
+        """
+        self._mmap.close()
+
+
+def build_index(project_folder: str, index_path: str, exclude: Iterable[str] = (),
+                parse: Callable = parse_module) -> ProjectIndex:
+    """Parses every module of a project and writes a snapshot of their documentation to `index_path`. Modules which
+    fail to parse are left out of the snapshot, and listed in its `skipped` paths, so they are parsed, and their errors
+    raised, when they are requested.
+
+    Args:
+        project_folder (str): Root folder of the project
+        index_path (str): Path to write the snapshot to
+        exclude (Iterable[str], optional): Patterns, in `.gitignore` syntax, of paths to leave out of the index.
+            Defaults to ().
+        parse (Callable, optional): Function returning the ModuleDoc of a source file, such as the `get` method of a
+            DiskCache. Defaults to parse_module.
+
+    Returns:
+        ProjectIndex: The written snapshot
+    """
+    modules: dict[str, IndexedModule] = {}
+    skipped: list[str] = []
+    blobs: list[bytes] = []
+    offset = 0
+
+    for module_name, rel_path in iter_modules(project_folder, exclude=exclude):
+        filepath = os.path.normpath(os.path.join(project_folder, rel_path))
+        try:
+            stat = os.stat(filepath)
+            module_doc = parse(filepath)
+        except (OSError, AstParseException, ModuleNotFoundException):
+            skipped.append(filepath)
+            continue
+        blob = pickle.dumps(module_doc, protocol=pickle.HIGHEST_PROTOCOL)
+        modules[module_name] = IndexedModule(filepath, os.path.abspath(filepath), offset, len(blob),
+                                             stat.st_mtime_ns, stat.st_size)
+        blobs.append(blob)
+        offset += len(blob)
+
+    table = pickle.dumps({'version': __version__, 'modules': modules, 'skipped': skipped},
+                         protocol=pickle.HIGHEST_PROTOCOL)
+
+    directory = os.path.dirname(index_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as handle:
+        handle.write(_HEADER.pack(INDEX_MAGIC, INDEX_FORMAT, len(table)))
+        handle.write(table)
+        for blob in blobs:
+            handle.write(blob)
+    os.replace(tmp_path, index_path)
+    return ProjectIndex(index_path)
@@ -0,0 +1,227 @@
+import os
+import re
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+
+DEFAULT_EXCLUDES = (
+    '.git/',
+    '.hg/',
+    '.svn/',
+    '.venv/',
+    'venv/',
+    'node_modules/',
+    '__pycache__/',
+    '.tox/',
+    '.nox/',
+    '.mypy_cache/',
+    '.pytest_cache/',
+    '.ruff_cache/',
+    '.compdoc-cache/',
+    '*.egg-info/',
+    '/build/',
+    '/dist/',
+)
+
+
+class IgnoreRule(NamedTuple):
+    """Struct for a single pattern of a `.gitignore` file, or of the configured exclude patterns.
+
+    Attributes:
+        regex (re.Pattern): Compiled pattern, matched against a path relative to `base`.
+        base (str): Directory the pattern is relative to, relative to the project root ('' for the root).
+        basename_only (bool): Whether the pattern matches against the last component of the path only.
+        dir_only (bool): Whether the pattern only matches directories.
+        negate (bool): Whether the pattern re-includes the paths it matches.
+    """
+    regex: re.Pattern
+    base: str
+    basename_only: bool
+    dir_only: bool
+    negate: bool
+
+
+def _translate(pattern: str) -> re.Pattern:
+    out: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+            continue
+        c = pattern[i]
+        if c == '*':
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[' and pattern.find(']', i + 1) != -1:
+            j = pattern.find(']', i + 1)
+            chars = pattern[i + 1:j]
+            if chars.startswith('!'):
+                chars = '^' + chars[1:]
+            out.append('[' + chars.replace('\\', '\\\\') + ']')
+            i = j
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile(''.join(out) + r'\Z')
+
+
+def parse_ignore_patterns(lines: Iterable[str], base: str = '') -> list[IgnoreRule]:
+    """Parses patterns in `.gitignore` syntax into IgnoreRules.
+
+    Args:
+        lines (Iterable[str]): Lines of the `.gitignore` file, or exclude patterns
+        base (str, optional): Directory the patterns are relative to, relative to the project root. Defaults to ''.
+
+    Returns:
+        list[IgnoreRule]: Parsed rules, in the same order as the patterns
+    """
+    rules: list[IgnoreRule] = []
+    for line in lines:
+        line = line.rstrip('\n').rstrip()
+        if not line or line.startswith('#'):
+            continue
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        elif line.startswith('\\'):
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+        basename_only = '/' not in line
+        rules.append(IgnoreRule(_translate(line.lstrip('/')), base, basename_only, dir_only, negate))
+    return rules
+
+
+def _read_gitignore(directory: str, base: str) -> list[IgnoreRule]:
+    try:
+        with open(os.path.join(directory, '.gitignore'), 'r') as handle:
+            return parse_ignore_patterns(handle, base)
+    except OSError:
+        return []
+
+
+def is_ignored(rules: Iterable[IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """Tells whether a path is ignored by a sequence of rules, where the last matching rule wins.
+
+    Args:
+        rules (Iterable[IgnoreRule]): Rules to match, in order of precedence
+        rel_path (str): Path relative to the project root, with '/' separators
+        is_dir (bool): Whether the path is a directory
+
+    Returns:
+        bool: True if the path is ignored
+    """
+    ignored = False
+    name = rel_path.rsplit('/', 1)[-1]
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.basename_only:
+            target = name
+        elif not rule.base:
+            target = rel_path
+        elif rel_path.startswith(rule.base + '/'):
+            target = rel_path[len(rule.base) + 1:]
+        else:
+            continue
+        if rule.regex.match(target):
+            ignored = not rule.negate
+    return ignored
+
+
+def module_name(rel_path: str) -> str:
+    """Derives the dotted module name of a Python file from its path relative to the project root. Package
+    `__init__.py` files are named after their package.
+
+    Args:
+        rel_path (str): Path to the Python file relative to the project root, with '/' separators
+
+    Returns:
+        str: Dotted module name, e.g. `pkg.sub.mod` for `pkg/sub/mod.py`, or `pkg` for `pkg/__init__.py`
+    """
+    name = rel_path.removesuffix('.py')
+    if name.endswith('/__init__'):
+        name = name.removesuffix('/__init__')
+    return name.replace('/', '.')
+
+
+def find_git_root(folder: str) -> Optional[str]:
+    """Finds the top-level directory of the git work tree containing a folder, which paths reported by git, e.g. by
+    `git diff --name-only`, are relative to.
+
+    Args:
+        folder (str): Folder inside the work tree
+
+    Returns:
+        Optional[str]: Absolute path of the work tree's top-level directory, or None if the folder isn't in one
+    """
+    folder = os.path.abspath(folder)
+    while True:
+        if os.path.exists(os.path.join(folder, '.git')):
+            return folder
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return None
+        folder = parent
+
+
+def iter_modules(project_filepath: str, exclude: Iterable[str] = (), use_gitignore: bool = True,
+                 default_excludes: Optional[Iterable[str]] = DEFAULT_EXCLUDES) -> Iterator[tuple[str, str]]:
+    """Walks a project in a single pass, lazily yielding its Python modules. Directories matched by the exclude
+    patterns or by `.gitignore` files are pruned without being walked.
+
+    Args:
+        project_filepath (str): Root folder of the project
+        exclude (Iterable[str], optional): Additional patterns to exclude, in `.gitignore` syntax relative to the
+            project root. Defaults to ().
+        use_gitignore (bool, optional): Whether to honour the `.gitignore` files of the project. Defaults to True.
+        default_excludes (Iterable[str], optional): Patterns excluded by default, such as virtualenvs and build
+            folders. Defaults to DEFAULT_EXCLUDES.
+
+    Yields:
+        tuple[str, str]: Dotted module name and path relative to the project root of each Python module
+    """
+    root_rules = parse_ignore_patterns(list(default_excludes or ()) + list(exclude))
+    stack: list[tuple[str, list[IgnoreRule]]] = [('', root_rules)]
+
+    while stack:
+        rel_dir, rules = stack.pop()
+        directory = os.path.join(project_filepath, rel_dir) if rel_dir else project_filepath
+        if use_gitignore:
+            gitignore_rules = _read_gitignore(directory, rel_dir)
+            if gitignore_rules:
+                rules = rules + gitignore_rules
+
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs: list[str] = []
+        for entry in entries:
+            rel_path = rel_dir + '/' + entry.name if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if not is_dir and not entry.name.endswith('.py'):
+                continue
+            if is_ignored(rules, rel_path, is_dir):
+                continue
+            if is_dir:
+                subdirs.append(rel_path)
+            elif entry.is_file():
+                yield module_name(rel_path), rel_path
+
+        stack.extend((subdir, rules) for subdir in reversed(subdirs))
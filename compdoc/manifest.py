@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Iterable
+
+from compdoc import __version__
+from compdoc.cache import file_digest
+
+
+def config_digest(config_dict: dict[str, dict]) -> str:
+    """Computes the hash of a CompDoc configuration, recorded with each compiled output so that outputs are recompiled
+    when the configuration changes.
+
+    Args:
+        config_dict (dict[str, dict]): Configuration for the CompDoc context, from a `.compdoc.yml` file
+
+    Returns:
+        str: Hex digest of the configuration
+    """
+    return hashlib.blake2b(json.dumps(config_dict, sort_keys=True).encode(), digest_size=20).hexdigest()
+
+
+class CompileManifest:
+    """Record of the inputs of each compiled output: the template, the modules and formatters its render touched, and
+    their content hashes. An output whose recorded inputs are all unchanged does not need to be recompiled.
+
+    Content hashes are only recomputed for files whose mtime or size changed since they were recorded.
+
+    Attributes:
+        path (str): Path of the JSON file the manifest is stored in.
+    """
+    path: str
+
+    def __init__(self, path: str):
+        """Loads the manifest stored at the given path, or starts an empty one if it doesn't exist or was written by a
+        different compdoc version.
+
+        Args:
+            path (str): Path of the JSON file the manifest is stored in
+        """
+        self.path = path
+        self._files: dict[str, list] = {}
+        self._outputs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+        try:
+            with open(path, 'r') as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == __version__:
+            self._files = data.get('files', {})
+            self._outputs = data.get('outputs', {})
+
+    def _unchanged(self, filepath: str) -> bool:
+        record = self._files.get(filepath)
+        if record is None:
+            return False
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return False
+        if record[0] == stat.st_mtime_ns and record[1] == stat.st_size:
+            return True
+        if file_digest(filepath) != record[2]:
+            return False
+        record[0], record[1] = stat.st_mtime_ns, stat.st_size
+        return True
+
+    def is_fresh(self, template_path: str, out_path: str, config_hash: str) -> bool:
+        """Tells whether the output of a template is up to date with the template and the dependencies recorded when
+        it was last compiled.
+
+        Args:
+            template_path (str): Path to the markdown-Jinja template
+            out_path (str): Path the template compiles to
+            config_hash (str): Hash of the configuration the template is compiled with, from `config_digest`
+
+        Returns:
+            bool: True if the template doesn't need to be recompiled
+        """
+        entry = self._outputs.get(os.path.abspath(template_path))
+        if entry is None or entry['out_path'] != os.path.abspath(out_path) or entry['config'] != config_hash:
+            return False
+        if not os.path.exists(out_path):
+            return False
+        with self._lock:
+            return all(self._unchanged(dep) for dep in entry['dependencies'])
+
+    def dependencies(self, template_path: str) -> list[str]:
+        """Returns the files the last compile of the template depended on, including the template itself.
+
+        Args:
+            template_path (str): Path to the markdown-Jinja template
+
+        Returns:
+            list[str]: Absolute paths of the template's dependencies
+        """
+        entry = self._outputs.get(os.path.abspath(template_path))
+        return list(entry['dependencies']) if entry else []
+
+    def record(self, template_path: str, out_path: str, config_hash: str, dependencies: Iterable[str]):
+        """Records the inputs of a freshly compiled output.
+
+        Args:
+            template_path (str): Path to the markdown-Jinja template
+            out_path (str): Path the template was compiled to
+            config_hash (str): Hash of the configuration the template was compiled with, from `config_digest`
+            dependencies (Iterable[str]): Paths of the modules and formatters the render touched
+        """
+        dependency_paths = [ os.path.abspath(template_path) ]
+        dependency_paths.extend(sorted({ os.path.abspath(dep) for dep in dependencies } - set(dependency_paths)))
+
+        records: dict[str, list] = {}
+        for dep in dependency_paths:
+            try:
+                stat = os.stat(dep)
+                records[dep] = [stat.st_mtime_ns, stat.st_size, file_digest(dep)]
+            except OSError:
+                continue
+
+        with self._lock:
+            self._files.update(records)
+            self._outputs[os.path.abspath(template_path)] = {
+                'out_path': os.path.abspath(out_path),
+                'config': config_hash,
+                'dependencies': dependency_paths,
+            }
+
+    def save(self):
+        """Writes the manifest to its path.
+        """
+        with self._lock:
+            data = json.dumps({'version': __version__, 'files': self._files, 'outputs': self._outputs})
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as handle:
+            handle.write(data)
+        os.replace(tmp_path, self.path)
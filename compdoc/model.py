@@ -1,38 +1,77 @@
 from enum import StrEnum
-from typing import Literal, NamedTuple, Optional, Union
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Iterator, Literal, NamedTuple, Optional, Sequence, Union
 
-from docstring_parser import Docstring
+from compdoc import timings
+
+if TYPE_CHECKING:
+    from docstring_parser import Docstring
 
 class ValidationStatus(StrEnum):
     FAILURE = 'failure'
     SUCCESS = 'success'
 
+class ValidationError(NamedTuple):
+    """Struct for a single rule a document failed to validate against.
+
+    Attributes:
+        rule (str): Identifier of the failed rule, e.g. 'missing-docstring'.
+        message (str): Description of the failure.
+    """
+    rule: str
+    message: str
+
+
 class DocValidation:
     """Struct for representing the cumulative validation status of a collection of CompDoc documents.
 
     Attributes:
         name (str): The name for tracking this DocValidation
+        filepath (str): Path to the source file of the validated document
+        line_no (int): Line number of the validated document
+        symbol (str): Qualified name of the validated document within its module, e.g. 'Class.method'
         status (ValidationStatus): The status of the validation ('success' or 'failure')
+        errors (list[ValidationError]): The rules the document failed to validate against
         message (str): The message associated with this DocValidation if it has on or more failures
     """    
     name: str
+    filepath: Optional[str]
+    line_no: Optional[int]
+    symbol: Optional[str]
     status: ValidationStatus = ValidationStatus('success')
-    message: Optional[str] = None
+    errors: list[ValidationError]
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, filepath: Optional[str] = None, line_no: Optional[int] = None,
+                 symbol: Optional[str] = None):
         self.name = name
+        self.filepath = filepath
+        self.line_no = line_no
+        self.symbol = symbol
+        self.errors = []
+
+    @property
+    def message(self) -> Optional[str]:
+        """Joins the messages of the failed rules, each on a new line.
+
+        Returns:
+            Optional[str]: Messages of the failures, or None if the validation succeeded
+        """
+        if not self.errors:
+            return None
+        return ''.join('\n' + error.message for error in self.errors)
 
-    def append_error(self, msg: str):
+    def append_error(self, msg: str, rule: str = 'docstring'):
         """Instantiates a DocValidation failure with the specified message.
 
         Args:
             msg (str): Failure message to attach to the DocValidation object
+            rule (str, optional): Identifier of the failed rule. Defaults to 'docstring'.
 
         Returns:
             DocValidation: Resulting DocValidation object
         """        
         self.status = ValidationStatus('failure')
-        self.message = (self.message if self.message else '') + '\n' + msg
+        self.errors.append(ValidationError(rule, msg))
 
     # def __add__(self, other: "DocValidation") -> "DocValidation":
     #     """Merge DocValidation results from a different CompDoc.
@@ -47,17 +86,40 @@ class DocValidation:
     #     self.message = (self.message if self.message else '') + '\n' + (other.message if other.message else '')
     #     return self
 
+@lru_cache(maxsize=2048)
+def parse_docstring(string: Optional[str]) -> Optional["Docstring"]:
+    """Parses a plaintext docstring, memoizing the result so that the docstring of a ClassDoc or FuncDoc is only parsed
+    the first time its `docstring` is accessed.
+
+    The memo is keyed by the docstring's text, so documents with identical docstrings share one Docstring object: it
+    must be treated as read-only.
+
+    Args:
+        string (str | None): Plaintext docstring to parse
+
+    Returns:
+        Optional[Docstring]: Parsed docstring contents, or None if there is no docstring
+    """
+    if string is None:
+        return None
+    """Imported on first use, so that commands which never read a docstring don't pay for importing the parser"""
+    import docstring_parser
+    with timings.span('parse.docstring'):
+        return docstring_parser.parse(string)
+
+
 class FuncAnnotations(NamedTuple):
     """Struct for storing string representations of the components of a function's signature.
 
     Attributes:
         first_arg ('self' | 'cls' | None): Leading argument of the function, for distinguishing instance/class/external
             methods.
-        args (list[tuple[str, str]]): Pairs of arg_name, arg_type for the function signature's arguments.
+        args (Sequence[tuple[str, str]]): Pairs of arg_name, arg_type for the function signature's arguments, as a
+            tuple.
         returns (str): Return type of the function, as a string.
     """    
     first_arg: Optional[Literal['self', 'cls']]
-    args: list[tuple[str, str]]
+    args: Sequence[tuple[str, str]]
     returns: str
 
 class FuncDoc(NamedTuple):
@@ -69,32 +131,41 @@ class FuncDoc(NamedTuple):
         line_no (int): Line number of the function implementation.
         annotations (FuncAnnotations): Object containing metadata of the function signature.
         string (str): Plaintext docstring at the top of the function implementation.
-        docstring (Docstring): Parsed docstring contents, as a `docstring_parser.Docstring`.
+        docstring (Docstring): Parsed `docstring_parser.Docstring`, parsed on first access and shared, read-only.
     """    
     func_name: str
     filepath: str
     line_no: int
     annotations: FuncAnnotations
     string: Optional[str]
-    docstring: Optional[Docstring]
 
-    def validate(self) -> DocValidation:
+    @property
+    def docstring(self) -> Optional["Docstring"]:
+        return parse_docstring(self.string)
+
+    def validate(self, scope: Optional[str] = None) -> DocValidation:
         """Determines if there are disagreements between the annotations in the function signature and its docstring.
         If there is agreement, the resulting DocValidation will have `'success'` as its status. Otherwise, it will have
         `'fail'` as its status, and a message.
 
+        Args:
+            scope (str, optional): Qualified name of the class enclosing the function, if any. Defaults to None.
+
         Returns:
             DocValidation: Result of the function signature validation
         """        
-        val = DocValidation(f'{self.filepath}\t@ {self.func_name}')
+        symbol = f'{scope}.{self.func_name}' if scope else self.func_name
+        val = DocValidation(f'{self.filepath}\t@ {self.func_name}', self.filepath, self.line_no, symbol)
         if self.docstring is None:
-            val.append_error("Docstring is missing.")
+            val.append_error("Docstring is missing.", rule='missing-docstring')
         elif len(self.docstring.params) != len(self.annotations.args):
             if self.annotations.first_arg is not None:
                 if len(self.docstring.params) and self.docstring.params[0].arg_name == self.annotations.first_arg:
-                    val.append_error('Neither "self" nor "cls" should be specified in function docstring arguments.')
+                    val.append_error('Neither "self" nor "cls" should be specified in function docstring arguments.',
+                                     rule='documented-first-arg')
+            docstring_args = tuple((p.arg_name, p.type_name) for p in self.docstring.params)
             val.append_error('Mismatching function signature arguments:\nSignature: %s\nDocstring: %s' % \
-                             (self.annotations.args, tuple((p.arg_name, p.type_name) for p in self.docstring.params)))
+                             (list(self.annotations.args), docstring_args), rule='argument-mismatch')
         return val
 
 
@@ -107,58 +178,159 @@ class ClassDoc(NamedTuple):
         filepath (str): Path to the source file, relative to the project root.
         line_no (int): Line number of the class implementation.
         string (str): Plaintext docstring at the top of the class implementation.
-        docstring (Docstring): Parsed docstring contents, as a `docstring_parser.Docstring`.
-        bases (list[str]): List of base classes of this class implementation.
-        elements (list[FuncDoc]): List of implemented methods of this class.
+        docstring (Docstring): Parsed `docstring_parser.Docstring`, parsed on first access and shared, read-only.
+        bases (Sequence[str]): Base classes of this class implementation, as a tuple.
+        elements (DocSequence[ClassDoc | FuncDoc]): Implemented methods and nested classes of this class.
     """    
     class_name: str
     filepath: str
     line_no: int
     string: Optional[str]
-    docstring: Optional[Docstring]
-    bases: list[str]
-    elements: list[FuncDoc]
+    bases: Sequence[str]
+    elements: Sequence["DocType"]
+
+    @property
+    def docstring(self) -> Optional["Docstring"]:
+        return parse_docstring(self.string)
+
     def get_func(self, name: str) -> Optional[FuncDoc]:
         """Searches the class for a function with the given name, returning its FuncDoc if it could be found.
 
         Args:
-            name (str): Function name to search for
+            name (str): Function name to search for, supporting dotted paths through nested classes
 
         Returns:
             Optional[FuncDoc]: FuncDoc for the specified function, if it could be found
         """        
-        return next(filter(lambda f: f.func_name == name, self.elements), None)
+        doc = DocSequence.of(self.elements).lookup(name)
+        return doc if isinstance(doc, FuncDoc) else None
     
+    def iter_validate(self, scope: Optional[str] = None) -> Iterator[DocValidation]:
+        """Validates the constituent functions of a ClassDoc one at a time, yielding each result as it is produced.
+
+        Args:
+            scope (str, optional): Qualified name of the class enclosing this class, if any. Defaults to None.
+
+        Yields:
+            DocValidation: Result of each function's validation
+        """
+        qualname = f'{scope}.{self.class_name}' if scope else self.class_name
+        for el in self.elements:
+            if isinstance(el, FuncDoc):
+                yield el.validate(qualname)
+            else:
+                yield from el.iter_validate(qualname)
+
     def validate(self) -> list[DocValidation]:
         """Validate the constituent functions of a ClassDoc have matching docstrings and signatures.
 
         Returns:
             list[DocValidation]: List of validation results
         """        
-        return [ el.validate() for el in self.elements ]
+        return list(self.iter_validate())
 
 
 DocType = Union[ClassDoc, FuncDoc]
 
+
+class DocSequence(tuple):
+    """Immutable sequence of the classes and functions documented in a module or class. The name index and the
+    partition into classes and functions are built on first use and kept for the lifetime of the sequence. As when the
+    module runs, a name defined more than once, such as a property and its setter, indexes its last definition.
+    """
+
+    @classmethod
+    def of(cls, docs: Sequence[DocType]) -> "DocSequence":
+        """Returns the given docs as a DocSequence, reusing it if it already is one.
+
+        Args:
+            docs (Sequence[DocType]): Documented classes and functions
+
+        Returns:
+            DocSequence: The docs, as a DocSequence
+        """
+        return docs if isinstance(docs, DocSequence) else cls(docs)
+
+    def __reduce__(self):
+        return (DocSequence, (tuple(self),))
+
+    @cached_property
+    def classes(self) -> Sequence[ClassDoc]:
+        return tuple(doc for doc in self if isinstance(doc, ClassDoc))
+
+    @cached_property
+    def functions(self) -> Sequence[FuncDoc]:
+        return tuple(doc for doc in self if isinstance(doc, FuncDoc))
+
+    @cached_property
+    def name_index(self) -> dict[str, DocType]:
+        index: dict[str, DocType] = {}
+        for doc in self:
+            index[doc.class_name if isinstance(doc, ClassDoc) else doc.func_name] = doc
+        return index
+
+    def get(self, name: str) -> Optional[DocType]:
+        """Returns the class or function bound to the given name: its last definition, whether a class or a function.
+
+        Args:
+            name (str): Name of the class or function
+
+        Returns:
+            Optional[DocType]: The class or function, if it could be found
+        """
+        return self.name_index.get(name)
+
+    def lookup(self, path: str) -> Optional[DocType]:
+        """Returns the class or function at the given dotted path, e.g. `Class.method` or `Outer.Inner.method`.
+
+        Args:
+            path (str): Dotted path of the class or function, relative to this sequence
+
+        Returns:
+            Optional[DocType]: The class or function, if it could be found
+        """
+        *class_names, name = path.split('.')
+        docs = self
+        for class_name in class_names:
+            class_doc = docs.get(class_name)
+            if not isinstance(class_doc, ClassDoc):
+                return None
+            docs = DocSequence.of(class_doc.elements)
+        return docs.get(name)
+
+
 class ModuleDoc(NamedTuple):
     """Struct for storing documentation details of the composite functions and classes of a Python module.
 
     Attributes:
         module_name (str): Name of the module, as in `__module__`.
         filepath (str): Path to the source file, relative to the project root.
-        docs (list[ClassDoc | FuncDoc]): Implemented classes and functions in the module.
+        docs (DocSequence[ClassDoc | FuncDoc]): Implemented classes and functions in the module.
     """    
     module_name: str
     filepath: str
-    docs: list[DocType]
+    docs: Sequence[DocType]
 
     @property
-    def classes(self) -> list[ClassDoc]:
-        return [ cdoc for cdoc in self.docs if isinstance(cdoc, ClassDoc) ]
+    def classes(self) -> Sequence[ClassDoc]:
+        return DocSequence.of(self.docs).classes
     
     @property
-    def external_functions(self) -> list[FuncDoc]:
-        return [ fdoc for fdoc in self.docs if isinstance(fdoc, FuncDoc) ]
+    def external_functions(self) -> Sequence[FuncDoc]:
+        return DocSequence.of(self.docs).functions
+
+    def iter_validate(self) -> Iterator[DocValidation]:
+        """Validates the constituent functions and classes in the ModuleDoc one at a time, yielding each result as it
+        is produced.
+
+        Yields:
+            DocValidation: Result of each constituent validation
+        """
+        for doc in self.docs:
+            if isinstance(doc, FuncDoc):
+                yield doc.validate()
+            else:
+                yield from doc.iter_validate()
 
     def validate(self) -> list[DocValidation]:
         """Validates the constituent functions and classes in the ModuleDoc to determine if any of them have
@@ -167,24 +339,30 @@ class ModuleDoc(NamedTuple):
         Returns:
             list[DocValidation]: Results of the constituent validations
         """        
-        vals = []
-        for doc in self.docs:
-            if isinstance(doc, FuncDoc):
-                vals.append(doc.validate())
-            else:
-                vals.extend(doc.validate())
-        return vals
+        return list(self.iter_validate())
+
+    def lookup(self, name: str) -> Optional[DocType]:
+        """Searches the module for the class or function bound to the given dotted path.
+
+        Args:
+            name (str): Dotted path of the class or function within the module, e.g. `Class.method`
+
+        Returns:
+            Optional[DocType]: ClassDoc or FuncDoc at the path, if it could be found
+        """
+        return DocSequence.of(self.docs).lookup(name)
 
     def get_class(self, name: str) -> Optional[ClassDoc]:
         """Searches the module for a class with the given name, returning its ClassDoc if it could be found.
 
         Args:
-            name (str): Class name to search for
+            name (str): Class name to search for, supporting dotted paths to nested classes
 
         Returns:
             Optional[ClassDoc]: ClassDoc for the specified class, if it could be found
         """        
-        return next(filter(lambda c: getattr(c, 'class_name', None) == name, self.docs), None)
+        doc = DocSequence.of(self.docs).lookup(name)
+        return doc if isinstance(doc, ClassDoc) else None
     
 
     def get_func(self, name: str) -> Optional[FuncDoc]:
@@ -196,13 +374,5 @@ class ModuleDoc(NamedTuple):
         Returns:
             Optional[FuncDoc]: FuncDoc for the specified function, if it could be found
         """        
-        if name.count('.') == 1:
-            cl, fn = name.split('.')
-            cl = self.get_class(cl)
-            if cl is None:
-                return None
-            return cl.get_func(fn)
-        elif '.' not in name:
-            return next(filter(lambda f: getattr(f, 'func_name', None) == name, self.docs), None)
-        else:
-            return None
\ No newline at end of file
+        doc = DocSequence.of(self.docs).lookup(name)
+        return doc if isinstance(doc, FuncDoc) else None
@@ -1,24 +1,31 @@
 import ast
-import glob
 import os
-from typing import Optional
+import re
+import sys
+from typing import Any, Iterable, NamedTuple, Optional, Union
 
-import docstring_parser
+from compdoc import timings
+from compdoc.exceptions import AstParseException, ModuleNotFoundException
+from compdoc.indexer import iter_modules
+from compdoc.model import ClassDoc, DocSequence, DocType, FuncAnnotations, FuncDoc, ModuleDoc
 
-from compdoc.exceptions import (
-    AstParseException,
-    ModuleNotFoundException,
-    ParseArgAnnotationException,
-    ParseClassBaseException,
-)
-from compdoc.model import ClassDoc, FuncAnnotations, FuncDoc, ModuleDoc
 
+def index_modules(project_filepath: str, exclude: Iterable[str] = (), use_gitignore: bool = True) -> dict[str, str]:
+    with timings.span('index'):
+        return dict(iter_modules(project_filepath, exclude=exclude, use_gitignore=use_gitignore))
 
-def index_modules(project_filepath: str) -> dict[str, str]:
-    python_files = glob.glob('*.py', root_dir=project_filepath) + glob.glob('**/*.py', root_dir=project_filepath)
-    python_files = [ p.removeprefix('./') for p in python_files ]
-    module_shortnames = [ p.replace('/', '.').removesuffix('.py') for p in python_files ]
-    return dict(zip(module_shortnames, python_files))
+
+def _intern(value: Any) -> Any:
+    """Interns strings repeated across many documents, such as file paths and type names, so that each distinct value
+    is held in memory once.
+
+    Args:
+        value (Any): Value to intern, if it is a string
+
+    Returns:
+        Any: The interned string, or the value itself if it isn't a string
+    """
+    return sys.intern(value) if isinstance(value, str) else value
 
 
 def parse_module(source_filepath: str) -> ModuleDoc:
@@ -28,147 +35,297 @@ def parse_module(source_filepath: str) -> ModuleDoc:
 
     with open(source_filepath, 'r') as handle:
         try:
-            module: ast.Module = ast.parse(handle.read(), filename=source_filepath)
+            with timings.span('parse.read', source_filepath):
+                source = handle.read()
+            with timings.span('parse.ast', source_filepath):
+                module: ast.Module = ast.parse(source, filename=source_filepath)
         except Exception as e:
             raise AstParseException('AST Failed to parse module: ' + source_filepath + '\nReason:\n' + str(e))
 
-    module_name = os.path.basename(source_filepath).removesuffix('.py')
-    module_doc = ModuleDoc(module_name, source_filepath, [])
-    
-    for statement in module.body:
-
-        if isinstance(statement, ast.ClassDef):
-            class_doc: ClassDoc = parse_class_def(statement, source_filepath)
-            module_doc = module_doc._replace(docs=module_doc.docs + [class_doc])
-        elif isinstance(statement, ast.FunctionDef):
-            func_doc: FuncDoc = parse_function_def(statement, source_filepath)
-            module_doc = module_doc._replace(docs=module_doc.docs + [func_doc])
+    source_filepath = _intern(source_filepath)
+    module_name = _intern(os.path.basename(source_filepath).removesuffix('.py'))
 
-    return module_doc
+    with timings.span('parse.extract', source_filepath):
+        docs = DocExtractor(source_filepath).extract(module.body)
 
+    return ModuleDoc(module_name, source_filepath, docs)
 
-def parse_class_def(class_def: ast.ClassDef, filepath: str) -> ClassDoc:
 
-    class_bases: list[str] = []
-
-    for base in class_def.bases:
-        if isinstance(base, ast.Name):
-            class_bases += [ base.id ]
-        elif isinstance(base, ast.Subscript):
-            assert isinstance(base.value, ast.Name) and isinstance(base.slice, ast.Name)
-            class_bases += [ base.value.id + '[' + base.slice.id + ']' ]
-        else:
-            raise ParseClassBaseException('Failed to parse base %s of class %s' % (base, class_def.name))
-
-    class_doc = ClassDoc(
-        class_def.name, 
-        filepath, 
-        class_def.lineno, 
-        None, 
-        None,
-        class_bases, 
-        [],
+"""Lexes just enough of a module to find its top-level statements: strings and comments are skipped whole, so that
+text inside them is never mistaken for a definition"""
+_TOP_LEVEL_SCAN = re.compile(r'''
+    (?=[rRbBuUfF'"])(?:[rRbBuUfF]{1,2})?(?:
+        """[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"""
+      | \'\'\'[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*\'\'\'
+      | "[^"\\\n]*(?:\\.[^"\\\n]*)*"
+      | '[^'\\\n]*(?:\\.[^'\\\n]*)*'
     )
+  | \#[^\n]*
+  | ^(?:async[ \t]+)?(?:def|class)[ \t]+(?P<name>\w+)
+  | ^(?P<statement>[^\s#])
+''', re.MULTILINE | re.VERBOSE)
+
+
+class DefinitionSpan(NamedTuple):
+    """Location of a top-level class or function definition in the source of a module.
+
+    Attributes:
+        line_no (int): Line number of the definition's header.
+        start (int): Offset of the definition's header in the source.
+        end (int): Offset of the next top-level statement in the source, or the end of the source.
+    """
+    line_no: int
+    start: int
+    end: int
+
+
+def outline_module(source: str) -> dict[str, Optional[DefinitionSpan]]:
+    """Locates the top-level class and function definitions of a module without parsing it.
+
+    Args:
+        source (str): Python source of the module
+
+    Returns:
+        dict[str, Optional[DefinitionSpan]]: Span of each top-level definition by name, or None for names which are
+        defined more than once
+    """
+    outline: dict[str, Optional[DefinitionSpan]] = {}
+    line_no, last_pos = 1, 0
+    open_name: Optional[str] = None
+    open_span: Optional[tuple[int, int]] = None
+
+    for match in _TOP_LEVEL_SCAN.finditer(source):
+        if not match.lastindex:
+            continue
+        pos = match.start()
+        line_no += source.count('\n', last_pos, pos)
+        last_pos = pos
+        if open_name is not None:
+            outline[open_name] = DefinitionSpan(open_span[0], open_span[1], pos)
+            open_name = None
+        name = match.group('name')
+        if name is not None:
+            if name in outline:
+                outline[name] = None
+            else:
+                open_name, open_span = name, (line_no, pos)
+
+    if open_name is not None:
+        outline[open_name] = DefinitionSpan(open_span[0], open_span[1], len(source))
+    return outline
+
+
+def parse_definition(source: str, span: DefinitionSpan, filepath: str) -> Optional[DocType]:
+    """Parses a single top-level definition from its span in the source of a module.
+
+    Args:
+        source (str): Python source of the module
+        span (DefinitionSpan): Span of the definition, from `outline_module`
+        filepath (str): Path to the source file of the module
+
+    Returns:
+        Optional[DocType]: ClassDoc or FuncDoc of the definition, or None if the span doesn't hold exactly one class
+        or function definition, in which case the module should be parsed in full
+    """
+    try:
+        with timings.span('parse.ast', filepath):
+            segment: ast.Module = ast.parse(source[span.start:span.end], filename=filepath)
+    except SyntaxError:
+        return None
+    if len(segment.body) != 1:
+        return None
+
+    ast.increment_lineno(segment, span.line_no - 1)
+    return DocExtractor(_intern(filepath)).visit(segment.body[0])
+
+
+def parse_symbol(source_filepath: str, name: str) -> Optional[DocType]:
+    """Parses one top-level class or function of a module, parsing only its definition when it can be located
+    unambiguously, and the whole module otherwise.
+
+    Args:
+        source_filepath (str): Path to the Python source file
+        name (str): Name of the top-level class or function
+
+    Raises:
+        ModuleNotFoundException: If the source file doesn't exist
+
+    Returns:
+        Optional[DocType]: ClassDoc or FuncDoc of the definition, if the module defines it
+    """
+    if not os.path.exists(source_filepath):
+        raise ModuleNotFoundException('Could not find module: ' + source_filepath)
+    with open(source_filepath, 'r') as handle:
+        source = handle.read()
+    span = outline_module(source).get(name)
+    doc = parse_definition(source, span, source_filepath) if span is not None else None
+    if doc is None:
+        doc = parse_module(source_filepath).lookup(name)
+    return doc
+
+
+"""Function definitions, parsed alike whether they are synchronous or not"""
+AnyFunctionDef = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+def _format_annotation(annotation: ast.expr) -> str:
+    """Formats a type annotation as a string. Names, subscripts and tuples are formatted directly, with string forward
+    references unquoted; every other expression, such as `X | Y` unions or `a.b.C` attribute chains, is formatted as it
+    is written in the source.
+
+    Args:
+        annotation (ast.expr): Expression of the annotation
+
+    Returns:
+        str: The annotation, as a string
+    """
+    if isinstance(annotation, ast.Name):
+        return annotation.id
+    if isinstance(annotation, ast.Subscript):
+        return _format_annotation(annotation.value) + '[' + _format_annotation(annotation.slice) + ']'
+    if isinstance(annotation, ast.Tuple):
+        return ', '.join(map(_format_annotation, annotation.elts))
+    if isinstance(annotation, ast.Constant) and isinstance(annotation.value, str):
+        return annotation.value
+    return ast.unparse(annotation)
+
+
+class DocExtractor(ast.NodeVisitor):
+    """Extracts the documented classes and functions of a module in a single walk over its syntax tree. Visiting a
+    class or function definition returns its ClassDoc or FuncDoc, and visiting any other statement returns None
+    without walking into it, so only module and class bodies are walked.
+
+    Synchronous and async functions are documented alike, and classes nested in a class body are documented as
+    elements of the enclosing class.
+
+    Attributes:
+        filepath (str): Path to the source file of the module, recorded in every document
+    """
+    filepath: str
+
+    def __init__(self, filepath: str):
+        """Instantiate an extractor for the definitions of one module.
+
+        Args:
+            filepath (str): Path to the source file of the module
+        """
+        self.filepath = filepath
+
+    def extract(self, body: Iterable[ast.stmt]) -> DocSequence:
+        """Extracts the documents of the definitions in the body of a module or class.
+
+        Args:
+            body (Iterable[ast.stmt]): Statements of the body
+
+        Returns:
+            DocSequence: ClassDoc or FuncDoc of each class or function defined in the body, in order
+        """
+        return DocSequence(doc for doc in map(self.visit, body) if doc is not None)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        """Skips statements which don't define a class or function, without walking into them.
+
+        Args:
+            node (ast.AST): Statement to skip
+        """
+        return None
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> ClassDoc:
+        """Extracts the documentation of a class, with its methods and nested classes.
+
+        Args:
+            node (ast.ClassDef): Definition of the class
+
+        Returns:
+            ClassDoc: Documentation details of the class
+        """
+        return ClassDoc(
+            _intern(node.name),
+            self.filepath,
+            node.lineno,
+            _parse_docstring(node),
+            tuple(_intern(_format_annotation(base)) for base in node.bases),
+            self.extract(node.body),
+        )
+
+    def visit_FunctionDef(self, node: AnyFunctionDef) -> FuncDoc:
+        """Extracts the documentation of a function or method, synchronous or async.
+
+        Args:
+            node (AnyFunctionDef): Definition of the function
+
+        Returns:
+            FuncDoc: Documentation details of the function
+        """
+        return FuncDoc(
+            _intern(node.name),
+            self.filepath,
+            node.lineno,
+            parse_function_annotations(node),
+            _parse_docstring(node),
+        )
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+
+def _parse_docstring(definition: Union[ast.ClassDef, AnyFunctionDef]) -> Optional[str]:
+    if definition.body and isinstance(definition.body[0], ast.Expr):
+        if isinstance(definition.body[0].value, ast.Constant) and isinstance(definition.body[0].value.value, str):
+            body_offset: int = definition.col_offset + 4
+            return definition.body[0].value.value.replace('\n' + ' ' * body_offset, '\n').strip()
+    return None
 
-    if isinstance(class_def.body[0], ast.Expr):
-        if isinstance(class_def.body[0].value, ast.Constant):
-            if class_def.body[0].value.s  is not None:
-                body_offset: int = class_def.col_offset + 4
-                docstring = class_def.body[0].value.s.replace('\n' + ' ' * body_offset, '\n').strip()
-                class_doc = class_doc._replace(
-                    string=docstring,
-                    docstring=docstring_parser.parse(docstring),
-                )
-
-    for statement in class_def.body:
-
-        if isinstance(statement, ast.FunctionDef):
-            func_doc: FuncDoc = parse_function_def(statement, filepath)
-            class_doc = class_doc._replace(elements=class_doc.elements + [func_doc])
-
-    return class_doc
 
+def parse_class_def(class_def: ast.ClassDef, filepath: str) -> ClassDoc:
+    return DocExtractor(filepath).visit_ClassDef(class_def)
 
-def parse_function_def(function_def: ast.FunctionDef, filepath: str) -> FuncDoc:
-    
-    func_doc = FuncDoc(
-        function_def.name,
-        filepath,
-        function_def.lineno,
-        parse_function_annotations(function_def),
-        None,
-        None,
-    )
 
-    if isinstance(function_def.body[0], ast.Expr):
-        if isinstance(function_def.body[0].value, ast.Constant):
-            if function_def.body[0].value.s is not None:
-                body_offset: int = function_def.col_offset + 4
-                docstring = function_def.body[0].value.s.replace('\n' + ' ' * body_offset, '\n').strip()
-                func_doc = func_doc._replace(
-                    string=docstring,
-                    docstring=docstring_parser.parse(docstring),
-                )
+def parse_function_def(function_def: AnyFunctionDef, filepath: str) -> FuncDoc:
+    return DocExtractor(filepath).visit_FunctionDef(function_def)
 
-    return func_doc
 
-def parse_function_annotations(function_def: ast.FunctionDef) -> FuncAnnotations:
+def parse_function_annotations(function_def: AnyFunctionDef) -> FuncAnnotations:
 
     def _parse_arg_annotation(annotation: Optional[ast.expr], default='None') -> str:
-        if annotation is None:
-            return default
-        if isinstance(annotation, ast.Name):
-            return annotation.id
-        if isinstance(annotation, ast.Subscript):
-            if not isinstance(annotation.value, ast.Name):
-                raise ParseArgAnnotationException('Failed to parse subscript value: %s' % annotation.value)
-            return annotation.value.id + '[' + _parse_arg_annotation(annotation.slice) + ']'
-        if isinstance(annotation, ast.Constant):
-            return annotation.value
-        if isinstance(annotation, ast.Tuple):
-            return ', '.join(map(_parse_arg_annotation, annotation.elts))
-        if isinstance(annotation, ast.Attribute) and isinstance(annotation.value, ast.Name):
-            return annotation.value.id + '.' + annotation.attr
-        raise ParseArgAnnotationException('Failed to parse arg annotation: %s %s %s' % (annotation, function_def.lineno, function_def.name))
-
-    return_type = _parse_arg_annotation(function_def.returns)
+        return default if annotation is None else _format_annotation(annotation)
+
+    return_type = _intern(_parse_arg_annotation(function_def.returns))
+    arguments = function_def.args
+    positional_args = arguments.posonlyargs + arguments.args
 
     first_arg = None
-    arg_names: list[str] = []
-    arg_types: list[str] = []
-    if len(function_def.args.args) > 0:
+    if len(positional_args) > 0:
 
         """Parse leading argument, if it is _self_ or _cls_ and has no annotations"""
-        match (function_def.args.args[0].arg, function_def.args.args[0].annotation):
+        match (positional_args[0].arg, positional_args[0].annotation):
             case ('self', None):
                 first_arg = 'self'
             case ('cls', None):
                 first_arg = 'cls'
-        
-        """Parse named arguments"""
-        named_args_offset = 0 if first_arg is None else 1
-        arg_names += [ a.arg for a in function_def.args.args[named_args_offset:] ]
-
-        """Parse types of named arguments"""
-        for arg in function_def.args.args[named_args_offset:]:
-            arg_types += [ _parse_arg_annotation(arg.annotation) ]
-
-        """Parse var arg name and type, if it exists"""
-        if function_def.args.vararg is not None:
-            arg_names += [ '*' + function_def.args.vararg.arg ]
-            var_arg_type: str = _parse_arg_annotation(function_def.args.vararg.annotation, default='Any')
-            arg_types += [ var_arg_type ]
-
-        """Parse kw arg name and type, if it exists"""
-        if function_def.args.kwarg is not None:
-            arg_names += [ '**' + function_def.args.kwarg.arg ]
-            kw_arg_type: str = _parse_arg_annotation(function_def.args.kwarg.annotation, default='Any')
-            arg_types += [ kw_arg_type ]
+
+    """Parse positional-only and named arguments, and their types"""
+    named_args_offset = 0 if first_arg is None else 1
+    arg_names: list[str] = [ a.arg for a in positional_args[named_args_offset:] ]
+    arg_types: list[str] = [ _parse_arg_annotation(a.annotation) for a in positional_args[named_args_offset:] ]
+
+    """Parse var arg name and type, if it exists"""
+    if arguments.vararg is not None:
+        arg_names += [ '*' + arguments.vararg.arg ]
+        arg_types += [ _parse_arg_annotation(arguments.vararg.annotation, default='Any') ]
+
+    """Parse keyword-only arguments, and their types"""
+    arg_names += [ a.arg for a in arguments.kwonlyargs ]
+    arg_types += [ _parse_arg_annotation(a.annotation) for a in arguments.kwonlyargs ]
+
+    """Parse kw arg name and type, if it exists"""
+    if arguments.kwarg is not None:
+        arg_names += [ '**' + arguments.kwarg.arg ]
+        arg_types += [ _parse_arg_annotation(arguments.kwarg.annotation, default='Any') ]
 
     func_annotations = FuncAnnotations(
         first_arg,
-        list(zip(arg_names, arg_types)),
+        tuple(zip(map(_intern, arg_names), map(_intern, arg_types))),
         return_type,
     )
 
-    return func_annotations
\ No newline at end of file
+    return func_annotations
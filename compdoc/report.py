@@ -0,0 +1,222 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional, TextIO
+
+from compdoc import __version__
+from compdoc.model import DocValidation, ValidationStatus
+
+
+RULES = {
+    'missing-docstring': 'Functions and methods should have a docstring.',
+    'documented-first-arg': 'Docstrings should not document the "self" or "cls" argument of a method.',
+    'argument-mismatch': 'Docstring arguments should match the arguments of the function signature.',
+    'docstring': 'Docstrings should agree with the signature they document.',
+}
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+
+
+def iter_records(validation: DocValidation) -> Iterator[dict]:
+    """Flattens a DocValidation into one record per failed rule, with the fields of the machine-readable reports.
+
+    Args:
+        validation (DocValidation): Result of a document's validation
+
+    Yields:
+        dict: Record with the 'file', 'line', 'symbol', 'rule' and 'message' of each failure
+    """
+    for error in validation.errors:
+        yield {
+            'file': validation.filepath,
+            'line': validation.line_no,
+            'symbol': validation.symbol,
+            'rule': error.rule,
+            'message': error.message,
+        }
+
+
+def dump_validation(validation: DocValidation) -> dict:
+    """Serializes a DocValidation as JSON-serializable fields, to store it or send it over the daemon's protocol.
+
+    Args:
+        validation (DocValidation): Result of a document's validation
+
+    Returns:
+        dict: JSON-serializable fields of the validation
+    """
+    return {
+        'name': validation.name,
+        'filepath': validation.filepath,
+        'line_no': validation.line_no,
+        'symbol': validation.symbol,
+        'errors': [ [error.rule, error.message] for error in validation.errors ],
+    }
+
+
+def load_validation(record: dict, filepath: Optional[str] = None) -> DocValidation:
+    """Rebuilds a DocValidation serialized by `dump_validation`.
+
+    Args:
+        record (dict): Serialized validation
+        filepath (str, optional): Path to report the validated module under, in place of the path it was parsed from,
+            e.g. by the daemon. Defaults to None, to keep the recorded path.
+
+    Returns:
+        DocValidation: The validation
+    """
+    name = record['name']
+    if filepath is not None and record['filepath'] is not None:
+        name = name.replace(record['filepath'], filepath, 1)
+    validation = DocValidation(name, filepath or record['filepath'], record['line_no'], record['symbol'])
+    for rule, message in record['errors']:
+        validation.append_error(message, rule=rule)
+    return validation
+
+
+class ValidationReporter(ABC):
+    """Writes validation results to a stream as they are produced, so a report can be consumed before validation
+    finishes. Subclasses define the output format.
+
+    Attributes:
+        stream (TextIO): Stream the report is written to
+        failures (int): Number of failed validations reported so far
+    """
+    stream: TextIO
+    failures: int
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.failures = 0
+
+    def begin(self):
+        """Writes the header of the report, if the format has one.
+        """
+
+    def module(self, module_name: str, path: str):
+        """Marks the start of the results of a module.
+
+        Args:
+            module_name (str): Dotted name of the module
+            path (str): Path to the module's source file
+        """
+
+    def report(self, validation: DocValidation):
+        """Writes the result of a document's validation.
+
+        Args:
+            validation (DocValidation): Result of the validation
+        """
+        if validation.status == ValidationStatus.FAILURE:
+            self.failures += 1
+            self.write_failure(validation)
+
+    @abstractmethod
+    def write_failure(self, validation: DocValidation):
+        """Writes a failed validation in the format of the report.
+
+        Args:
+            validation (DocValidation): Failed validation
+        """
+
+    def end(self):
+        """Writes the footer of the report, if the format has one, and flushes the stream.
+        """
+        self.stream.flush()
+
+
+class TextReporter(ValidationReporter):
+    """Human-readable report, listing the failures of each module under its name.
+    """
+
+    def module(self, module_name: str, path: str):
+        """Prints the name of the module being validated.
+
+        Args:
+            module_name (str): Dotted name of the module
+            path (str): Path to the module's source file
+        """
+        print('Validating %s \t(%s)' % (module_name, path), file=self.stream)
+
+    def write_failure(self, validation: DocValidation):
+        """Prints a failed validation with its messages.
+
+        Args:
+            validation (DocValidation): Failed validation
+        """
+        print('[x]\t%s\tFAIL:\t%s' % (validation.name, validation.message), end='\n\n', file=self.stream)
+
+
+class JsonLinesReporter(ValidationReporter):
+    """JSON Lines report, with one JSON object per failed rule, flushed as soon as it is written.
+    """
+
+    def write_failure(self, validation: DocValidation):
+        """Writes a line for each rule the validation failed.
+
+        Args:
+            validation (DocValidation): Failed validation
+        """
+        for record in iter_records(validation):
+            self.stream.write(json.dumps(record) + '\n')
+        self.stream.flush()
+
+
+class SarifReporter(ValidationReporter):
+    """SARIF 2.1.0 report, for code scanning tools. The log is streamed: results are written as they are reported,
+    between a header and footer written by `begin` and `end`.
+
+    Attributes:
+        stream (TextIO): Stream the report is written to
+        failures (int): Number of failed validations reported so far
+    """
+    _first: bool
+
+    def begin(self):
+        """Writes the SARIF log up to the start of its results.
+        """
+        driver = {
+            'name': 'compdoc',
+            'version': __version__,
+            'rules': [ {'id': rule, 'shortDescription': {'text': text}} for rule, text in RULES.items() ],
+        }
+        """The log and its single run are left open, to be closed by `end` after the streamed results"""
+        self.stream.write('{"$schema": %s, "version": "2.1.0", "runs": [{"tool": %s, "results": ['
+                          % (json.dumps(SARIF_SCHEMA), json.dumps({'driver': driver})))
+        self._first = True
+
+    def write_failure(self, validation: DocValidation):
+        """Writes a SARIF result for each rule the validation failed.
+
+        Args:
+            validation (DocValidation): Failed validation
+        """
+        for record in iter_records(validation):
+            result = {
+                'ruleId': record['rule'],
+                'level': 'error',
+                'message': {'text': record['message'].strip()},
+                'locations': [{
+                    'physicalLocation': {
+                        'artifactLocation': {'uri': (record['file'] or '').replace(os.sep, '/')},
+                        'region': {'startLine': record['line'] or 1},
+                    },
+                    'logicalLocations': [{'fullyQualifiedName': record['symbol']}],
+                }],
+            }
+            self.stream.write(('\n' if self._first else ',\n') + json.dumps(result))
+            self._first = False
+        self.stream.flush()
+
+    def end(self):
+        """Closes the results, the run and the SARIF log opened by `begin`.
+        """
+        self.stream.write('\n]}]}\n')
+        super().end()
+
+
+REPORTERS: dict[str, type] = {
+    'text': TextReporter,
+    'jsonl': JsonLinesReporter,
+    'sarif': SarifReporter,
+}
@@ -0,0 +1,197 @@
+import contextlib
+import threading
+import time
+from typing import ContextManager, Iterator, Optional, TextIO
+
+
+"""Phases whose subjects are modules, formatters and templates, as grouped by the slowest-N lists of a report"""
+SUBJECT_GROUPS = {
+    'modules': ('parse.read', 'parse.ast', 'parse.extract', 'validate'),
+    'formatters': ('compile.formatter',),
+    'templates': ('compile.template', 'render'),
+}
+
+_NULL_SPAN = contextlib.nullcontext()
+_recorder: Optional["Timings"] = None
+
+
+class Timings:
+    """Recorder of the time spent in each phase of a compile or validation, such as globbing, `ast.parse`, docstring
+    parsing, Jinja compilation and rendering, broken down by the module, formatter or template each phase worked on.
+
+    Phases may nest: the time spent parsing the modules a template loads is also part of the template's 'render'
+    phase.
+
+    Attributes:
+        phases (dict[str, tuple[float, int]]): Total seconds and number of calls of each phase
+        subjects (dict[str, dict[str, float]]): Total seconds of each phase, by the path it worked on
+        caches (dict[str, tuple[int, int]]): Hits and misses of each cache
+    """
+    phases: dict[str, tuple[float, int]]
+    subjects: dict[str, dict[str, float]]
+    caches: dict[str, tuple[int, int]]
+
+    def __init__(self):
+        self.phases = {}
+        self.subjects = {}
+        self.caches = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, phase: str, subject: Optional[str] = None) -> Iterator:
+        """Times the body of a `with` block as one call of a phase.
+
+        Args:
+            phase (str): Name of the phase
+            subject (str, optional): Path of the module, formatter or template the phase works on. Defaults to None.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start, subject)
+
+    def add(self, phase: str, seconds: float, subject: Optional[str] = None):
+        """Records one call of a phase.
+
+        Args:
+            phase (str): Name of the phase
+            seconds (float): Duration of the call
+            subject (str, optional): Path of the module, formatter or template the phase worked on. Defaults to None.
+        """
+        with self._lock:
+            total, calls = self.phases.get(phase, (0.0, 0))
+            self.phases[phase] = (total + seconds, calls + 1)
+            if subject is not None:
+                by_subject = self.subjects.setdefault(phase, {})
+                by_subject[subject] = by_subject.get(subject, 0.0) + seconds
+
+    def count(self, cache: str, hits: int, misses: int):
+        """Adds to the hit and miss counters of a cache.
+
+        Args:
+            cache (str): Name of the cache
+            hits (int): Number of lookups served from the cache
+            misses (int): Number of lookups which missed the cache
+        """
+        with self._lock:
+            total_hits, total_misses = self.caches.get(cache, (0, 0))
+            self.caches[cache] = (total_hits + hits, total_misses + misses)
+
+    def slowest(self, group: str, top: int = 10) -> list[tuple[str, float]]:
+        """Returns the subjects of a group which took the most time, over all the group's phases.
+
+        Args:
+            group (str): Group of phases, one of SUBJECT_GROUPS
+            top (int, optional): Number of subjects to return. Defaults to 10.
+
+        Returns:
+            list[tuple[str, float]]: Path and total seconds of the slowest subjects, slowest first
+        """
+        totals: dict[str, float] = {}
+        for phase in SUBJECT_GROUPS[group]:
+            for subject, seconds in self.subjects.get(phase, {}).items():
+                totals[subject] = totals.get(subject, 0.0) + seconds
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    def write_report(self, stream: TextIO, top: int = 10):
+        """Writes the per-phase breakdown, the cache counters and the slowest subjects of each group.
+
+        Args:
+            stream (TextIO): Stream to write the report to
+            top (int, optional): Number of subjects listed for each group. Defaults to 10.
+        """
+        print('%-40s%12s%10s' % ('Phase', 'Total (ms)', 'Calls'), file=stream)
+        for phase, (seconds, calls) in sorted(self.phases.items()):
+            print('%-40s%12.1f%10d' % (phase, seconds * 1e3, calls), file=stream)
+
+        if self.caches:
+            print('\n%-40s%12s%10s' % ('Cache', 'Hits', 'Misses'), file=stream)
+            for cache, (hits, misses) in sorted(self.caches.items()):
+                print('%-40s%12d%10d' % (cache, hits, misses), file=stream)
+
+        for group in SUBJECT_GROUPS:
+            slowest = self.slowest(group, top)
+            if slowest:
+                print('\n%-40s%12s' % ('Slowest ' + group, 'Total (ms)'), file=stream)
+                for subject, seconds in slowest:
+                    print('%-40s%12.1f' % (subject, seconds * 1e3), file=stream)
+        stream.flush()
+
+
+def enable() -> Timings:
+    """Starts recording timings through the hooks of the parser and compiler, which are no-ops until then.
+
+    Returns:
+        Timings: The recorder the hooks report to
+    """
+    global _recorder
+    _recorder = Timings()
+    return _recorder
+
+
+def disable():
+    """Stops recording timings.
+    """
+    global _recorder
+    _recorder = None
+
+
+def span(phase: str, subject: Optional[str] = None) -> ContextManager:
+    """Hook timing the body of a `with` block as one call of a phase, if timings are enabled. When they aren't, the
+    same no-op context manager is returned every time, so the hook only costs a function call.
+
+    Args:
+        phase (str): Name of the phase
+        subject (str, optional): Path of the module, formatter or template the phase works on. Defaults to None.
+
+    Returns:
+        ContextManager: Context manager timing its block
+    """
+    if _recorder is None:
+        return _NULL_SPAN
+    return _recorder.span(phase, subject)
+
+
+def count(cache: str, hits: int, misses: int):
+    """Hook adding to the hit and miss counters of a cache, if timings are enabled.
+
+    Args:
+        cache (str): Name of the cache
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups which missed the cache
+    """
+    if _recorder is not None:
+        _recorder.count(cache, hits, misses)
+
+
+@contextlib.contextmanager
+def profile(path: str, memory: bool = False) -> Iterator:
+    """Profiles the body of a `with` block, and dumps the profile to a file when the block exits, even by an
+    exception. CPU profiles are written in the `pstats` format, and memory profiles as `tracemalloc` snapshots.
+
+    Args:
+        path (str): File to dump the profile to
+        memory (bool, optional): Whether to take a tracemalloc snapshot of the memory allocated by the block, rather
+            than a cProfile of its calls. Defaults to False.
+    """
+    """Profilers are imported on use, as importing them would slow down the start of every command"""
+    if memory:
+        import tracemalloc
+        tracemalloc.start()
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            snapshot.dump(path)
+        return
+
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
@@ -0,0 +1,332 @@
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from typing import Iterable, Iterator, Optional, Sequence
+
+from compdoc import __version__, timings
+from compdoc.cache import CACHE_FORMAT, file_digest, shared_disk_cache
+from compdoc.model import DocType, DocValidation, FuncDoc
+from compdoc.parser import parse_module
+from compdoc.report import dump_validation, load_validation
+
+
+"""Name of the file, in the cache directory, recording the results of `compdoc validate --changed`"""
+VALIDATIONS_FILE = 'validations.json'
+
+
+def validate_module(source_filepath: str, cache_dir: Optional[str] = None) -> list[DocValidation]:
+    """Parses a module and validates the docstrings of its classes and functions against their signatures.
+
+    Args:
+        source_filepath (str): Path to the Python source file to validate
+        cache_dir (str, optional): Directory of the persistent parse cache to use. Defaults to None, for no cache.
+
+    Returns:
+        list[DocValidation]: Results of the module's validations
+    """
+    if cache_dir is not None:
+        module_doc = shared_disk_cache(cache_dir).get(source_filepath)
+    else:
+        module_doc = parse_module(source_filepath)
+    with timings.span('validate', source_filepath):
+        return module_doc.validate()
+
+
+def validate_modules(source_filepaths: Iterable[str], jobs: Optional[int] = None,
+                     cache_dir: Optional[str] = None) -> Iterator[tuple[str, list[DocValidation]]]:
+    """Validates many modules over a pool of worker processes, yielding the results of each module as they become
+    available, in the same order as the given paths.
+
+    Args:
+        source_filepaths (Iterable[str]): Paths to the Python source files to validate
+        jobs (int, optional): Number of worker processes. Defaults to the number of CPUs; 1 validates in-process.
+        cache_dir (str, optional): Directory of the persistent parse cache to use. Defaults to None, for no cache.
+
+    Yields:
+        tuple[str, list[DocValidation]]: Path of each module, with the results of its validations
+    """
+    jobs = jobs or os.cpu_count() or 1
+    validate = functools.partial(validate_module, cache_dir=cache_dir)
+
+    if jobs == 1:
+        for path in source_filepaths:
+            yield path, validate(path)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    source_filepaths = list(source_filepaths)
+    chunksize = max(1, min(32, len(source_filepaths) // (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from zip(source_filepaths, executor.map(validate, source_filepaths, chunksize=chunksize))
+
+
+def _iter_functions(docs: Sequence[DocType], scope: Optional[str] = None) -> Iterator[tuple[Optional[str], FuncDoc]]:
+    for doc in docs:
+        if isinstance(doc, FuncDoc):
+            yield scope, doc
+        else:
+            yield from _iter_functions(doc.elements, f'{scope}.{doc.class_name}' if scope else doc.class_name)
+
+
+def symbol_fingerprint(func_doc: FuncDoc, scope: Optional[str] = None) -> str:
+    """Computes the hash of everything the validation of a function depends on: its qualified name, its signature and
+    its docstring. Its line number is left out, so that functions which only moved keep their fingerprint.
+
+    Args:
+        func_doc (FuncDoc): Documentation details of the function
+        scope (str, optional): Qualified name of the class enclosing the function, if any. Defaults to None.
+
+    Returns:
+        str: Hex digest of the function's validated details
+    """
+    annotations = func_doc.annotations
+    key = json.dumps([scope, func_doc.func_name, annotations.first_arg, [ list(arg) for arg in annotations.args ],
+                      annotations.returns, func_doc.string])
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+class ValidationStore:
+    """Record of the validation results of each module, with the content hash of its source and the fingerprint of
+    each function validated in it, so that later runs only re-validate what changed. Modules whose source is unchanged
+    are reported from the record without being parsed, and functions of changed modules whose signature and docstring
+    are unchanged are reported without being validated again.
+
+    Content hashes are only recomputed for files whose mtime or size changed since they were recorded.
+
+    Attributes:
+        path (str): Path of the JSON file the results are stored in.
+        hits (int): Number of function validations reported from the record.
+        misses (int): Number of function validations which had to be run.
+    """
+    path: str
+    hits: int
+    misses: int
+
+    def __init__(self, path: str):
+        """Loads the results stored at the given path, or starts an empty record if it doesn't exist or was written by
+        a different compdoc version.
+
+        Args:
+            path (str): Path of the JSON file the results are stored in
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._modules: dict[str, dict] = {}
+        self._dirty = False
+
+        try:
+            with open(path, 'r') as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == __version__ and data.get('format') == CACHE_FORMAT:
+            self._modules = data.get('modules', {})
+
+    def __contains__(self, source_filepath: str) -> bool:
+        return os.path.abspath(source_filepath) in self._modules
+
+    def is_fresh(self, source_filepath: str) -> bool:
+        """Tells whether the recorded results of a module are up to date with its source.
+
+        Args:
+            source_filepath (str): Path to the Python source file
+
+        Returns:
+            bool: True if the module doesn't need to be validated again
+        """
+        entry = self._modules.get(os.path.abspath(source_filepath))
+        if entry is None:
+            return False
+        try:
+            stat = os.stat(source_filepath)
+        except OSError:
+            return False
+        if entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return True
+        if file_digest(source_filepath) != entry['digest']:
+            return False
+        entry['mtime'], entry['size'] = stat.st_mtime_ns, stat.st_size
+        self._dirty = True
+        return True
+
+    def known(self, source_filepath: str) -> dict[str, dict]:
+        """Returns the recorded validations of a module's functions, by fingerprint.
+
+        Args:
+            source_filepath (str): Path to the Python source file
+
+        Returns:
+            dict[str, dict]: Serialized validation of each function, by its `symbol_fingerprint`
+        """
+        entry = self._modules.get(os.path.abspath(source_filepath))
+        return {} if entry is None else { record['fingerprint']: record for record in entry['validations'] }
+
+    def load(self, source_filepath: str) -> list[DocValidation]:
+        """Returns the recorded validations of a module.
+
+        Args:
+            source_filepath (str): Path to the Python source file, to report the validations under
+
+        Returns:
+            list[DocValidation]: Results of the module's validations, as last recorded
+        """
+        records = self._modules[os.path.abspath(source_filepath)]['validations']
+        self.hits += len(records)
+        return [ load_validation(record, source_filepath) for record in records ]
+
+    def record(self, source_filepath: str, results: list[tuple[str, DocValidation]]):
+        """Records the validations of a module's functions, with the current content hash of its source.
+
+        Args:
+            source_filepath (str): Path to the Python source file
+            results (list[tuple[str, DocValidation]]): Fingerprint and validation of each function, from
+                `validate_module_changes`
+        """
+        known = self.known(source_filepath)
+        reused = sum(1 for fingerprint, _ in results if fingerprint in known)
+        self.hits += reused
+        self.misses += len(results) - reused
+        try:
+            stat = os.stat(source_filepath)
+            digest = file_digest(source_filepath)
+        except OSError:
+            return
+        self._dirty = True
+        self._modules[os.path.abspath(source_filepath)] = {
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'digest': digest,
+            'validations': [ dict(dump_validation(validation), fingerprint=fingerprint)
+                             for fingerprint, validation in results ],
+        }
+
+    def save(self, keep: Optional[Iterable[str]] = None):
+        """Writes the results to the store's path, if they changed since they were loaded.
+
+        Args:
+            keep (Iterable[str], optional): Paths of the modules whose results to keep, to drop those of modules which
+                were removed from the project. Defaults to None, to keep every module's results.
+        """
+        if keep is not None:
+            modules = { path: self._modules[path] for path in map(os.path.abspath, keep) if path in self._modules }
+            self._dirty = self._dirty or len(modules) != len(self._modules)
+            self._modules = modules
+        if not self._dirty:
+            return
+        data = json.dumps({'version': __version__, 'format': CACHE_FORMAT, 'modules': self._modules})
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as handle:
+            handle.write(data)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+def validate_module_changes(source_filepath: str, known: dict[str, dict],
+                            cache_dir: Optional[str] = None) -> list[tuple[str, DocValidation]]:
+    """Parses a module and validates the functions whose fingerprint isn't among the known validations, reusing the
+    known validations for the others.
+
+    Args:
+        source_filepath (str): Path to the Python source file to validate
+        known (dict[str, dict]): Serialized validations of the module's functions by fingerprint, from
+            `ValidationStore.known`
+        cache_dir (str, optional): Directory of the persistent parse cache to use. Defaults to None, for no cache.
+
+    Returns:
+        list[tuple[str, DocValidation]]: Fingerprint and validation of each function of the module
+    """
+    if cache_dir is not None:
+        module_doc = shared_disk_cache(cache_dir).get(source_filepath)
+    else:
+        module_doc = parse_module(source_filepath)
+    results = []
+    with timings.span('validate', source_filepath):
+        for scope, func_doc in _iter_functions(module_doc.docs):
+            fingerprint = symbol_fingerprint(func_doc, scope)
+            record = known.get(fingerprint)
+            if record is None:
+                validation = func_doc.validate(scope)
+            else:
+                validation = load_validation(record, source_filepath)
+                validation.line_no = func_doc.line_no
+            results.append((fingerprint, validation))
+    return results
+
+
+def resolve_changed(source_filepaths: Iterable[str], changed: Iterable[str],
+                    base_dir: Optional[str] = None) -> tuple[set[str], list[str]]:
+    """Resolves the paths of changed files to the modules they designate.
+
+    Args:
+        source_filepaths (Iterable[str]): Paths to the Python source files of the modules
+        changed (Iterable[str]): Paths of the files which changed, e.g. from `git diff --name-only`
+        base_dir (str, optional): Directory relative changed paths are resolved against, such as the top-level
+            directory of the git work tree. Defaults to None, for the working directory.
+
+    Returns:
+        tuple[set[str], list[str]]: Absolute paths of the changed modules, and the changed paths which match no module
+    """
+    module_paths = set(map(os.path.abspath, source_filepaths))
+    changed_modules: set[str] = set()
+    unmatched: list[str] = []
+    for path in changed:
+        abspath = os.path.abspath(os.path.join(base_dir or '', path))
+        if abspath in module_paths:
+            changed_modules.add(abspath)
+        else:
+            unmatched.append(path)
+    return changed_modules, unmatched
+
+
+def validate_changed(source_filepaths: Iterable[str], store: ValidationStore, changed: Optional[set[str]] = None,
+                     jobs: Optional[int] = None,
+                     cache_dir: Optional[str] = None) -> Iterator[tuple[str, list[DocValidation]]]:
+    """Validates many modules incrementally, re-validating only the modules which changed since their results were
+    recorded in the store, and only the functions of those modules whose signature or docstring changed. Results are
+    yielded for every module, in the same order as the given paths, and recorded in the store.
+
+    Args:
+        source_filepaths (Iterable[str]): Paths to the Python source files to validate
+        store (ValidationStore): Results of the previous validations, updated with the new ones
+        changed (set[str], optional): Absolute paths of the modules which changed, as resolved by `resolve_changed`;
+            other modules with recorded results are assumed unchanged. Defaults to None, to compare the content hash of
+            every module with the recorded one instead.
+        jobs (int, optional): Number of worker processes. Defaults to the number of CPUs; 1 validates in-process.
+        cache_dir (str, optional): Directory of the persistent parse cache to use. Defaults to None, for no cache.
+
+    Yields:
+        tuple[str, list[DocValidation]]: Path of each module, with the results of its validations
+    """
+    source_filepaths = list(source_filepaths)
+    if changed is None:
+        stale = [ path for path in source_filepaths if not store.is_fresh(path) ]
+    else:
+        stale = [ path for path in source_filepaths if os.path.abspath(path) in changed or path not in store ]
+    validate = functools.partial(validate_module_changes, cache_dir=cache_dir)
+    knowns = [ store.known(path) for path in stale ]
+
+    jobs = min(jobs or os.cpu_count() or 1, len(stale))
+    if jobs <= 1:
+        yield from _merge_changes(source_filepaths, stale, map(validate, stale, knowns), store)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from _merge_changes(source_filepaths, stale, executor.map(validate, stale, knowns), store)
+
+
+def _merge_changes(source_filepaths: list[str], stale: list[str], results: Iterator[list[tuple[str, DocValidation]]],
+                   store: ValidationStore) -> Iterator[tuple[str, list[DocValidation]]]:
+    stale_paths = set(stale)
+    for path in source_filepaths:
+        if path in stale_paths:
+            module_results = next(results)
+            store.record(path, module_results)
+            yield path, [ validation for _, validation in module_results ]
+        else:
+            yield path, store.load(path)
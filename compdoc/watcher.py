@@ -0,0 +1,91 @@
+import os
+from typing import Optional
+
+from compdoc.compiler import CompDocCompiler
+from compdoc.config import load_config
+
+
+class Watcher:
+    """Keeps the templates of a project compiled while their sources change. The compiler's parsed modules and
+    compiled formatters stay warm between polls, and a change only recompiles the templates which depend on the
+    changed file, as recorded through `CompDoc.module` and `CompDoc.formatter` during their last render. A change to
+    the configuration file recompiles every template.
+
+    Attributes:
+        config_path (str): Path to the `.compdoc.yml` configuration of the templates
+        template_paths (list[str]): Paths to the markdown-Jinja templates being watched
+        compiler (CompDocCompiler): Compiler of the templates
+    """
+    config_path: str
+    template_paths: list[str]
+    compiler: CompDocCompiler
+
+    def __init__(self, config_path: str, template_paths: list[str], compiler: CompDocCompiler):
+        self.config_path = config_path
+        self.template_paths = template_paths
+        self.compiler = compiler
+        self._stats: dict[str, Optional[tuple[int, int]]] = {}
+
+    def _watched_paths(self) -> set[str]:
+        paths = { os.path.abspath(self.config_path) }
+        paths.update(os.path.abspath(path) for path in self.template_paths)
+        for dependencies in self.compiler.dependencies.values():
+            paths.update(dependencies)
+        return paths
+
+    def _snapshot(self) -> dict[str, Optional[tuple[int, int]]]:
+        stats: dict[str, Optional[tuple[int, int]]] = {}
+        for path in self._watched_paths():
+            try:
+                stat = os.stat(path)
+                stats[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stats[path] = None
+        return stats
+
+    def _compile(self, template_paths: list[str]) -> list[tuple[str, Optional[Exception]]]:
+        results: list[tuple[str, Optional[Exception]]] = []
+        for template_path in template_paths:
+            try:
+                self.compiler.compile(template_path)
+                results.append((template_path, None))
+            except Exception as e:
+                results.append((template_path, e))
+        return results
+
+    def start(self) -> list[tuple[str, Optional[Exception]]]:
+        """Compiles all of the watched templates and records the state of their dependencies.
+
+        Returns:
+            list[tuple[str, Optional[Exception]]]: Each template, with the error it failed to compile with, if any
+        """
+        results = self._compile(self.template_paths)
+        self._stats = self._snapshot()
+        return results
+
+    def poll(self) -> list[tuple[str, Optional[Exception]]]:
+        """Checks the watched files for changes, recompiling the templates affected by them.
+
+        Returns:
+            list[tuple[str, Optional[Exception]]]: Each recompiled template, with the error it failed to compile with,
+            if any
+        """
+        stats = self._snapshot()
+        changed = { path for path, stat in stats.items() if self._stats.get(path) != stat }
+        if not changed:
+            return []
+
+        if os.path.abspath(self.config_path) in changed:
+            self.compiler.reconfigure(load_config(self.config_path))
+            targets = self.template_paths
+        else:
+            targets = [
+                path for path in self.template_paths
+                if os.path.abspath(path) in changed or self.compiler.dependencies.get(path, set()) & changed
+            ]
+
+        results = self._compile(targets)
+        """Keep the stats from before compiling, so changes made while compiling are picked up by the next poll"""
+        self._stats = self._snapshot()
+        self._stats.update(stats)
+        return results
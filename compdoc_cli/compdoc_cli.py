@@ -1,11 +1,115 @@
 import argparse
+import contextlib
+import glob
 import os
+import sys
+import time
+from typing import TYPE_CHECKING, Iterator, Optional
 
-import yaml
-from compdoc_cli import formatters
+import compdoc.timings
 
-import compdoc.compiler
-import compdoc.parser
+"""The rest of compdoc, Jinja and YAML are imported by the subcommands which use them, so that every invocation only
+pays for importing what its subcommand needs"""
+if TYPE_CHECKING:
+    from compdoc.cache import DiskCache
+    from compdoc.client import CompDocClient
+    from compdoc.compiler import CompDocCompiler
+    from compdoc.model import DocValidation
+    from compdoc.validator import ValidationStore
+
+
+"""Formats of validation reports, as implemented by `compdoc.report.REPORTERS`"""
+REPORT_FORMATS = ['jsonl', 'sarif', 'text']
+
+
+def _cache_dir(arguments: argparse.Namespace, project_folder: str) -> str:
+    from compdoc import DEFAULT_CACHE_DIR
+    if arguments.cache_dir is not None:
+        return arguments.cache_dir
+    return os.path.join(project_folder, DEFAULT_CACHE_DIR)
+
+
+def _disk_cache(arguments: argparse.Namespace, project_folder: str) -> Optional["DiskCache"]:
+    from compdoc.cache import DiskCache
+    if arguments.no_cache:
+        return None
+    return DiskCache(_cache_dir(arguments, project_folder))
+
+
+def _expand_paths(patterns: list[str]) -> tuple[list[str], list[str]]:
+    """Expands paths and glob patterns to the existing paths they match, returning them along with the paths and
+    patterns which match nothing."""
+    paths: list[str] = []
+    unmatched: list[str] = []
+    with compdoc.timings.span('glob'):
+        for pattern in patterns:
+            if glob.has_magic(pattern):
+                matches = sorted(glob.glob(pattern, recursive=True))
+            else:
+                matches = [ pattern ] if os.path.exists(pattern) else []
+            if not matches:
+                unmatched.append(pattern)
+            paths.extend(matches)
+    return list(dict.fromkeys(paths)), unmatched
+
+
+def _group_templates(arguments: argparse.Namespace, template_paths: list[str]) -> dict[str, list[str]]:
+    """Groups templates by their configuration file, so that templates sharing a configuration share their caches."""
+    templates_by_config: dict[str, list[str]] = {}
+    for template_path in template_paths:
+        if arguments.config_path is None:
+            config_path = os.path.join(os.path.dirname(template_path), '.compdoc.yml')
+        else:
+            config_path = arguments.config_path
+        if not os.path.exists(config_path):
+            print("ERROR: Couldn't find CompDoc yaml configuration file in compilation directory: %s" % \
+                template_path)
+            exit(1)
+        templates_by_config.setdefault(config_path, []).append(template_path)
+    return templates_by_config
+
+
+def _make_compiler(arguments: argparse.Namespace, config_path: str) -> "CompDocCompiler":
+    from compdoc.cache import ModuleCache
+    from compdoc.compiler import CompDocCompiler
+    from compdoc.config import load_config
+    from compdoc.manifest import CompileManifest
+    project_folder = os.path.dirname(config_path)
+    module_cache = ModuleCache(_disk_cache(arguments, project_folder))
+    bytecode_cache_dir = None
+    if arguments.bytecode_cache:
+        bytecode_cache_dir = os.path.join(_cache_dir(arguments, project_folder), 'jinja')
+
+    manifest = None
+    if not arguments.no_cache:
+        manifest = CompileManifest(os.path.join(_cache_dir(arguments, project_folder), 'manifest.json'))
+
+    return CompDocCompiler(load_config(config_path), module_cache=module_cache, bytecode_cache_dir=bytecode_cache_dir,
+                           manifest=manifest, targeted=arguments.targeted_parse, prefetch=arguments.prefetch,
+                           enable_async=arguments.async_render)
+
+
+def _daemon_client(arguments: argparse.Namespace, project_folder: str) -> Optional["CompDocClient"]:
+    """Connects to the daemon serving the project, or a project containing it, if one is running and the command can be
+    delegated to it."""
+    if getattr(arguments, 'no_daemon', False) or getattr(arguments, 'timings', False) or \
+            getattr(arguments, 'profile', None) is not None or getattr(arguments, 'changed', None) is not None:
+        return None
+    if any(getattr(arguments, option, False) for option in ('targeted_parse', 'prefetch', 'async_render',
+                                                             'bytecode_cache')):
+        return None
+    from compdoc.client import CompDocClient, find_socket, socket_path
+    if getattr(arguments, 'cache_dir', None) is not None:
+        return CompDocClient.connect(socket_path(arguments.cache_dir))
+    path = find_socket(project_folder)
+    return None if path is None else CompDocClient.connect(path)
+
+
+def _daemon_validations(result: dict, project_folder: str) -> Iterator[tuple[str, str, list["DocValidation"]]]:
+    from compdoc.report import load_validation
+    for module in result['modules']:
+        path = os.path.normpath(os.path.join(project_folder, module['path']))
+        yield module['module'], path, [ load_validation(record, path) for record in module['failures'] ]
 
 
 def cli():
@@ -20,90 +124,459 @@ def cli():
                              dest='skip_confirm')
     init_parser.add_argument('-f --formatters', type=str, help='Pattern to select default formatters by name', 
                              default='*', dest='formatters')
+    init_parser.add_argument('--exclude', type=str, action='append', default=[], help='Pattern, in .gitignore syntax, '
+                             'of paths to leave out of the module index. May be repeated.')
 
     compile_parser = cmd_parser.add_parser('compile', help='Compile a markdown-Jinja file, including its CompDoc '
                                            'directives.')
-    compile_parser.add_argument('compile_path', type=str, help='Path to the markdown-Jinja file to compile.',
+    compile_parser.add_argument('compile_path', type=str, nargs='+', help='Paths or glob patterns (e.g. '
+                                '"docs/**/*.md.j2") of the markdown-Jinja files to compile.',
                                 default=os.path.join(os.getcwd(), 'README.md.j2'))
     compile_parser.add_argument('--config-path', type=str, help='Path to the .compdoc.yml config file, if not in the '
                                 'same directory as the compile path.', default=None)
-    compile_parser.add_argument('--out-path', type=str, help='Path to put compiled markdown file.', default=None)
+    compile_parser.add_argument('--out-path', type=str, help='Path to put compiled markdown file. Only valid when '
+                                'compiling a single file.', default=None)
+    compile_parser.add_argument('-j', '--jobs', type=int, help='Number of files to render concurrently.', default=1)
+    compile_parser.add_argument('--force', action='store_true', help='Recompile files even if their template and the '
+                                'modules and formatters it uses are unchanged since they were last compiled.')
+    compile_parser.add_argument('--cache-dir', type=str, help='Directory of the persistent parse cache. Defaults to '
+                                '.compdoc-cache in the project folder.', default=None)
+    compile_parser.add_argument('--no-cache', action='store_true', help='Do not use the persistent parse cache.')
+    compile_parser.add_argument('--bytecode-cache', action='store_true', help='Persist compiled Jinja templates and '
+                                'formatters in the cache directory, to skip Jinja compilation on later runs.')
+    compile_parser.add_argument('--targeted-parse', action='store_true', help='Only parse the classes and functions '
+                                'the templates use, rather than every module they load in full.')
+    compile_parser.add_argument('--prefetch', action='store_true', help='Parse the modules each template loads by '
+                                'literal name concurrently, in worker processes, before rendering it.')
+    compile_parser.add_argument('--async', action='store_true', dest='async_render', help='Render templates '
+                                "through Jinja's async rendering path.")
+    compile_parser.add_argument('--no-daemon', action='store_true', help='Compile in this process, even if a '
+                                '`compdoc serve` daemon is running for the project.')
+    compile_parser.add_argument('--timings', action='store_true', help='Print the time spent in each phase, the '
+                                'cache hits and misses, and the slowest modules, formatters and templates to stderr.')
+    compile_parser.add_argument('--top', type=int, help='Number of slowest modules, formatters and templates listed by '
+                                '--timings.', default=10)
+    compile_parser.add_argument('--profile', type=str, help='File to dump a cProfile of the command to, readable with '
+                                'pstats.', default=None)
+    compile_parser.add_argument('--profile-memory', action='store_true', help='Dump a tracemalloc snapshot to the '
+                                '--profile file instead of a cProfile.')
+
+    watch_parser = cmd_parser.add_parser('watch', help='Keep markdown-Jinja files compiled, recompiling them when the '
+                                         'modules, formatters or configuration they use change.')
+    watch_parser.add_argument('watch_path', type=str, nargs='+', help='Paths or glob patterns of the markdown-Jinja '
+                              'files to keep compiled.')
+    watch_parser.add_argument('--config-path', type=str, help='Path to the .compdoc.yml config file, if not in the '
+                              'same directory as the watched files.', default=None)
+    watch_parser.add_argument('--interval', type=float, help='Seconds between checks for changes.', default=0.1)
+    watch_parser.add_argument('--cache-dir', type=str, help='Directory of the persistent parse cache. Defaults to '
+                              '.compdoc-cache in the project folder.', default=None)
+    watch_parser.add_argument('--no-cache', action='store_true', help='Do not use the persistent parse cache.')
+    watch_parser.add_argument('--bytecode-cache', action='store_true', help='Persist compiled Jinja templates and '
+                              'formatters in the cache directory, to skip Jinja compilation on later runs.')
+    watch_parser.add_argument('--targeted-parse', action='store_true', help='Only parse the classes and functions '
+                              'the templates use, rather than every module they load in full.')
+    watch_parser.add_argument('--prefetch', action='store_true', help='Parse the modules each template loads by '
+                              'literal name concurrently, in worker processes, before rendering it.')
+    watch_parser.add_argument('--async', action='store_true', dest='async_render', help='Render templates '
+                              "through Jinja's async rendering path.")
 
     validate_parser = cmd_parser.add_parser('validate', help='Compare the docstrings in your code against its '
                                             'annotations, and warn about mismatches.')
     validate_parser.add_argument('validate_path', type=str, help='Path to the root of the project to parse and validate',
                                  default=os.getcwd())
+    validate_parser.add_argument('--cache-dir', type=str, help='Directory of the persistent parse cache. Defaults to '
+                                 '.compdoc-cache in the project folder.', default=None)
+    validate_parser.add_argument('--no-cache', action='store_true', help='Do not use the persistent parse cache.')
+    validate_parser.add_argument('--exclude', type=str, action='append', default=[], help='Pattern, in .gitignore '
+                                 'syntax, of paths to leave out of validation. May be repeated.')
+    validate_parser.add_argument('-j', '--jobs', type=int, help='Number of worker processes to validate with. Defaults '
+                                 'to the number of CPUs.', default=None)
+    validate_parser.add_argument('--format', type=str, choices=REPORT_FORMATS, default='text', dest='report_format',
+                                 help='Format of the validation report: human-readable text, JSON Lines with one '
+                                 'object per failure, or SARIF.')
+    validate_parser.add_argument('-o', '--output', type=str, help='File to write the validation report to. Defaults '
+                                 'to stdout.', default=None)
+    validate_parser.add_argument('--changed', type=str, nargs='*', metavar='PATH', default=None, help='Only '
+                                 're-validate what changed since the last --changed run, reporting the recorded '
+                                 'results of everything else. Changed files are the given paths, or those listed on '
+                                 'stdin for "-" (e.g. from `git diff --name-only`, relative to the git work tree or '
+                                 'else the project folder), or else found by comparing content hashes. Changed '
+                                 'modules only re-validate the functions whose signature or docstring changed.')
+    validate_parser.add_argument('--no-daemon', action='store_true', help='Validate in this process, even if a '
+                                 '`compdoc serve` daemon is running for the project.')
+    validate_parser.add_argument('--timings', action='store_true', help='Print the time spent in each phase, the '
+                                 'cache hits and misses, and the slowest modules, formatters and templates to stderr.')
+    validate_parser.add_argument('--top', type=int, help='Number of slowest modules, formatters and templates listed '
+                                 'by --timings.', default=10)
+    validate_parser.add_argument('--profile', type=str, help='File to dump a cProfile of the command to, readable with '
+                                 'pstats.', default=None)
+    validate_parser.add_argument('--profile-memory', action='store_true', help='Dump a tracemalloc snapshot to the '
+                                 '--profile file instead of a cProfile.')
+
+    cache_parser = cmd_parser.add_parser('cache', help='Inspect or clear the persistent parse cache.')
+    cache_parser.add_argument('cache_action', type=str, choices=['clear', 'stats'], help='Cache operation to run.')
+    cache_parser.add_argument('cache_path', type=str, nargs='?', help='Path to the root of the project owning the '
+                              'cache.', default=os.getcwd())
+    cache_parser.add_argument('--cache-dir', type=str, help='Directory of the persistent parse cache. Defaults to '
+                              '.compdoc-cache in the project folder.', default=None)
+
+    index_parser = cmd_parser.add_parser('index', help='Build or inspect the project index, a snapshot of the parsed '
+                                         'documentation of every module used by compile and validate instead of '
+                                         'parsing unchanged modules.')
+    index_parser.add_argument('index_action', type=str, choices=['build', 'stats'], help='Index operation to run.')
+    index_parser.add_argument('index_path', type=str, nargs='?', help='Path to the root of the project to index.',
+                              default=os.getcwd())
+    index_parser.add_argument('--cache-dir', type=str, help='Directory of the persistent parse cache, where the index '
+                              'is stored. Defaults to .compdoc-cache in the project folder.', default=None)
+    index_parser.add_argument('--exclude', type=str, action='append', default=[], help='Pattern, in .gitignore '
+                              'syntax, of paths to leave out of the index. May be repeated.')
+
+    symbol_parser = cmd_parser.add_parser('symbol', help='Look up the documentation of a module, class or function by '
+                                          'its fully qualified name.')
+    symbol_parser.add_argument('symbol_name', type=str, help='Fully qualified name, e.g. "pkg.mod.Class.method".')
+    symbol_parser.add_argument('--config-path', type=str, help='Path to the .compdoc.yml config file. Defaults to the '
+                               'one in the current directory.', default='.compdoc.yml')
+    symbol_parser.add_argument('--cache-dir', type=str, help='Directory of the persistent parse cache. Defaults to '
+                               '.compdoc-cache in the project folder.', default=None)
+    symbol_parser.add_argument('--no-daemon', action='store_true', help='Look up the symbol in this process, even if a '
+                               '`compdoc serve` daemon is running for the project.')
+    symbol_parser.add_argument('--json', action='store_true', help='Print the documentation as JSON.')
+
+    serve_parser = cmd_parser.add_parser('serve', help='Run a daemon keeping the project parsed in memory, serving '
+                                         'compile, validate and symbol requests over a Unix domain socket. compile, '
+                                         'validate and symbol use the daemon while it is running.')
+    serve_parser.add_argument('serve_path', type=str, nargs='?', help='Path to the root of the project to serve.',
+                              default=os.getcwd())
+    serve_parser.add_argument('--cache-dir', type=str, help='Directory of the persistent parse cache, where the '
+                              'socket is created. Defaults to .compdoc-cache in the project folder.', default=None)
+    serve_parser.add_argument('--no-cache', action='store_true', help='Do not use the persistent parse cache.')
+    serve_parser.add_argument('--stop', action='store_true', help='Stop the daemon serving the project.')
 
     arguments = arg_parser.parse_args()
 
+    recorder = compdoc.timings.enable() if getattr(arguments, 'timings', False) else None
+    profile_path = getattr(arguments, 'profile', None)
+    profiler = contextlib.nullcontext() if profile_path is None else \
+        compdoc.timings.profile(profile_path, memory=arguments.profile_memory)
+    try:
+        with profiler:
+            _run(arguments)
+    finally:
+        if recorder is not None:
+            recorder.write_report(sys.stderr, top=arguments.top)
+        if profile_path is not None:
+            print('Wrote profile to %s' % profile_path, file=sys.stderr)
+
+
+def _run(arguments: argparse.Namespace):
+
     if hasattr(arguments, 'init_path') and arguments.init_path:
 
+        from compdoc.config import load_excludes
+        from compdoc.parser import index_modules
+        from compdoc_cli.formatters import load_formatters
+
         if os.path.exists(os.path.join(arguments.init_path, '.compdoc.yml')):
             if not arguments.skip_confirm:
                 confirm = input('Overwrite existing .compdoc.yml? (y/n) ')
                 if confirm.strip().lower() != 'y':
                     exit(0)
 
+        excludes = list(dict.fromkeys(load_excludes(arguments.init_path) + arguments.exclude))
+        module_index = index_modules(arguments.init_path, exclude=excludes)
+
         with open(os.path.join(arguments.init_path, '.compdoc.yml'), 'w') as f:
             f.write('modules:')
-            for mod, path in compdoc.parser.index_modules(arguments.init_path).items():
-                if mod.endswith('__init__'):
+            for mod, path in module_index.items():
+                if path.endswith('__init__.py'):
                     continue
                 print(mod, '\t', path)
                 f.write(f'\n  {mod}: {path}')
             formatter_folder = os.path.join(arguments.init_path, 'compdoc-formatters')
             f.write('\n\nformatters:')
-            for formatter, path in formatters.load_formatters(formatter_folder, arguments.formatters).items():
+            for formatter, path in load_formatters(formatter_folder, arguments.formatters).items():
                 print(formatter, path)
                 f.write(f'\n  {formatter}: {path.removeprefix(arguments.init_path + "/")}')
+            if excludes:
+                f.write('\n\nexclude:')
+                for pattern in excludes:
+                    f.write(f"\n  - '{pattern}'")
             print('CompDoc initialized in ' + os.path.join(arguments.init_path, '.compdoc.yml'))
 
     elif hasattr(arguments, 'compile_path'):
-        
-        project_folder = os.path.dirname(arguments.compile_path)
 
-        if arguments.config_path is None:
-            config_path = os.path.join(project_folder, '.compdoc.yml')
-        else:
-            config_path = arguments.config_path
+        template_paths, unmatched = _expand_paths(arguments.compile_path)
 
-        if not os.path.exists(config_path):
-            print("ERROR: Couldn't find CompDoc yaml configuration file in compilation directory: %s" % \
-                arguments.compile_path)
+        for pattern in unmatched:
+            print("ERROR: Couldn't find CompDoc markdown file to compile: %s" % pattern)
+        if unmatched or not template_paths:
+            exit(1)
+
+        if arguments.out_path is not None and len(template_paths) > 1:
+            print("ERROR: --out-path can only be used when compiling a single file.")
+            exit(1)
+
+        for config_path, config_templates in _group_templates(arguments, template_paths).items():
+
+            """The daemon always uses the persistent cache, so --no-cache compiles stay local"""
+            client = None if arguments.no_cache else _daemon_client(arguments, os.path.dirname(config_path))
+            if client is not None:
+                with client:
+                    result = client.request('compile', templates=config_templates, cwd=os.getcwd(),
+                                            config_path=config_path, out_path=arguments.out_path, force=arguments.force)
+                for template_path in result['skipped']:
+                    print('Skipped %s (up to date)' % template_path)
+                for template_path, error in result['errors'].items():
+                    print('[x]\t%s\tFAIL:\t%s' % (template_path, error))
+                if result['errors']:
+                    exit(1)
+                continue
+
+            with _make_compiler(arguments, config_path) as compiler:
+                if arguments.out_path is not None:
+                    compiler.compile(config_templates[0], out_path=arguments.out_path, force=arguments.force)
+                else:
+                    compiler.compile_all(config_templates, jobs=arguments.jobs, force=arguments.force)
+
+            for template_path in compiler.skipped:
+                print('Skipped %s (up to date)' % template_path)
+
+            compdoc.timings.count('modules (memory)', compiler.module_cache.hits, compiler.module_cache.misses)
+            if compiler.module_cache.disk_cache is not None:
+                compdoc.timings.count('modules (disk)', compiler.module_cache.disk_cache.hits,
+                                      compiler.module_cache.disk_cache.misses)
+
+    elif hasattr(arguments, 'watch_path'):
+
+        from compdoc.watcher import Watcher
+
+        template_paths, unmatched = _expand_paths(arguments.watch_path)
+
+        for pattern in unmatched:
+            print("ERROR: Couldn't find CompDoc markdown file to watch: %s" % pattern)
+        if unmatched or not template_paths:
             exit(1)
 
-        with open(config_path, 'r') as cf:
-            config_dict = yaml.load(cf, yaml.BaseLoader)
+        watchers = [
+            Watcher(config_path, config_templates, _make_compiler(arguments, config_path))
+            for config_path, config_templates in _group_templates(arguments, template_paths).items()
+        ]
+
+        def report(results: list[tuple[str, Optional[Exception]]]):
+            for template_path, error in results:
+                if error is None:
+                    print('Compiled %s' % template_path)
+                else:
+                    print('[x]\t%s\tFAIL:\t%s' % (template_path, error))
+
+        for watcher in watchers:
+            report(watcher.start())
+        print('Watching for changes...')
 
-        """CWD correction"""
-        config_dict['modules'] = { 
-            mod: os.path.join(project_folder, path) for mod, path in config_dict['modules'].items() 
-        }
-        config_dict['formatters'] = {
-            formatter: os.path.join(project_folder, path) for formatter, path in config_dict['formatters'].items()
-        }
+        try:
+            while True:
+                time.sleep(arguments.interval)
+                for watcher in watchers:
+                    report(watcher.poll())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for watcher in watchers:
+                watcher.compiler.close()
+
+    elif hasattr(arguments, 'serve_path'):
+
+        from compdoc.client import CompDocClient, socket_path
+        from compdoc.daemon import CompDocDaemon
+        from compdoc.exceptions import DaemonRunningException
 
-        if not os.path.exists(arguments.compile_path):
-            print("ERROR: Couldn't find CompDoc markdown file to compile: %s" % arguments.compile_path)
+        cache_dir = _cache_dir(arguments, arguments.serve_path)
+
+        if arguments.stop:
+            client = CompDocClient.connect(socket_path(cache_dir))
+            if client is None:
+                print("ERROR: Couldn't find a compdoc daemon for %s" % arguments.serve_path)
+                exit(1)
+            with client:
+                client.request('shutdown')
+            print('Stopped compdoc daemon on %s' % client.socket_path)
+            return
+
+        daemon = CompDocDaemon(arguments.serve_path, cache_dir, persistent=not arguments.no_cache)
+        print('Serving %s on %s' % (daemon.project_folder, daemon.socket_path), flush=True)
+        try:
+            daemon.serve()
+        except DaemonRunningException as e:
+            print('ERROR: %s' % e)
             exit(1)
+        except KeyboardInterrupt:
+            pass
 
+    elif hasattr(arguments, 'symbol_name'):
+
+        import json
+
+        from compdoc.exceptions import (
+            CompileUnrecognizedModuleException,
+            CompileUnrecognizedSymbolException,
+            DaemonRequestException,
+        )
+
+        project_folder = os.path.dirname(os.path.abspath(arguments.config_path))
+        client = _daemon_client(arguments, project_folder)
         try:
-            compdoc.compiler.compile_compdoc_mdj2(arguments.compile_path, config_dict, out_path=arguments.out_path)
-        except Exception as e:
-            raise(e)
-        
+            if client is not None:
+                with client:
+                    summary = client.request('symbol', name=arguments.symbol_name, cwd=os.getcwd(),
+                                             config_path=arguments.config_path)
+            else:
+                from compdoc.compiler import CompDoc, make_environment
+                from compdoc.config import load_config
+                from compdoc.daemon import describe
+                if not os.path.exists(arguments.config_path):
+                    print("ERROR: Couldn't find CompDoc yaml configuration file: %s" % arguments.config_path)
+                    exit(1)
+                compdoc_context = CompDoc(load_config(arguments.config_path), make_environment())
+                summary = describe(compdoc_context.symbol(arguments.symbol_name).doc)
+        except (CompileUnrecognizedModuleException, CompileUnrecognizedSymbolException, DaemonRequestException) as e:
+            print('ERROR: %s' % e)
+            exit(1)
+
+        if arguments.json:
+            print(json.dumps(summary, indent=2))
+        else:
+            location = summary['filepath'] if 'line_no' not in summary else '%s:%d' % (summary['filepath'],
+                                                                                       summary['line_no'])
+            print('%s %s\t(%s)' % (summary['kind'], arguments.symbol_name, location))
+            if summary['kind'] == 'function':
+                signature = ', '.join('%s: %s' % (name, type_name) for name, type_name in summary['args'])
+                print('  (%s) -> %s' % (signature, summary['returns']))
+            elif summary['kind'] == 'class':
+                print('  Base(s): %s' % (', '.join(summary['bases']) or '-'))
+                print('  Methods: %s' % (', '.join(summary['methods']) or '-'))
+                if summary['classes']:
+                    print('  Classes: %s' % ', '.join(summary['classes']))
+            else:
+                print('  Classes: %s' % (', '.join(summary['classes']) or '-'))
+                print('  Functions: %s' % (', '.join(summary['functions']) or '-'))
+            if summary.get('string'):
+                print('\n' + summary['string'])
+
+    elif hasattr(arguments, 'index_action'):
+
+        from compdoc.cache import DiskCache
+        from compdoc.config import load_excludes
+        from compdoc.index import build_index
+
+        disk_cache = DiskCache(_cache_dir(arguments, arguments.index_path))
+
+        if arguments.index_action == 'build':
+            excludes = load_excludes(arguments.index_path) + arguments.exclude
+            index = build_index(arguments.index_path, disk_cache.index_path, exclude=excludes, parse=disk_cache.get)
+            print('Indexed %d modules in %s' % (len(index.modules), index.path))
+            for skipped_path in index.skipped:
+                print('Skipped %s, which failed to parse' % skipped_path)
+        else:
+            index = disk_cache.index
+            if index is None:
+                print("ERROR: Couldn't find a project index in %s" % disk_cache.cache_dir)
+                exit(1)
+            print('Index:\t\t%s' % index.path)
+            print('Modules:\t%d' % len(index.modules))
+            print('Size:\t\t%.1f KiB' % (os.path.getsize(index.path) / 1024))
+
+    elif hasattr(arguments, 'cache_action'):
+
+        from compdoc.cache import DiskCache
+
+        disk_cache = DiskCache(_cache_dir(arguments, arguments.cache_path))
+
+        if arguments.cache_action == 'clear':
+            disk_cache.clear()
+            print('Cleared CompDoc cache in %s' % disk_cache.cache_dir)
+        else:
+            stats = disk_cache.stats()
+            print('Cache directory:\t%s' % disk_cache.cache_dir)
+            print('Entries:\t\t%d' % stats.entries)
+            print('Size:\t\t\t%.1f KiB' % (stats.size / 1024))
+
     elif arguments.validate_path:
 
+        from compdoc.report import REPORTERS
+
         project_folder = arguments.validate_path
 
         if not os.path.exists(project_folder):
             print("ERROR: Couldn't find project folder: %s" % project_folder)
             exit(1)
         
-        for mod, path in compdoc.parser.index_modules(arguments.validate_path).items():
+        cache_dir = None if arguments.no_cache else _cache_dir(arguments, project_folder)
+        store: Optional["ValidationStore"] = None
+        client = _daemon_client(arguments, project_folder)
+        if client is not None:
+            with client:
+                result = client.request('validate', project_folder=os.path.abspath(project_folder),
+                                        exclude=arguments.exclude)
+            results = _daemon_validations(result, project_folder)
+        else:
+            from compdoc.config import load_excludes
+            from compdoc.parser import index_modules
+            from compdoc.validator import validate_modules
+
+            excludes = load_excludes(project_folder) + arguments.exclude
+            module_index = {
+                mod: os.path.normpath(os.path.join(project_folder, path))
+                for mod, path in index_modules(project_folder, exclude=excludes).items()
+            }
+            module_names = { path: mod for mod, path in module_index.items() }
 
-            print('Validating %s \t(%s)' % (mod, path))
-            validation_results = compdoc.parser.parse_module(path).validate()
-            validation_failures = [ dv for dv in validation_results if dv.status == 'failure' ]
-            for fail in validation_failures:
-                print('[x]\t%s\tFAIL:\t%s' % (fail.name, fail.message), end='\n\n')
\ No newline at end of file
+            jobs = arguments.jobs
+            if jobs is None and arguments.timings:
+                """Phases run in worker processes can't be timed, so validate in-process unless asked otherwise"""
+                jobs = 1
+            if arguments.changed is not None:
+                from compdoc.indexer import find_git_root
+                from compdoc.validator import VALIDATIONS_FILE, ValidationStore, resolve_changed, validate_changed
+                store = ValidationStore(os.path.join(_cache_dir(arguments, project_folder), VALIDATIONS_FILE))
+                changed = None
+                if arguments.changed:
+                    if arguments.changed == ['-']:
+                        """Listed by `git diff --name-only`, relative to the git work tree, or else to the project"""
+                        paths = [ line.strip() for line in sys.stdin if line.strip() ]
+                        base_dir = find_git_root(project_folder) or project_folder
+                    else:
+                        paths, base_dir = arguments.changed, None
+                    changed, unmatched = resolve_changed(module_index.values(), paths, base_dir)
+                    for path in unmatched:
+                        print('WARNING: Changed path %s matches no module of the project' % path, file=sys.stderr)
+                validated = validate_changed(module_index.values(), store, changed=changed, jobs=jobs,
+                                             cache_dir=cache_dir)
+            else:
+                validated = validate_modules(module_index.values(), jobs=jobs, cache_dir=cache_dir)
+            results = (
+                (module_names[path], path, validation_results) for path, validation_results in validated
+            )
+
+        stream = sys.stdout if arguments.output is None else open(arguments.output, 'w')
+        reporter = REPORTERS[arguments.report_format](stream)
+        reporter.begin()
+        try:
+            for module_name, path, validation_results in results:
+                reporter.module(module_name, path)
+                for validation in validation_results:
+                    reporter.report(validation)
+        finally:
+            reporter.end()
+            if stream is not sys.stdout:
+                stream.close()
+
+        if store is not None:
+            store.save(keep=module_index.values())
+            compdoc.timings.count('validations (stored)', store.hits, store.misses)
+        if client is None and cache_dir is not None:
+            from compdoc.cache import shared_disk_cache
+            disk_cache = shared_disk_cache(cache_dir)
+            compdoc.timings.count('modules (disk)', disk_cache.hits, disk_cache.misses)
+
+        if reporter.failures:
+            exit(1)
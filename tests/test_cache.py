@@ -0,0 +1,127 @@
+import os
+
+from jinja2 import BaseLoader, Environment
+
+from compdoc.cache import DiskCache, ModuleCache, file_digest
+from compdoc.compiler import CompDoc
+
+
+def test_module_cache_hits():
+
+    cache = ModuleCache()
+    first = cache.get('tests/vectortest/vec.py')
+    second = cache.get('tests/vectortest/vec.py')
+
+    assert first is second
+    assert cache.stats() == (1, 1, 1)
+
+
+def test_module_cache_invalidates_on_change(tmp_path):
+
+    source = tmp_path / 'mod.py'
+    source.write_text('def f():\n    pass\n')
+
+    cache = ModuleCache()
+    assert [ d.func_name for d in cache.get(str(source)).docs ] == ['f']
+
+    source.write_text('def f():\n    pass\n\ndef g():\n    pass\n')
+    os.utime(source, ns=(0, 0))
+    assert [ d.func_name for d in cache.get(str(source)).docs ] == ['f', 'g']
+    assert cache.stats() == (0, 2, 1)
+
+
+def test_compdoc_module_parses_once():
+
+    env = Environment(loader=BaseLoader())
+    compdoc = CompDoc({'modules': {'vec': 'tests/vectortest/vec.py'}, 'formatters': {}}, env)
+
+    template = env.from_string("{% for _ in range(10) %}{{ compdoc.module('vec').Vec2.doc.class_name }}{% endfor %}",
+                               globals={'compdoc': compdoc})
+
+    assert template.render() == 'Vec2' * 10
+    assert compdoc.module_cache.stats() == (9, 1, 1)
+
+
+def test_disk_cache_round_trip(tmp_path):
+
+    cache = DiskCache(str(tmp_path / 'cache'))
+    first = cache.get('tests/vectortest/vec.py')
+    second = DiskCache(str(tmp_path / 'cache')).get('tests/vectortest/vec.py')
+
+    assert first is not second
+    assert [ d.class_name for d in second.classes ] == ['Vec2', 'Vec3', 'VecN']
+    assert (cache.misses, cache.stats().entries) == (1, 1)
+
+    cache.clear()
+    assert cache.stats().entries == 0
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+
+    sources = []
+    for i in range(3):
+        source = tmp_path / ('mod%d.py' % i)
+        source.write_text('def f%d():\n    pass\n' % i)
+        sources.append(str(source))
+
+    cache = DiskCache(str(tmp_path / 'cache'))
+    cache.get(sources[0])
+    cache.get(sources[1])
+    entries = [ cache._entry_path(source, file_digest(source)) for source in sources ]
+    for age, entry in enumerate(entries[:2]):
+        os.utime(entry, ns=(0, (age + 1) * 1_000_000_000))
+    cache.max_size = sum(os.path.getsize(entry) for entry in entries[:2]) + 16
+
+    cache.get(sources[0])
+    cache.get(sources[2])
+
+    assert cache.misses == 3 and cache.hits == 1
+    assert [ os.path.exists(entry) for entry in entries ] == [True, False, True]
+
+
+def test_module_cache_get_symbol(tmp_path):
+
+    source = tmp_path / 'mod.py'
+    source.write_text('class A:\n    def f(self) -> int:\n        pass\n\ndef g() -> str:\n    pass\n')
+
+    cache = ModuleCache()
+    a = cache.get_symbol(str(source), 'A')
+    assert a.get_func('f').annotations.returns == 'int'
+    assert cache.get_symbol(str(source), 'A') is a
+    assert cache.stats() == (1, 1, 0)
+
+    source.write_text('class A:\n    def f(self) -> float:\n        pass\n')
+    os.utime(source, ns=(0, 0))
+    assert cache.get_symbol(str(source), 'A').get_func('f').annotations.returns == 'float'
+    assert cache.get_symbol(str(source), 'g') is None
+
+    module_doc = cache.get(str(source))
+    assert cache.get_symbol(str(source), 'A') is module_doc.get_class('A')
+
+
+def test_module_cache_prefetch(tmp_path):
+
+    sources = []
+    for i in range(3):
+        source = tmp_path / ('mod%d.py' % i)
+        source.write_text('def f%d(x: int) -> int:\n    return x\n' % i)
+        sources.append(str(source))
+
+    cache = ModuleCache()
+    cache.prefetch(sources + [ str(tmp_path / 'missing.py') ], jobs=2)
+    assert cache.stats() == (0, 3, 3)
+
+    assert [ d.func_name for d in cache.get(sources[1]).docs ] == ['f1']
+    assert cache.stats() == (1, 3, 3)
+
+    """The worker pool is kept for later prefetches until the cache is closed"""
+    executor = cache._executor
+    source = tmp_path / 'mod3.py'
+    source.write_text('def f3():\n    pass\n')
+    os.utime(sources[0], ns=(0, 0))
+    cache.prefetch(sources + [ str(source) ], jobs=2)
+    assert cache._executor is executor and cache.stats() == (1, 5, 4)
+
+    cache.close()
+    assert cache._executor is None
+    assert [ d.func_name for d in cache.get(str(source)).docs ] == ['f3']
@@ -1,6 +1,249 @@
+import os
+
+import pytest
+
+from compdoc.compiler import (
+    CompDoc,
+    CompDocCompiler,
+    CompDocModule,
+    compile_compdoc_mdj2,
+    find_module_references,
+    make_environment,
+)
+from compdoc.exceptions import (
+    CompileClassFuncNotFoundException,
+    CompileUnrecognizedModuleAttrException,
+    CompileUnrecognizedSymbolException,
+)
+from compdoc.manifest import CompileManifest
 from compdoc.parser import parse_module
 
 
 def test_david_formatter():
 
-    vec = parse_module('tests/vectortest/vec.py')
\ No newline at end of file
+    vec = parse_module('tests/vectortest/vec.py')
+
+def test_formatter_compiled_once(tmp_path):
+
+    env = make_environment(bytecode_cache_dir=str(tmp_path / 'jinja'))
+    compdoc = CompDoc({'modules': {}, 'formatters': {'ul': 'tests/vectortest/compdoc-formatters/ul.md.j2'}}, env)
+
+    modules = { id(compdoc.formatter('ul')) for _ in range(10) }
+
+    assert len(modules) == 1
+    assert os.listdir(tmp_path / 'jinja')
+
+
+def test_compile_vectortest(tmp_path):
+
+    config = {
+        'modules': {'vec': 'tests/vectortest/vec.py'},
+        'formatters': {
+            'ul': 'tests/vectortest/compdoc-formatters/ul.md.j2',
+            'href': 'tests/vectortest/compdoc-formatters/href.md.j2',
+        },
+    }
+    out_path = tmp_path / 'README.md'
+
+    compile_compdoc_mdj2('tests/vectortest/README.md.j2', config, out_path=str(out_path))
+
+    assert out_path.read_text().startswith('# VectorTest')
+
+
+def test_compile_all_shares_caches(tmp_path):
+
+    config = {
+        'modules': {'vec': 'tests/vectortest/vec.py'},
+        'formatters': {'ul': 'tests/vectortest/compdoc-formatters/ul.md.j2'},
+    }
+    template_paths = []
+    for i in range(4):
+        template_path = tmp_path / ('page%d.md.j2' % i)
+        template_path.write_text("{{ compdoc.formatter('ul').format_class(compdoc.module('vec').Vec2) }}")
+        template_paths.append(str(template_path))
+
+    compiler = CompDocCompiler(config)
+    out_paths = compiler.compile_all(template_paths, jobs=2)
+
+    assert out_paths == [ path.removesuffix('.j2') for path in template_paths ]
+    assert compiler.module_cache.stats().misses == 1
+    assert len({ open(path).read() for path in out_paths }) == 1
+
+
+def test_compile_skips_unchanged(tmp_path):
+
+    source = tmp_path / 'mod.py'
+    source.write_text('def f():\n    """First."""\n')
+    template_path = tmp_path / 'page.md.j2'
+    template_path.write_text("{{ compdoc.module('mod').f.doc.string }}")
+    config = {'modules': {'mod': str(source)}, 'formatters': {}}
+
+    def compile_page() -> CompDocCompiler:
+        compiler = CompDocCompiler(config, manifest=CompileManifest(str(tmp_path / 'manifest.json')))
+        compiler.compile(str(template_path))
+        return compiler
+
+    assert compile_page().skipped == []
+    assert compile_page().skipped == [str(template_path)]
+
+    source.write_text('def f():\n    """Second."""\n')
+    assert compile_page().skipped == []
+    assert (tmp_path / 'page.md').read_text() == 'Second.'
+
+
+def test_compile_tracks_included_templates(tmp_path):
+
+    (tmp_path / 'base.md.j2').write_text('# {% block title %}{% endblock %}\n{% block body %}{% endblock %}')
+    (tmp_path / 'macros.j2').write_text('{% macro em(text) %}*{{ text }}*{% endmacro %}')
+    (tmp_path / 'partial.j2').write_text('First.')
+    template_path = tmp_path / 'page.md.j2'
+    template_path.write_text(
+        "{%% extends '%s' %%}{%% import '%s' as m %%}{%% block title %%}{{ m.em('Page') }}{%% endblock %%}"
+        "{%% block body %%}{%% include '%s' %%}{%% endblock %%}"
+        % (tmp_path / 'base.md.j2', tmp_path / 'macros.j2', tmp_path / 'partial.j2')
+    )
+    config = {'modules': {}, 'formatters': {}}
+    compiler = CompDocCompiler(config, manifest=CompileManifest(str(tmp_path / 'manifest.json')))
+
+    compiler.compile(str(template_path))
+    assert (tmp_path / 'page.md').read_text() == '# *Page*\nFirst.'
+    assert compiler.dependencies[str(template_path)] == {
+        str(tmp_path / name) for name in ('page.md.j2', 'base.md.j2', 'macros.j2', 'partial.j2')
+    }
+    dependencies = compiler.dependencies[str(template_path)]
+    compiler.compile(str(template_path), force=True)
+    assert compiler.dependencies[str(template_path)] == dependencies
+    compiler.compile(str(template_path))
+    assert compiler.skipped == [str(template_path)]
+
+    (tmp_path / 'partial.j2').write_text('Second, edited.')
+    compiler = CompDocCompiler(config, manifest=CompileManifest(str(tmp_path / 'manifest.json')))
+    compiler.compile(str(template_path))
+    assert compiler.skipped == []
+    assert (tmp_path / 'page.md').read_text() == '# *Page*\nSecond, edited.'
+
+
+def test_symbol_resolution():
+
+    env = make_environment()
+    compdoc = CompDoc({'modules': {'vectortest.vec': 'tests/vectortest/vec.py'}, 'formatters': {}}, env)
+
+    method = compdoc.symbol('vectortest.vec.VecN.from_list')
+    assert method.doc.func_name == 'from_list'
+    assert compdoc.symbol('vectortest.vec.VecN.from_list') is method
+    assert compdoc.symbol('vectortest.vec.Vec2').doc.class_name == 'Vec2'
+    assert compdoc.symbol('vectortest.vec').doc.module_name == 'vec'
+    assert compdoc.module_cache.stats().misses == 1
+
+    with pytest.raises(CompileUnrecognizedSymbolException, match='Did you mean: vectortest.vec.VecN.from_list'):
+        compdoc.symbol('vectortest.vec.VecN.from_lst')
+    with pytest.raises(CompileUnrecognizedSymbolException, match='Did you mean: vectortest.vec'):
+        compdoc.symbol('vectortest.vex.Vec2')
+
+    template = env.from_string("{{ compdoc.symbol('vectortest.vec.flatten_vecs').doc.annotations.returns }}")
+    assert template.render(compdoc=compdoc) == 'VecN'
+
+
+def test_wrapper_element_access():
+
+    vec = CompDocModule(parse_module('tests/vectortest/vec.py'))
+    assert vec.attrs == {}
+
+    assert vec.Vec2 is vec.__dict__['Vec2'] is vec['Vec2']
+    assert list(vec.attrs) == ['Vec2'] and vec.Vec2.attrs == {}
+    assert vec.VecN.from_list is vec['VecN']['from_list']
+    assert vec.doc.module_name == 'vec'
+    assert not hasattr(vec, '__html__')
+    assert not hasattr(vec.Vec2, '__html__')
+
+    with pytest.raises(CompileUnrecognizedModuleAttrException):
+        vec.Vec4
+    with pytest.raises(CompileUnrecognizedModuleAttrException):
+        vec['Vec4']
+    with pytest.raises(CompileClassFuncNotFoundException):
+        vec.Vec2.cross
+
+    env = make_environment()
+    assert env.from_string("{{ vec.Vec2.norm.doc.func_name }}").render(vec=vec) == 'norm'
+
+
+def test_targeted_module(tmp_path):
+
+    env = make_environment()
+    config = {'modules': {'vec': 'tests/vectortest/vec.py'}, 'formatters': {}}
+    compdoc = CompDoc(config, env, targeted=True)
+
+    vec = compdoc.module('vec')
+    assert vec.Vec2.norm.doc.func_name == 'norm'
+    assert compdoc.module_cache.stats().entries == 0
+
+    assert vec.doc.module_name == 'vec'
+    assert compdoc.module_cache.stats().entries == 1
+    with pytest.raises(CompileUnrecognizedModuleAttrException):
+        vec.Vec4
+
+    out_path = tmp_path / 'README.md'
+    compile_compdoc_mdj2('tests/vectortest/README.md.j2', dict(config, formatters={
+        'ul': 'tests/vectortest/compdoc-formatters/ul.md.j2',
+        'href': 'tests/vectortest/compdoc-formatters/href.md.j2',
+    }), out_path=str(out_path), targeted=True)
+    assert out_path.read_text().startswith('# VectorTest')
+
+
+def test_find_module_references(tmp_path):
+
+    template = tmp_path / 'README.md.j2'
+    template.write_text(
+        "{% set vec = compdoc.module('vec') %}{{ compdoc.symbol('pkg.mod.Class.method') }}"
+        "{{ compdoc.module(name) }}{{ compdoc.module('unknown') }}{{ compdoc.formatter('vec') }}"
+        "{% for m in ['vec'] %}{{ compdoc.symbol('vec.Vec2') }}{% endfor %}"
+    )
+    env = make_environment()
+
+    assert find_module_references(env, str(template), {'vec', 'pkg.mod', 'pkg'}) == ['vec', 'pkg.mod']
+
+
+def test_compile_async_prefetch(tmp_path):
+
+    config = {
+        'modules': {'vec': 'tests/vectortest/vec.py'},
+        'formatters': {
+            'ul': 'tests/vectortest/compdoc-formatters/ul.md.j2',
+            'href': 'tests/vectortest/compdoc-formatters/href.md.j2',
+        },
+    }
+    sync_out, async_out = tmp_path / 'sync.md', tmp_path / 'async.md'
+
+    compile_compdoc_mdj2('tests/vectortest/README.md.j2', config, out_path=str(sync_out))
+    compiler = CompDocCompiler(config, prefetch=True, enable_async=True)
+    compiler.compile('tests/vectortest/README.md.j2', out_path=str(async_out))
+
+    assert async_out.read_text() == sync_out.read_text()
+    assert compiler.module_cache.stats().misses == 1
+
+
+def test_nested_class_access(tmp_path):
+
+    source = tmp_path / 'shapes.py'
+    source.write_text('class Shape:\n    class Side:\n        def length(self) -> float:\n            """Length."""\n')
+    shapes = CompDocModule(parse_module(str(source)))
+
+    assert shapes.Shape.Side.length is shapes['Shape']['Side']['length']
+    assert shapes.Shape.Side.length.doc.string == 'Length.'
+    with pytest.raises(CompileClassFuncNotFoundException):
+        shapes.Shape.Corner
+
+
+def test_element_precedence(tmp_path):
+
+    source = tmp_path / 'shadowed.py'
+    source.write_text('def Point():\n    """Factory."""\n\nclass Point:\n    """Class."""\n'
+                      '    class norm:\n        """Class."""\n\n    def norm(self):\n        """Method."""\n')
+    module_doc = parse_module(str(source))
+    shadowed = CompDocModule(module_doc)
+
+    """Modules, classes and lookups agree on the element a name binds: its last definition"""
+    assert shadowed.Point.doc is module_doc.lookup('Point') is module_doc.get_class('Point')
+    assert shadowed.Point.norm.doc is module_doc.lookup('Point.norm') is module_doc.get_func('Point.norm')
+    assert shadowed.Point.norm.doc.string == 'Method.'
+    assert module_doc.get_func('Point') is None
@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+
+import pytest
+
+from compdoc.client import CompDocClient, find_socket
+from compdoc.compiler import compile_compdoc_mdj2
+from compdoc.config import load_config
+from compdoc.daemon import CompDocDaemon
+from compdoc.exceptions import DaemonRequestException, DaemonRunningException
+from compdoc.report import load_validation
+
+
+@pytest.fixture
+def daemon(tmp_path):
+
+    (tmp_path / 'a.py').write_text('def a(x: int) -> int:\n    """A.\n\n    Args:\n        x (int): X\n    """\n')
+    (tmp_path / 'b.py').write_text('def b(y):\n    """B."""\n')
+    (tmp_path / '.compdoc.yml').write_text('modules:\n  a: a.py\n  b: b.py\n\nformatters: {}\n')
+    (tmp_path / 'a.md.j2').write_text("{{ compdoc.module('a').a.doc.string }}")
+
+    compdoc_daemon = CompDocDaemon(str(tmp_path), str(tmp_path / '.compdoc-cache'))
+    thread = threading.Thread(target=compdoc_daemon.serve)
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(compdoc_daemon.socket_path):
+            break
+        time.sleep(0.05)
+    yield compdoc_daemon
+    client = CompDocClient.connect(compdoc_daemon.socket_path)
+    if client is not None:
+        with client:
+            client.request('shutdown')
+    thread.join(timeout=5)
+
+
+def test_daemon_requests(tmp_path, daemon):
+
+    with CompDocClient.connect(daemon.socket_path) as client:
+        assert client.request('ping') == 'pong'
+
+        template = str(tmp_path / 'a.md.j2')
+        assert client.request('compile', templates=[template]) == \
+            {'compiled': [str(tmp_path / 'a.md')], 'skipped': [], 'errors': {}}
+        assert (tmp_path / 'a.md').read_text() == 'A.\n\nArgs:\n    x (int): X'
+        assert client.request('compile', templates=[template])['skipped'] == [template]
+
+        result = client.request('validate')
+        assert result['failures'] == 1
+        modules = { module['module']: module for module in result['modules'] }
+        assert modules['a']['failures'] == []
+        [record] = modules['b']['failures']
+        validation = load_validation(record, filepath='b.py')
+        assert validation.filepath == 'b.py' and validation.name.startswith('b.py')
+        assert validation.errors and [ e.rule for e in validation.errors ] == [ rule for rule, _ in record['errors'] ]
+
+        summary = client.request('symbol', name='a.a')
+        assert summary['kind'] == 'function' and summary['name'] == 'a' and summary['returns'] == 'int'
+
+        with pytest.raises(DaemonRequestException, match='CompileUnrecognizedSymbolException'):
+            client.request('symbol', name='a.nope')
+        with pytest.raises(DaemonRequestException, match='Unknown method'):
+            client.request('serve')
+        assert client.request('stats')['requests'] == 7
+
+    (tmp_path / 'pkg').mkdir()
+    assert find_socket(str(tmp_path / 'pkg')) == daemon.socket_path
+    with pytest.raises(DaemonRunningException):
+        CompDocDaemon(str(tmp_path), str(tmp_path / '.compdoc-cache')).serve()
+
+
+def test_daemon_compile_matches_local(tmp_path, monkeypatch, daemon):
+
+    (tmp_path / 'docs').mkdir()
+    (tmp_path / 'docs' / 'a.md.j2').write_text(
+        "[a]({{ compdoc.module('a').a.doc.filepath }}#L{{ compdoc.module('a').a.doc.line_no }})\n"
+    )
+
+    """Compiled from the docs folder, with the configuration given relative to it"""
+    monkeypatch.chdir(tmp_path / 'docs')
+    compile_compdoc_mdj2('a.md.j2', load_config('../.compdoc.yml'), out_path='local.md')
+
+    monkeypatch.chdir(tmp_path)
+    with CompDocClient.connect(daemon.socket_path) as client:
+        result = client.request('compile', templates=['a.md.j2'], cwd=str(tmp_path / 'docs'),
+                                config_path='../.compdoc.yml', out_path='daemon.md')
+    assert result == {'compiled': ['daemon.md'], 'skipped': [], 'errors': {}}
+
+    local = (tmp_path / 'docs' / 'local.md').read_bytes()
+    assert local == b'[a](../a.py#L1)'
+    assert (tmp_path / 'docs' / 'daemon.md').read_bytes() == local
+    assert os.getcwd() == str(tmp_path)
+
+
+def test_daemon_shutdown(daemon):
+
+    with CompDocClient.connect(daemon.socket_path) as client:
+        assert client.request('shutdown') is True
+    for _ in range(100):
+        if not os.path.exists(daemon.socket_path):
+            break
+        time.sleep(0.05)
+    assert not os.path.exists(daemon.socket_path)
+    assert CompDocClient.connect(daemon.socket_path) is None
@@ -0,0 +1,87 @@
+import os
+
+import compdoc.cache
+from compdoc.cache import DiskCache
+from compdoc.index import ProjectIndex, build_index, iter_symbols
+
+
+def _project(tmp_path):
+    pkg = tmp_path / 'pkg'
+    pkg.mkdir()
+    (pkg / '__init__.py').write_text('')
+    (pkg / 'shapes.py').write_text(
+        'class Shape:\n    def area(self) -> float:\n        pass\n\n    class Side:\n        pass\n\n'
+        'def make(n: int) -> Shape:\n    pass\n'
+    )
+    return pkg
+
+
+def test_build_and_load_index(tmp_path):
+
+    pkg = _project(tmp_path)
+    index_path = str(tmp_path / 'index.bin')
+    build_index(str(tmp_path), index_path).close()
+
+    index = ProjectIndex(index_path)
+    assert set(index.modules) == {'pkg', 'pkg.shapes'}
+
+    shapes = index.get(str(pkg / 'shapes.py'))
+    assert list(iter_symbols('pkg.shapes', shapes.docs)) == \
+        ['pkg.shapes.Shape', 'pkg.shapes.Shape.area', 'pkg.shapes.Shape.Side', 'pkg.shapes.make']
+    assert shapes.get_func('Shape.area').annotations.returns == 'float'
+    assert index.module('pkg.shapes') is shapes
+
+    (pkg / 'shapes.py').write_text('def make(n: int) -> int:\n    pass\n')
+    assert index.get(str(pkg / 'shapes.py')) is None
+
+
+def test_index_relocates_and_skips(tmp_path, monkeypatch):
+
+    pkg = _project(tmp_path)
+    (pkg / 'broken.py').write_text('def broken(:\n')
+    index_path = str(tmp_path / 'index.bin')
+    build_index(str(tmp_path), index_path).close()
+
+    index = ProjectIndex(index_path)
+    assert set(index.modules) == {'pkg', 'pkg.shapes'}
+    assert index.skipped == [str(pkg / 'broken.py')]
+    assert index.get(str(pkg / 'broken.py')) is None
+
+    """A module requested by another path than it was indexed with records the requested path"""
+    monkeypatch.chdir(tmp_path)
+    shapes = index.get(os.path.join('pkg', 'shapes.py'))
+    assert shapes.filepath == os.path.join('pkg', 'shapes.py')
+    assert shapes.get_func('make').filepath == shapes.filepath
+    assert shapes.get_func('Shape.area').filepath == shapes.filepath
+    assert shapes.get_class('Shape.Side').filepath == shapes.filepath
+    assert index.get(os.path.join('pkg', 'shapes.py')) is shapes
+    assert index.get(str(pkg / 'shapes.py')).filepath == str(pkg / 'shapes.py')
+
+
+def test_load_rejects_invalid_snapshot(tmp_path):
+
+    assert ProjectIndex.load(str(tmp_path / 'missing.bin')) is None
+    (tmp_path / 'empty.bin').write_bytes(b'')
+    assert ProjectIndex.load(str(tmp_path / 'empty.bin')) is None
+    (tmp_path / 'bad.bin').write_bytes(b'not an index at all')
+    assert ProjectIndex.load(str(tmp_path / 'bad.bin')) is None
+
+
+def test_disk_cache_serves_from_index(tmp_path, monkeypatch):
+
+    pkg = _project(tmp_path)
+    cache_dir = str(tmp_path / '.compdoc-cache')
+    build_index(str(tmp_path), os.path.join(cache_dir, 'index.bin'))
+
+    def fail(path):
+        raise AssertionError('source read: %s' % path)
+
+    monkeypatch.setattr(compdoc.cache, 'file_digest', fail)
+    monkeypatch.setattr(compdoc.cache, 'parse_module', fail)
+
+    cache = DiskCache(cache_dir)
+    assert [ d.func_name for d in cache.get(str(pkg / 'shapes.py')).external_functions ] == ['make']
+    assert cache.hits == 1
+
+    cache.clear()
+    assert not os.path.exists(cache.index_path)
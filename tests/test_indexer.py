@@ -0,0 +1,42 @@
+from compdoc.indexer import is_ignored, iter_modules, module_name, parse_ignore_patterns
+
+
+def test_module_name():
+
+    assert module_name('mod.py') == 'mod'
+    assert module_name('pkg/sub/mod.py') == 'pkg.sub.mod'
+    assert module_name('pkg/__init__.py') == 'pkg'
+
+
+def test_ignore_patterns():
+
+    rules = parse_ignore_patterns(['*.log', '/build/', 'docs/**/gen', '!keep.log', 'tmp/'])
+
+    assert is_ignored(rules, 'a/b.log', False)
+    assert not is_ignored(rules, 'a/keep.log', False)
+    assert is_ignored(rules, 'build', True)
+    assert not is_ignored(rules, 'src/build', True)
+    assert is_ignored(rules, 'docs/gen', True)
+    assert is_ignored(rules, 'docs/a/b/gen', True)
+    assert is_ignored(rules, 'src/tmp', True)
+    assert not is_ignored(rules, 'src/tmp', False)
+
+
+def test_iter_modules(tmp_path):
+
+    for path in ('a.py', 'pkg/__init__.py', 'pkg/mod.py', 'pkg/gen_pb2.py', 'pkg/sub/deep.py', '.venv/lib/site.py',
+                 'node_modules/x/y.py', 'build/out.py', 'docs/build/conf.py', 'skip/me.py', 'notes.txt'):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text('')
+    (tmp_path / 'pkg' / '.gitignore').write_text('gen_*.py\n')
+
+    modules = list(iter_modules(str(tmp_path), exclude=['skip/']))
+
+    assert modules == [
+        ('a', 'a.py'),
+        ('docs.build.conf', 'docs/build/conf.py'),
+        ('pkg', 'pkg/__init__.py'),
+        ('pkg.mod', 'pkg/mod.py'),
+        ('pkg.sub.deep', 'pkg/sub/deep.py'),
+    ]
+    assert ('pkg.gen_pb2', 'pkg/gen_pb2.py') in list(iter_modules(str(tmp_path), use_gitignore=False))
@@ -2,8 +2,8 @@ import ast
 
 import pytest
 
-from compdoc.model import ClassDoc, FuncDoc, ModuleDoc
-from compdoc.parser import parse_module
+from compdoc.model import ClassDoc, FuncDoc, ModuleDoc, parse_docstring
+from compdoc.parser import outline_module, parse_module, parse_symbol
 
 
 def test_parse_module():
@@ -19,7 +19,7 @@ def test_parse_module():
     assert vec2doc.class_name == 'Vec2'
     assert vec2doc.filepath == 'tests/vectortest/vec.py'
     assert vec2doc.line_no == 7
-    assert vec2doc.bases == ['NamedTuple']
+    assert vec2doc.bases == ('NamedTuple',)
     assert vec2doc.string == '2-dimensional vector struct, represented as a named tuple.'
     assert len(vec2doc.elements) == 1
 
@@ -28,7 +28,7 @@ def test_parse_module():
     assert vec2normdoc.func_name == 'norm'
     assert vec2normdoc.filepath == 'tests/vectortest/vec.py'
     assert vec2normdoc.line_no == 13
-    assert vec2normdoc.annotations._asdict() == {'first_arg': 'self', 'args': [], 'returns': 'float'}
+    assert vec2normdoc.annotations._asdict() == {'first_arg': 'self', 'args': (), 'returns': 'float'}
     assert vec2normdoc.string == 'Computes the L2 norm of the vector.\n\nReturns:\n    float: Norm of this vector'
 
     vec3doc = rval.docs[1]
@@ -36,7 +36,7 @@ def test_parse_module():
     assert vec3doc.class_name == 'Vec3'
     assert vec3doc.filepath == 'tests/vectortest/vec.py'
     assert vec3doc.line_no == 22
-    assert vec3doc.bases == ['NamedTuple']
+    assert vec3doc.bases == ('NamedTuple',)
     assert vec3doc.string == '3-dimensional vector struct, represented as a named tuple.'
     assert len(vec3doc.elements) == 1
 
@@ -45,7 +45,7 @@ def test_parse_module():
     assert vec3normdoc.func_name == 'norm'
     assert vec3normdoc.filepath == 'tests/vectortest/vec.py'
     assert vec3normdoc.line_no == 29
-    assert vec3normdoc.annotations._asdict() == {'first_arg': 'self', 'args': [], 'returns': 'float'}
+    assert vec3normdoc.annotations._asdict() == {'first_arg': 'self', 'args': (), 'returns': 'float'}
     assert vec3normdoc.string == 'Computes the L2 norm of the vector.\n\nReturns:\n    float: Norm of this vector'
 
     vecndoc = rval.docs[2]
@@ -53,7 +53,7 @@ def test_parse_module():
     assert vecndoc.class_name == 'VecN'
     assert vecndoc.filepath == 'tests/vectortest/vec.py'
     assert vecndoc.line_no == 38
-    assert vecndoc.bases == ['NamedTuple']
+    assert vecndoc.bases == ('NamedTuple',)
     assert vecndoc.string == 'N-dimensional vector struct, represented as a named tuple.'
     assert len(vecndoc.elements) == 3
 
@@ -63,7 +63,7 @@ def test_parse_module():
     assert vecnfromcomponentsdoc.filepath == 'tests/vectortest/vec.py'
     assert vecnfromcomponentsdoc.line_no == 45
     assert vecnfromcomponentsdoc.annotations._asdict() == {
-        'first_arg': 'cls', 'args': [('*components', 'float')], 'returns': 'VecN'
+        'first_arg': 'cls', 'args': (('*components', 'float'),), 'returns': 'VecN'
     }
     assert vecnfromcomponentsdoc.string == ('Constructs a VecN from however many floating point components are provided.\n'
                                         '\nReturns:\n    VecN: A new n-dimensional vector with the specified components')
@@ -72,14 +72,14 @@ def test_parse_module():
     assert isinstance(vecnfromlistdoc, FuncDoc)
     assert vecnfromlistdoc.func_name == 'from_list'
     assert vecnfromlistdoc.annotations._asdict() == {
-        'first_arg': 'cls', 'args': [('xs', 'list[float]')], 'returns': 'VecN'
+        'first_arg': 'cls', 'args': (('xs', 'list[float]'),), 'returns': 'VecN'
     }
 
     flattenvecsdoc = rval.docs[3]
     assert isinstance(flattenvecsdoc, FuncDoc)
     assert flattenvecsdoc.func_name == 'flatten_vecs'
     assert flattenvecsdoc.annotations._asdict() == {
-        'first_arg': None, 'args': [('vecs', 'list[VecN]')], 'returns': 'VecN'
+        'first_arg': None, 'args': (('vecs', 'list[VecN]'),), 'returns': 'VecN'
     }
 
 def test_func_query():
@@ -93,4 +93,156 @@ def test_func_query():
 
     fvecdoc = vec.get_func('flatten_vecs')
     assert fvecdoc is not None
-    assert fvecdoc.annotations.returns == 'VecN'
\ No newline at end of file
+    assert fvecdoc.annotations.returns == 'VecN'
+
+def test_name_indexes():
+
+    vec = parse_module('tests/vectortest/vec.py')
+
+    assert [ c.class_name for c in vec.classes ] == ['Vec2', 'Vec3', 'VecN']
+    assert [ f.func_name for f in vec.external_functions ] == ['flatten_vecs']
+    assert vec.classes is vec.classes
+
+    assert vec.get_func('VecN.from_list') is vec.get_class('VecN').get_func('from_list')
+    assert vec.get_func('VecN.missing') is None
+    assert vec.get_func('Vec2.norm.x') is None
+    assert vec.get_class('flatten_vecs') is None
+    assert vec.get_func('Vec2') is None
+
+    hand_built = ModuleDoc('m', 'm.py', list(vec.docs))
+    assert hand_built.get_func('flatten_vecs') is vec.get_func('flatten_vecs')
+
+
+def test_name_indexes_keep_last_definition(tmp_path):
+
+    (tmp_path / 'redefined.py').write_text(
+        'class Point:\n'
+        '    @property\n    def x(self) -> float:\n        """Getter."""\n\n'
+        '    @x.setter\n    def x(self, value: float):\n        """Setter."""\n\n'
+        'def scale(p):\n    """Old."""\n\n'
+        'def scale(p, k: float):\n    """New."""\n'
+    )
+    redefined = parse_module(str(tmp_path / 'redefined.py'))
+
+    assert redefined.get_func('Point.x').string == 'Setter.'
+    assert redefined.get_func('scale').string == 'New.'
+    assert redefined.lookup('scale').annotations.args[-1] == ('k', 'float')
+
+
+def test_docstring_parsed_on_access():
+
+    parse_docstring.cache_clear()
+    vec = parse_module('tests/vectortest/vec.py')
+    assert parse_docstring.cache_info().currsize == 0
+
+    norm = vec.get_func('Vec2.norm')
+    assert norm.docstring.returns.type_name == 'float'
+    assert norm.docstring is norm.docstring
+    assert parse_docstring.cache_info().currsize == 1
+
+
+def test_compact_storage():
+
+    vec = parse_module('tests/vectortest/vec.py')
+    reparsed = parse_module('tests/vectortest/vec.py')
+
+    from_list = vec.get_func('VecN.from_list')
+    assert isinstance(from_list.annotations.args, tuple)
+    assert isinstance(vec.get_class('VecN').bases, tuple)
+    assert not hasattr(from_list, '__dict__')
+
+    """Strings repeated across documents and parses are shared"""
+    assert from_list.annotations.args[0][1] is reparsed.get_func('VecN.from_list').annotations.args[0][1]
+    assert vec.get_class('Vec2').bases[0] is vec.get_class('Vec3').bases[0]
+    assert from_list.filepath is vec.get_func('flatten_vecs').filepath
+
+
+def test_docstring_field_removed():
+
+    vec = parse_module('tests/vectortest/vec.py')
+    norm = vec.get_func('Vec2.norm')
+    vec2 = vec.get_class('Vec2')
+
+    """Documents built with the old layout, which had the parsed docstring after `string`, are rejected"""
+    with pytest.raises(TypeError):
+        FuncDoc(*norm, norm.docstring)
+    with pytest.raises(TypeError, match='docstring'):
+        FuncDoc(*norm[:5], docstring=norm.docstring)
+    with pytest.raises(TypeError):
+        ClassDoc(*vec2[:4], vec2.docstring, *vec2[4:])
+
+    assert FuncDoc(*norm) == norm and norm._replace(line_no=1).line_no == 1
+    assert ClassDoc._make(vec2) == vec2
+
+
+def test_parse_symbol(tmp_path):
+
+    source = tmp_path / 'mod.py'
+    source.write_text(
+        'import os\n\n'
+        'TEMPLATE = """\n'
+        'def fake(x: int) -> int:\n'
+        '    pass\n'
+        '"""\n\n'
+        '@decorator\n'
+        'def target(x: int) -> str:\n'
+        '    """Target.\n\n'
+        'class NotAClass:\n'
+        '    """\n'
+        '    # def neither():\n'
+        '    return str(x)\n\n'
+        'class Twice:\n    pass\n\n'
+        'class Twice:\n    def second(self) -> int:\n        pass\n'
+    )
+    outline = outline_module(source.read_text())
+
+    assert set(outline) == {'target', 'Twice'}
+    assert outline['target'].line_no == 9
+    assert outline['Twice'] is None
+
+    full = parse_module(str(source))
+    target = parse_symbol(str(source), 'target')
+    assert target == full.get_func('target')
+    assert target.line_no == 9
+    assert parse_symbol(str(source), 'Twice') == full.get_class('Twice')
+    assert parse_symbol(str(source), 'fake') is None
+
+    vec = parse_module('tests/vectortest/vec.py')
+    for name in ('Vec2', 'Vec3', 'VecN', 'flatten_vecs'):
+        assert parse_symbol('tests/vectortest/vec.py', name) == vec.lookup(name)
+
+
+def test_parse_full_syntax(tmp_path):
+
+    source = tmp_path / 'mod.py'
+    source.write_text(
+        'import collections.abc\n\n'
+        'class Table(Generic[K, V], collections.abc.Mapping, metaclass=Meta):\n'
+        '    """Table."""\n\n'
+        '    class Row:\n'
+        '        def cells(self, /, start: int, *, end: "int | None" = None) -> list[str]: ...\n\n'
+        '    async def fetch(self, key: K | None, retry: collections.abc.Callable[[int], bool]) -> V:\n'
+        '        pass\n\n'
+        'async def gather(*tasks: Task, timeout: float, **options) -> tuple[int, ...]:\n'
+        '    """Gather."""\n'
+    )
+    module = parse_module(str(source))
+
+    table = module.get_class('Table')
+    assert table.bases == ('Generic[K, V]', 'collections.abc.Mapping')
+    assert [ type(doc) for doc in table.elements ] == [ ClassDoc, FuncDoc ]
+    assert module.get_func('Table.Row.cells').annotations._asdict() == {
+        'first_arg': 'self', 'args': (('start', 'int'), ('end', 'int | None')), 'returns': 'list[str]'
+    }
+    assert module.get_func('Table.Row.cells').string is None
+    assert module.get_func('Table.fetch').annotations.args == (
+        ('key', 'K | None'), ('retry', 'collections.abc.Callable[[int], bool]'),
+    )
+    assert module.get_func('gather').annotations._asdict() == {
+        'first_arg': None,
+        'args': (('*tasks', 'Task'), ('timeout', 'float'), ('**options', 'Any')),
+        'returns': 'tuple[int, ...]',
+    }
+    assert [ v.symbol for v in module.validate() ] == ['Table.Row.cells', 'Table.fetch', 'gather']
+    assert parse_symbol(str(source), 'gather') == module.get_func('gather')
+    assert parse_symbol(str(source), 'Table') == table
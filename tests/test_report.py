@@ -0,0 +1,87 @@
+import io
+import json
+
+import pytest
+
+from compdoc.parser import parse_module
+from compdoc.report import REPORTERS, JsonLinesReporter, SarifReporter, TextReporter, ValidationReporter
+from compdoc_cli.compdoc_cli import REPORT_FORMATS
+
+
+def _report(reporter_type, module_doc):
+    stream = io.StringIO()
+    reporter = reporter_type(stream)
+    reporter.begin()
+    reporter.module(module_doc.module_name, module_doc.filepath)
+    for validation in module_doc.iter_validate():
+        reporter.report(validation)
+    reporter.end()
+    return reporter, stream.getvalue()
+
+
+def test_structured_validation_errors():
+
+    vec_doc = parse_module('tests/vectortest/vec.py')
+    failures = [ v for v in vec_doc.iter_validate() if v.status == 'failure' ]
+
+    assert failures
+    for failure in failures:
+        assert failure.filepath == 'tests/vectortest/vec.py'
+        assert failure.line_no > 0
+        assert failure.errors
+        assert failure.message == ''.join('\n' + error.message for error in failure.errors)
+    assert all(v.message is None and not v.errors for v in vec_doc.iter_validate() if v.status == 'success')
+
+
+def test_jsonl_report():
+
+    vec_doc = parse_module('tests/vectortest/vec.py')
+    reporter, output = _report(JsonLinesReporter, vec_doc)
+    records = [ json.loads(line) for line in output.splitlines() ]
+
+    assert reporter.failures > 0
+    assert len(records) == sum(len(v.errors) for v in vec_doc.validate())
+    for record in records:
+        assert set(record) == {'file', 'line', 'symbol', 'rule', 'message'}
+        assert record['file'] == 'tests/vectortest/vec.py'
+
+
+def test_sarif_report():
+
+    vec_doc = parse_module('tests/vectortest/vec.py')
+    reporter, output = _report(SarifReporter, vec_doc)
+    sarif = json.loads(output)
+
+    run, = sarif['runs']
+    assert sarif['version'] == '2.1.0'
+    assert run['tool']['driver']['name'] == 'compdoc'
+    assert len(run['results']) == sum(len(v.errors) for v in vec_doc.validate())
+    rule_ids = { rule['id'] for rule in run['tool']['driver']['rules'] }
+    assert all(result['ruleId'] in rule_ids for result in run['results'])
+
+    empty = io.StringIO()
+    sarif_reporter = SarifReporter(empty)
+    sarif_reporter.begin()
+    sarif_reporter.end()
+    assert json.loads(empty.getvalue())['runs'][0]['results'] == []
+
+
+def test_text_report():
+
+    vec_doc = parse_module('tests/vectortest/vec.py')
+    reporter, output = _report(TextReporter, vec_doc)
+
+    assert output.startswith('Validating %s \t(tests/vectortest/vec.py)' % vec_doc.module_name)
+    assert output.count('[x]\t') == reporter.failures
+
+
+def test_reporter_is_abstract():
+
+    with pytest.raises(TypeError, match='write_failure'):
+        ValidationReporter(io.StringIO())
+
+
+def test_report_formats_match_reporters():
+
+    """The CLI lists the formats without importing compdoc.report, so the two lists must be kept in sync"""
+    assert sorted(REPORTERS) == REPORT_FORMATS
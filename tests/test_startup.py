@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINT = "import sys; sys.argv[0] = 'compdoc'; from compdoc_cli import cli; cli()"
+
+"""Heavy dependencies each subcommand must not import on start-up. Import times themselves are measured by
+`python -X importtime`, not asserted, as they depend on the machine"""
+SUBCOMMANDS = {
+    'init': (['init', 'new-project', '-y'], ('jinja2', 'yaml', 'docstring_parser')),
+    'validate': (['validate', 'project', '-j', '1', '--no-cache'], ('jinja2', 'yaml')),
+    'cache': (['cache', 'stats', 'project'], ('jinja2', 'yaml', 'docstring_parser')),
+    'index': (['index', 'stats', 'project'], ('jinja2', 'yaml', 'docstring_parser')),
+    'compile': (['compile', 'project/README.md.j2', '--no-cache'], ()),
+}
+
+
+def _imported_modules(args, cwd):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', ENTRY_POINT, *args], cwd=cwd, env=env,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, _, name = line.split('|')
+        modules.add(name.strip())
+    return modules
+
+
+@pytest.mark.parametrize('subcommand', sorted(SUBCOMMANDS))
+def test_subcommand_startup(tmp_path, subcommand):
+
+    os.makedirs(tmp_path / 'new-project')
+    os.makedirs(tmp_path / 'project')
+    with open(tmp_path / 'project' / 'mod.py', 'w') as f:
+        f.write('def f(x: int) -> int:\n    """F.\n\n    Args:\n        x (int): X\n    """\n    return x\n')
+    with open(tmp_path / 'project' / 'README.md.j2', 'w') as f:
+        f.write("{{ compdoc.module('mod').f.doc.func_name }}\n")
+    if subcommand == 'compile':
+        with open(tmp_path / 'project' / '.compdoc.yml', 'w') as f:
+            f.write('modules:\n  mod: mod.py\n\nformatters: {}\n')
+
+    args, forbidden = SUBCOMMANDS[subcommand]
+    modules = _imported_modules(args, tmp_path)
+
+    assert 'compdoc_cli' in modules
+    assert not modules.intersection(forbidden)
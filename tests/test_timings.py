@@ -0,0 +1,55 @@
+import io
+import pstats
+import tracemalloc
+
+from compdoc import timings
+from compdoc.model import parse_docstring
+from compdoc.parser import parse_module
+
+
+def test_hooks_disabled():
+
+    assert timings.span('parse.ast') is timings.span('render', 'README.md.j2')
+    with timings.span('parse.ast'):
+        pass
+    timings.count('modules (memory)', 1, 0)
+
+
+def test_timings_report():
+
+    recorder = timings.enable()
+    try:
+        parse_docstring.cache_clear()
+        vec_doc = parse_module('tests/vectortest/vec.py')
+        vec_doc.validate()
+        timings.count('modules (disk)', 2, 1)
+        timings.count('modules (disk)', 1, 0)
+    finally:
+        timings.disable()
+
+    for phase in ('parse.read', 'parse.ast', 'parse.extract', 'parse.docstring'):
+        assert recorder.phases[phase][1] >= 1
+    assert recorder.caches == {'modules (disk)': (3, 1)}
+    assert [ path for path, _ in recorder.slowest('modules') ] == ['tests/vectortest/vec.py']
+
+    stream = io.StringIO()
+    recorder.write_report(stream, top=5)
+    report = stream.getvalue()
+    assert 'parse.ast' in report and 'Slowest modules' in report and 'Slowest formatters' not in report
+
+    """Once disabled, spans are no longer recorded"""
+    calls = recorder.phases['parse.ast'][1]
+    with timings.span('parse.ast'):
+        pass
+    assert recorder.phases['parse.ast'][1] == calls
+
+
+def test_profile(tmp_path):
+
+    with timings.profile(str(tmp_path / 'out.prof')):
+        parse_module('tests/vectortest/vec.py')
+    assert pstats.Stats(str(tmp_path / 'out.prof')).total_calls > 0
+
+    with timings.profile(str(tmp_path / 'out.snapshot'), memory=True):
+        parse_module('tests/vectortest/vec.py')
+    assert tracemalloc.Snapshot.load(str(tmp_path / 'out.snapshot')).statistics('filename')
@@ -0,0 +1,86 @@
+import os
+
+from compdoc.cache import DiskCache
+from compdoc.indexer import find_git_root
+from compdoc.validator import ValidationStore, resolve_changed, validate_changed, validate_modules
+
+
+def test_validate_modules_in_order(tmp_path):
+
+    sources = []
+    for i in range(6):
+        source = tmp_path / ('mod%d.py' % i)
+        source.write_text('def f%d(x: int) -> int:\n    return x\n' % i)
+        sources.append(str(source))
+    sources.append('tests/vectortest/vec.py')
+
+    serial = list(validate_modules(sources, jobs=1))
+    parallel = list(validate_modules(sources, jobs=2))
+
+    assert [ path for path, _ in parallel ] == sources
+    assert [ [ (v.name, v.status) for v in vals ] for _, vals in parallel ] == \
+        [ [ (v.name, v.status) for v in vals ] for _, vals in serial ]
+    assert all(vals[0].status == 'failure' for _, vals in parallel[:6])
+
+
+def test_validate_changed(tmp_path):
+
+    (tmp_path / 'a.py').write_text('def a(x):\n    """A.\n\n    Args:\n        x (int): X\n    """\n\n'
+                                   'class C:\n    def m(self, y):\n        """M."""\n')
+    (tmp_path / 'b.py').write_text('def b(y):\n    """B."""\n')
+    sources = [ str(tmp_path / 'a.py'), str(tmp_path / 'b.py') ]
+    store_path = str(tmp_path / 'validations.json')
+
+    def summary(results):
+        return [ [ (v.symbol, v.line_no, v.status, v.errors) for v in vals ] for _, vals in results ]
+
+    store = ValidationStore(store_path)
+    assert summary(validate_changed(sources, store)) == summary(validate_modules(sources, jobs=1))
+    assert (store.hits, store.misses) == (0, 3)
+    store.save(keep=sources)
+
+    (tmp_path / 'a.py').write_text('import os\n\ndef a(x):\n    """A.\n\n    Args:\n        x (int): X\n    """\n\n'
+                                   'class C:\n    def m(self, y):\n        """M.\n\n        Args:\n'
+                                   '            y (int): Y\n        """\n')
+    store = ValidationStore(store_path)
+    assert summary(validate_changed(sources, store)) == summary(validate_modules(sources, jobs=1))
+    assert (store.hits, store.misses) == (2, 1)
+    store.save(keep=sources)
+
+    before = summary(validate_modules(sources[1:], jobs=1))
+    (tmp_path / 'b.py').write_text('def b(y):\n    """B.\n\n    Args:\n        y (int): Y\n    """\n')
+    assert summary(validate_changed(sources, ValidationStore(store_path), changed={ sources[0] }))[1:] == before
+    assert summary(validate_changed(sources, ValidationStore(store_path)))[1:] == \
+        summary(validate_modules(sources[1:], jobs=1)) != before
+
+
+def test_resolve_changed(tmp_path, monkeypatch):
+
+    (tmp_path / '.git').mkdir()
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'a.py').write_text('def a():\n    pass\n')
+    assert find_git_root(str(tmp_path / 'pkg')) == str(tmp_path)
+
+    """git reports paths relative to the work tree, whichever folder validation runs from"""
+    monkeypatch.chdir(tmp_path / 'pkg')
+    changed, unmatched = resolve_changed(['a.py'], ['pkg/a.py', 'README.md'], base_dir=find_git_root('.'))
+    assert changed == { str(tmp_path / 'pkg' / 'a.py') } and unmatched == ['README.md']
+    assert resolve_changed(['a.py'], ['pkg/a.py']) == (set(), ['pkg/a.py'])
+    assert resolve_changed(['a.py'], [ os.path.abspath('a.py') ])[0] == changed
+
+
+def test_validate_modules_scans_cache_once(tmp_path, monkeypatch):
+
+    sources = []
+    for i in range(5):
+        source = tmp_path / ('mod%d.py' % i)
+        source.write_text('def f%d(x: int) -> int:\n    return x\n' % i)
+        sources.append(str(source))
+
+    scans = []
+    entries = DiskCache._entries
+    monkeypatch.setattr(DiskCache, '_entries', lambda self: scans.append(self) or entries(self))
+
+    results = list(validate_modules(sources, jobs=1, cache_dir=str(tmp_path / 'cache')))
+    assert [ path for path, _ in results ] == sources
+    assert len(scans) == 1
@@ -0,0 +1,34 @@
+import os
+
+from compdoc.compiler import CompDocCompiler
+from compdoc.config import load_config
+from compdoc.watcher import Watcher
+
+
+def _bump(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_watcher_recompiles_dependents(tmp_path):
+
+    (tmp_path / 'a.py').write_text('def a():\n    """A."""\n')
+    (tmp_path / 'b.py').write_text('def b():\n    """B."""\n')
+    (tmp_path / '.compdoc.yml').write_text('modules:\n  a: a.py\n  b: b.py\n\nformatters: {}\n')
+    (tmp_path / 'a.md.j2').write_text("{{ compdoc.module('a').a.doc.string }}")
+    (tmp_path / 'b.md.j2').write_text("{{ compdoc.module('b').b.doc.string }}")
+
+    config_path = str(tmp_path / '.compdoc.yml')
+    templates = [ str(tmp_path / 'a.md.j2'), str(tmp_path / 'b.md.j2') ]
+    watcher = Watcher(config_path, templates, CompDocCompiler(load_config(config_path)))
+
+    assert watcher.start() == [ (templates[0], None), (templates[1], None) ]
+    assert watcher.poll() == []
+
+    (tmp_path / 'b.py').write_text('def b():\n    """B, edited."""\n')
+    _bump(tmp_path / 'b.py')
+    assert watcher.poll() == [ (templates[1], None) ]
+    assert (tmp_path / 'b.md').read_text() == 'B, edited.'
+
+    _bump(tmp_path / '.compdoc.yml')
+    assert [ path for path, _ in watcher.poll() ] == templates